@@ -1,11 +1,25 @@
 import json
 import timeit
 
+from ghx.array_design import GHXArrayDesign
+from ghx.array_exponential import GHXArrayExponentialSum
 from ghx.array_fixed import GHXArrayFixedAggBlocks
+from ghx.array_geometric import GHXArrayGeometricAggBlocks
+from ghx.array_mlaa import GHXArrayMLAA
 from ghx.array_shifting import GHXArrayShiftingAggBlocks
 from ghx.constants import ConstantClass
 from ghx.my_print import PrintClass
 
+# simulation engines, keyed by 'Aggregation Type'
+engine_classes = {'Fixed': GHXArrayFixedAggBlocks,
+                  'None': GHXArrayFixedAggBlocks,
+                  'Adaptive': GHXArrayFixedAggBlocks,
+                  'Shifting': GHXArrayShiftingAggBlocks,
+                  'Exponential': GHXArrayExponentialSum,
+                  'MLAA': GHXArrayMLAA,
+                  'Geometric': GHXArrayGeometricAggBlocks,
+                  'Design': GHXArrayDesign}
+
 
 class GHXArray:
     def __init__(self, ghx_input_json_path, loads_path, output_path, print_output=True):
@@ -64,22 +78,41 @@ class GHXArray:
         """
         Main simulation routine. Simulates the GHXArray object.
 
-        More docs to come...
+        :return: ResultsClass object
         """
 
         PrintClass.my_print("Initializing simulation")
 
-        if self.aggregation_type == "Fixed" or self.aggregation_type == "None":
-            GHXArrayFixedAggBlocks(self.json_data,
-                                   self.loads_path,
-                                   self.output_path,
-                                   self.print_output).simulate()
-        elif self.aggregation_type == "Shifting":
-            GHXArrayShiftingAggBlocks(self.json_data,
-                                      self.loads_path,
-                                      self.output_path,
-                                      self.print_output).simulate()
-        else:
+        if self.aggregation_type not in engine_classes:
             PrintClass.my_print(
                 "\tAggregation Type \"%s\" not found" % self.aggregation_type, "warn")
             PrintClass.fatal_error(message="Error starting program")
+
+        return engine_classes[self.aggregation_type](self.json_data,
+                                                     self.loads_path,
+                                                     self.output_path,
+                                                     self.print_output).simulate()
+
+
+def run_simulation(json_data, loads, output_path=None, print_output=False):
+    """
+    Simulates a GHX array from input data and loads held in memory. Nothing is written to disk unless an
+    output path is given.
+
+    :param json_data: GHX input data
+    :param loads: array of hours, loads, and flow rates, or the path of a loads file
+    :param output_path: path of the output directory. None for no file output.
+    :param print_output: if True, progress is printed
+    :return: ResultsClass object
+    """
+
+    PrintClass(print_output, output_path)
+
+    try:
+        aggregation_type = json_data['Simulation Configuration']['Aggregation Type']
+        engine_class = engine_classes[aggregation_type]
+    except KeyError:  # pragma: no cover
+        PrintClass.my_print("....'Aggregation Type' key not found", "warn")
+        PrintClass.fatal_error(message="Error starting program")
+
+    return engine_class(json_data, loads, output_path, print_output).simulate()
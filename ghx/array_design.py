@@ -0,0 +1,171 @@
+import os
+
+import numpy as np
+
+from ghx.base import BaseGHXClass
+from ghx.constants import ConstantClass
+from ghx.my_print import PrintClass
+from ghx.superposition import calc_delta_loads, fft_convolve
+
+
+class GHXArrayDesign(BaseGHXClass):
+    """
+    GHXArrayDesign is a design-mode engine which calculates the monthly mean and peak temperatures.
+
+    Hourly loads are reduced to a monthly average load, and monthly peak heating and cooling pulses. The pulses
+    are the lowest and highest mean loads over 'Peak Duration' hours within each month. Monthly average loads
+    are superposed through the g-function at monthly time steps. Each peak pulse is applied at the end of its
+    month, on top of the monthly history.
+
+    Borehole resistance is evaluated at the mean flow rate of each month with the fluid at the undisturbed
+    ground temperature.
+
+    Output sinks take hourly temperatures, so they are not supported.
+    """
+
+    def __init__(self, json_data, loads_path, output_path, print_output=True):
+        """
+        Constructor for the class.
+        """
+
+        PrintClass(print_output, output_path)
+
+        # init base class
+        BaseGHXClass.__init__(self, json_data, loads_path,
+                              output_path, print_output)
+
+        errors_found = False
+
+        try:
+            self.peak_duration = json_data['Simulation Configuration']['Peak Duration']
+        except:  # pragma: no cover
+            PrintClass.my_print(
+                "....'Peak Duration' key not found", 'warn')
+            errors_found = True
+
+        if not errors_found:
+            # success
+            PrintClass.my_print("Simulation successfully initialized")
+        else:  # pragma: no cover
+            PrintClass.fatal_error(message="Error initializing GHXArrayDesign")
+
+        # class data
+
+        self.monthly_loads = None
+        self.peak_loads_min = None
+        self.peak_loads_max = None
+        self.monthly_flow_rates = None
+
+        self.temp_mft_min = None
+        self.temp_mft_max = None
+
+    def calc_monthly_loads(self):
+        """
+        Calculates the monthly average loads, peak pulse loads, and mean flow rates for one year.
+        """
+
+        hours = ConstantClass.months_in_year * ConstantClass.hours_in_month
+        loads = np.asarray(self.sim_loads[:hours], dtype=float).reshape(ConstantClass.months_in_year, -1)
+        flow_rates = np.asarray(self.total_flow_rate[:hours], dtype=float).reshape(ConstantClass.months_in_year, -1)
+
+        self.monthly_loads = np.mean(loads, axis=1)
+        self.monthly_flow_rates = np.mean(flow_rates, axis=1)
+
+        # mean loads over each window of peak duration hours within the month
+        cumulative_loads = np.concatenate((np.zeros((ConstantClass.months_in_year, 1)),
+                                           np.cumsum(loads, axis=1)), axis=1)
+        window_sums = cumulative_loads[:, self.peak_duration:] - cumulative_loads[:, :-self.peak_duration]
+        window_loads = window_sums / self.peak_duration
+
+        self.peak_loads_min = np.min(window_loads, axis=1)
+        self.peak_loads_max = np.max(window_loads, axis=1)
+
+    def calc_monthly_temps(self):
+        """
+        Calculates the borehole and mean fluid temperatures at the end of each month, and the mean fluid
+        temperatures during the peak pulses.
+        """
+
+        # calculate g-functions if not present
+        if not self.g_func_present:
+            PrintClass.my_print("G-functions not present", 'warn')
+            self.calc_g_func()
+
+        self.calc_monthly_loads()
+
+        num_months = ConstantClass.months_in_year * self.sim_years
+
+        # loads repeat annually
+        month_index = np.arange(num_months) % ConstantClass.months_in_year
+        loads = self.monthly_loads[month_index]
+        resist_bh = self.calc_resistance_array(self.monthly_flow_rates)[month_index]
+
+        # g-functions at monthly time steps, and for the peak pulse
+        hours = np.arange(1, num_months + 1) * ConstantClass.hours_in_month
+        g_monthly = self.g_func_array(np.log(hours * ConstantClass.sec_in_hour / self.ts))
+        g_peak = self.g_func(np.log(self.peak_duration * ConstantClass.sec_in_hour / self.ts))
+
+        scale = 2 * np.pi * self.borehole.soil.conductivity * self.total_bh_length
+
+        # temperatures at the end of each month
+        temp_rise = fft_convolve(calc_delta_loads(loads), g_monthly) / scale
+
+        self.temp_bh = self.borehole.soil.undisturbed_temp + temp_rise
+        self.temp_mft = self.temp_bh + loads * resist_bh / scale
+
+        # peak pulses replace the monthly load at the end of the month
+        for peak_loads, is_max in [(self.peak_loads_min, False), (self.peak_loads_max, True)]:
+            peak_loads = peak_loads[month_index]
+            temp_peak = self.temp_bh + ((peak_loads - loads) * g_peak + peak_loads * resist_bh) / scale
+            if is_max:
+                self.temp_mft_max = np.maximum(temp_peak, self.temp_mft)
+            else:
+                self.temp_mft_min = np.minimum(temp_peak, self.temp_mft)
+
+    def simulate(self):
+        """
+        Main simulation routine.
+        """
+
+        PrintClass.my_print("Beginning simulation")
+
+        if len(self.sinks) > 0:
+            PrintClass.fatal_error(message="Output sinks are not supported by GHXArrayDesign")
+
+        self.calc_monthly_temps()
+
+        return self.complete_simulation()
+
+    def generate_output_reports(self):  # pragma: no cover
+        """
+        Generates output results
+        """
+
+        try:
+            PrintClass.my_print("Writing output results")
+            cwd = os.getcwd()
+            path_to_output_dir = os.path.join(cwd, self.output_path)
+
+            if not os.path.exists(path_to_output_dir):
+                os.makedirs(path_to_output_dir)
+
+            # open files
+            out_file = open(os.path.join(path_to_output_dir, "GHX_Monthly.csv"), 'w')
+
+            # write headers
+            out_file.write("Month, BH Temp [C], MFT [C], Min MFT [C], Max MFT [C]\n")
+
+            for i in range(len(self.temp_bh)):
+                out_file.write("%d, %0.4f, %0.4f, %0.4f, %0.4f\n" % (i + 1,
+                                                                     self.temp_bh[i],
+                                                                     self.temp_mft[i],
+                                                                     self.temp_mft_min[i],
+                                                                     self.temp_mft_max[i]))
+
+            # close file
+            out_file.close()
+
+            PrintClass.my_print("....Success")
+
+        except:  # pragma: no cover
+            PrintClass.fatal_error(message="Error writing output results")
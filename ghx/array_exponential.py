@@ -0,0 +1,201 @@
+import numpy as np
+
+from ghx.base import BaseGHXClass
+from ghx.constants import ConstantClass
+from ghx.my_print import PrintClass
+
+
+class GHXArrayExponentialSum(BaseGHXClass):
+    """
+    GHXArrayExponentialSum is a ground heat exchanger array which performs the temporal superposition
+    recursively. The most recent hours are superposed directly, and the g-function tail is fit to a
+    sum of exponentials so that the effect of all older loads is carried by a small state vector.
+
+    Per-hour cost and memory are independent of the simulation length.
+    """
+
+    def __init__(self, json_data, loads_path, output_path, print_output=True):
+        """
+        Constructor for the class.
+        """
+
+        PrintClass(print_output, output_path)
+
+        # init base class
+        BaseGHXClass.__init__(self, json_data, loads_path,
+                              output_path, print_output)
+
+        errors_found = False
+
+        try:
+            self.min_hourly_history = json_data['Simulation Configuration']['Min Hourly History']
+        except:  # pragma: no cover
+            PrintClass.my_print(
+                "....'Min Hourly History' key not found", 'warn')
+            errors_found = True
+
+        try:
+            self.fit_tolerance = json_data['Simulation Configuration']['Fit Tolerance']
+        except:  # pragma: no cover
+            PrintClass.my_print("....'Fit Tolerance' key not found", 'warn')
+            errors_found = True
+
+        if not errors_found:
+            # success
+            PrintClass.my_print("Simulation successfully initialized")
+        else:  # pragma: no cover
+            PrintClass.fatal_error(message="Error initializing GHXArrayExponentialSum")
+
+        # class data
+
+        self.exp_taus = None
+        self.exp_weights = None
+        self.exp_const = None
+        self.exp_fit_error = None
+
+        # decay factor for one hour, and the weight applied when a load leaves the hourly history
+        self.exp_decay = None
+        self.exp_entry = None
+
+        # recursive state. one value per exponential.
+        self.exp_state = None
+
+        self.g_func_hourly = None
+        self.hourly_loads = None
+
+    def fit_exponentials(self, max_terms_per_decade=12):
+        """
+        Fits the g-function tail to a sum of exponentials.
+
+        g(t) ~= c + sum(a_i * (1 - exp(-t / tau_i)))
+
+        The fit covers the hours after the hourly history until the end of the simulation. The number of
+        exponentials per decade of time is increased until the maximum fit error is within 'Fit Tolerance'.
+
+        :return: maximum absolute fit error of the g-function
+        """
+
+        t_min = self.min_hourly_history + 1
+        t_max = ConstantClass.hours_in_year * self.sim_years + 1
+        t_max = max(t_max, t_min + 1)
+
+        # evaluation grid is log-spaced, which is where the g-function varies
+        num_pts = 500
+        t_fit = np.unique(np.concatenate((np.geomspace(t_min, t_max, num_pts),
+                                          np.arange(t_min, min(t_min + 24, t_max) + 1))))
+        g_fit = self.g_func_array(np.log(t_fit * ConstantClass.sec_in_hour / self.ts))
+
+        decades = np.log10(t_max / t_min)
+
+        terms_per_decade = 2
+        while True:
+            # time constants span the fit range with a decade of margin on both sides
+            num_terms = int(np.ceil((decades + 2) * terms_per_decade)) + 1
+            taus = np.logspace(np.log10(t_min) - 1, np.log10(t_max) + 1, num_terms)
+
+            basis = np.ones((len(t_fit), num_terms + 1))
+            basis[:, 1:] = 1 - np.exp(-t_fit[:, np.newaxis] / taus[np.newaxis, :])
+
+            coeffs = np.linalg.lstsq(basis, g_fit, rcond=None)[0]
+            fit_error = np.max(np.abs(basis.dot(coeffs) - g_fit))
+
+            if fit_error <= self.fit_tolerance or terms_per_decade >= max_terms_per_decade:
+                break
+
+            terms_per_decade += 1
+
+        if fit_error > self.fit_tolerance:  # pragma: no cover
+            PrintClass.my_print("....Exponential fit error %0.6f exceeds 'Fit Tolerance'" % fit_error, 'warn')
+
+        self.exp_taus = taus
+        self.exp_const = coeffs[0]
+        self.exp_weights = coeffs[1:]
+        self.exp_fit_error = fit_error
+
+        self.exp_decay = np.exp(-1.0 / self.exp_taus)
+        self.exp_entry = np.exp(-(self.min_hourly_history + 1) / self.exp_taus)
+        self.exp_state = np.zeros(len(self.exp_taus))
+
+        PrintClass.my_print("....Fit %d exponentials, max g-function error: %0.6f" % (len(taus), fit_error))
+
+        return fit_error
+
+    def simulate(self):
+        """
+        Main simulation routine.
+
+        The hourly history is superposed directly. Each load step which leaves the hourly history
+        is added to the exponential state, which is then decayed by one hour per time step.
+        """
+
+        PrintClass.my_print("Beginning simulation")
+
+        # calculate g-functions if not present
+        if not self.g_func_present:
+            PrintClass.my_print("G-functions not present", 'warn')
+            self.calc_g_func()
+
+        self.fit_exponentials()
+
+        self.init_resistances()
+
+        # pre-load hourly g-functions
+        hours = np.arange(1, self.min_hourly_history + 1)
+        self.g_func_hourly = self.g_func_array(np.log(hours * ConstantClass.sec_in_hour / self.ts))
+
+        # hourly loads, oldest to newest. two extra values are held so the load step
+        # leaving the hourly history can be computed
+        self.hourly_loads = np.zeros(self.min_hourly_history + 2)
+
+        # sum of all load steps which have left the hourly history
+        q_aged = 0.0
+
+        exp_sum = self.exp_const + np.sum(self.exp_weights)
+        two_pi_k = 2 * np.pi * self.borehole.soil.conductivity
+
+        for year in range(self.sim_years):
+            for month in range(ConstantClass.months_in_year):
+
+                PrintClass.my_print("....Year/Month: %d/%d" %
+                                    (year + 1, month + 1))
+
+                for hour in range(ConstantClass.hours_in_month):
+
+                    # get raw hourly load and append to hourly list
+                    curr_index = month * ConstantClass.hours_in_month + hour
+                    sim_index = year * ConstantClass.hours_in_year + curr_index
+                    self.hourly_loads[:-1] = self.hourly_loads[1:]
+                    self.hourly_loads[-1] = self.sim_loads[curr_index]
+
+                    # pre-solved borehole resistance
+                    resist_bh = self.resist_bh_hourly[curr_index]
+
+                    # update recursive state with the load step leaving the hourly history
+                    delta_q_aged = self.hourly_loads[1] - self.hourly_loads[0]
+                    self.exp_state *= self.exp_decay
+                    self.exp_state += delta_q_aged * self.exp_entry
+                    q_aged += delta_q_aged
+
+                    # hourly effects, newest to oldest
+                    delta_q_hourly = np.diff(self.hourly_loads[1:])[::-1]
+                    g = self.g_func_hourly
+                    g_rb = g + resist_bh
+                    g_rb = np.where(g_rb < 0, resist_bh - resist_bh * two_pi_k, g_rb)
+
+                    # exponential tail effects
+                    tail_bh = exp_sum * q_aged - np.dot(self.exp_weights, self.exp_state)
+                    tail_mft = tail_bh + q_aged * resist_bh
+
+                    scale = two_pi_k * self.total_bh_length
+
+                    # final bh temp
+                    temp_bh = self.borehole.soil.undisturbed_temp + (np.dot(delta_q_hourly, g) + tail_bh) / scale
+
+                    # final mean fluid temp
+                    temp_mft = self.borehole.soil.undisturbed_temp + (np.dot(delta_q_hourly, g_rb) + tail_mft) / scale
+
+                    self.record_temps(sim_index + 1, temp_bh, temp_mft)
+
+        self.correct_resistances()
+
+        return self.complete_simulation()
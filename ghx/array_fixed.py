@@ -1,4 +1,3 @@
-import timeit
 from collections import deque
 
 import numpy as np
@@ -13,8 +12,16 @@ class GHXArrayFixedAggBlocks(BaseGHXClass):
     """
     GHXArrayFixedAggBlocks is the class object that holds the information that defines a ground heat exchanger array.
     This could be a single borehole, or a field with an arbitrary number of boreholes at arbitrary locations.
+
+    Hours whose load is unchanged from the previous hour add no new superposition terms. Runs of such hours are
+    fast-forwarded up to the next load aggregation, when the terms change. The temperatures of all hours in the
+    run are evaluated at once from the terms at the start of the run, so plant-off periods and steady loads cost
+    little. Fast-forwarding is on unless the optional 'Fast Forward' key is false.
     """
 
+    # largest number of superposition terms evaluated at once when fast-forwarding
+    max_fast_forward_terms = 2 ** 20
+
     def __init__(self, json_data, loads_path, output_path, print_output=True):
         """
         Constructor for the class.
@@ -41,6 +48,19 @@ class GHXArrayFixedAggBlocks(BaseGHXClass):
             PrintClass.my_print("....'Intervals' key not found", 'warn')
             errors_found = True
 
+        if self.aggregation_type == "Adaptive":
+            try:
+                self.merge_tolerance = json_data['Simulation Configuration']['Merge Tolerance']
+            except:  # pragma: no cover
+                PrintClass.my_print("....'Merge Tolerance' key not found", 'warn')
+                errors_found = True
+
+        try:
+            self.fast_forward_flag = json_data['Simulation Configuration']['Fast Forward']
+        except KeyError:
+            # optional. runs of unchanged load are fast-forwarded.
+            self.fast_forward_flag = True
+
         if not errors_found:
             # success
             PrintClass.my_print("Simulation successfully initialized")
@@ -63,9 +83,12 @@ class GHXArrayFixedAggBlocks(BaseGHXClass):
         Sets the load aggregation intervals based on the type specified by the user.
 
         Intervals must be integer multiples.
+
+        "Adaptive" uses the same intervals as "Fixed", but neighboring blocks are also merged early
+        when their mean loads differ by no more than the 'Merge Tolerance'.
         """
 
-        if self.aggregation_type == "Fixed":
+        if self.aggregation_type == "Fixed" or self.aggregation_type == "Adaptive":
             pass
         elif self.aggregation_type == "None":
             self.agg_loads_flag = False
@@ -81,6 +104,9 @@ class GHXArrayFixedAggBlocks(BaseGHXClass):
         if len(self.agg_load_intervals) > 1:
             self.collapse_aggregate_loads()
 
+        if self.aggregation_type == "Adaptive":
+            self.merge_similar_aggregate_loads()
+
         prev_sim_hour = self.agg_load_objects[-1].last_sim_hour
 
         agg_loads = []
@@ -105,7 +131,7 @@ class GHXArrayFixedAggBlocks(BaseGHXClass):
                 i += 1
                 continue
             # already max agg interval
-            elif len(self.agg_load_objects[i].loads) == self.agg_load_intervals[-1]:
+            elif len(self.agg_load_objects[i].loads) >= self.agg_load_intervals[-1]:
                 agg_load_objects_update.append(self.agg_load_objects[i])
                 i += 1
                 continue
@@ -113,16 +139,16 @@ class GHXArrayFixedAggBlocks(BaseGHXClass):
                 k = len(self.agg_load_intervals) - 1
                 while k >= 0:
                     temp_objs = []
-                    agg_int = self.agg_load_intervals[k]
                     for j in range(i, len(self.agg_load_objects)):
-                        if len(self.agg_load_objects[j].loads) == agg_int:
+                        if self.get_interval_index(len(self.agg_load_objects[j].loads)) == k:
                             temp_objs.append(self.agg_load_objects[j])
                         else:
                             continue
                     num_objs = len(temp_objs)
                     i += num_objs
                     if num_objs > 0:
-                        if num_objs * agg_int >= self.agg_load_intervals[k + 1]:
+                        num_loads = sum([len(obj.loads) for obj in temp_objs])
+                        if num_loads >= self.agg_load_intervals[k + 1]:
                             agg_load_objects_update.append(
                                 self.merge_agg_load_objs(temp_objs))
                         else:
@@ -132,6 +158,43 @@ class GHXArrayFixedAggBlocks(BaseGHXClass):
 
         self.agg_load_objects = agg_load_objects_update
 
+    def get_interval_index(self, num_loads):
+        """
+        Blocks merged by the adaptive aggregation may fall between intervals.
+
+        :return: index of the largest interval which is not longer than the block
+        """
+
+        k = 0
+        while k + 1 < len(self.agg_load_intervals) and self.agg_load_intervals[k + 1] <= num_loads:
+            k += 1
+
+        return k
+
+    def merge_similar_aggregate_loads(self):
+        """
+        Merges neighboring blocks when their mean loads differ by no more than the merge tolerance.
+
+        Blocks are checked from newest to oldest, so a run of similar blocks merges into one.
+        A merged block may not be at a longer interval than its older neighbor, so the blocks
+        remain ordered by interval for collapse_aggregate_loads.
+        """
+
+        i = len(self.agg_load_objects) - 1
+
+        # keep '0' time object
+        while i > 1:
+            curr_obj = self.agg_load_objects[i]
+            prev_obj = self.agg_load_objects[i - 1]
+
+            if abs(curr_obj.q - prev_obj.q) <= self.merge_tolerance:
+                num_loads = len(prev_obj.loads) + len(curr_obj.loads)
+                if i == 2 or self.get_interval_index(num_loads) <= \
+                        self.get_interval_index(len(self.agg_load_objects[i - 2].loads)):
+                    self.agg_load_objects[i - 1:i + 1] = [self.merge_agg_load_objs([prev_obj, curr_obj])]
+
+            i -= 1
+
     def merge_agg_load_objs(self, obj_list):
         """
         Merges AggregatedLoad objects into a single AggregatedLoad object
@@ -144,8 +207,7 @@ class GHXArrayFixedAggBlocks(BaseGHXClass):
         max_hour = 0
 
         for this_obj in obj_list:
-            for i in range(len(this_obj.loads)):
-                loads.append(this_obj.loads[i])
+            loads.extend(this_obj.loads)
             if min_hour > this_obj.first_sim_hour:
                 min_hour = this_obj.first_sim_hour
             if max_hour < this_obj.last_sim_hour:
@@ -153,6 +215,268 @@ class GHXArrayFixedAggBlocks(BaseGHXClass):
 
         return AggregatedLoadFixed(loads, min_hour, len(loads))
 
+    def init_load_history(self):
+        """
+        Sets the hourly g-functions, hourly load history, and aggregated loads to their initial state.
+        """
+
+        # pre-load hourly g-functions
+        self.g_func_hourly = deque()
+        for hour in range(self.agg_load_intervals[0] + self.min_hourly_history):
+            ln_t_ts = np.log((hour + 1) * 3600 / self.ts)
+            self.g_func_hourly.append(self.g_func(ln_t_ts))
+
+        # set aggregate load container max length
+        len_hourly_loads = self.min_hourly_history + self.agg_load_intervals[0]
+
+        # without aggregation, the last hour also needs the load before the first
+        if not self.agg_loads_flag:
+            len_hourly_loads += 1
+
+        self.hourly_loads = deque(
+            [0] * len_hourly_loads, maxlen=len_hourly_loads)
+
+        # set first aggregated load, which is zero. Need this for later
+        self.agg_load_objects = [AggregatedLoadFixed([0], 0, 1, True)]
+
+    def calc_temp_rise(self, sim_hour, agg_hour, resist_bh):
+        """
+        Superposes the hourly and aggregated loads, then aggregates the hourly loads when needed.
+        The current load must already be appended to the hourly loads.
+
+        :param sim_hour: current simulation hour
+        :param agg_hour: hours since the last load aggregation
+        :param resist_bh: borehole resistance
+        :return: borehole temperature rise, mean fluid temperature rise, and the updated aggregation hour
+        """
+
+        # calculate borehole temp
+        # hourly effects
+        temp_bh_hourly = []
+        temp_mft_hourly = []
+        start_hourly = len(self.hourly_loads) - 1
+        end_hourly = start_hourly - agg_hour
+        g_func_index = -1
+        for i in range(start_hourly, end_hourly, -1):
+            g_func_index += 1
+            q_curr = self.hourly_loads[i]
+            q_prev = self.hourly_loads[i - 1]
+            g = self.g_func_hourly[g_func_index]
+            # calculate average bh temp
+            delta_q = (q_curr - q_prev) / \
+                      (2 * np.pi * self.borehole.soil.conductivity *
+                       self.total_bh_length)
+            temp_bh_hourly.append(delta_q * g)
+
+            # calculate mean fluid temp
+            g_rb = g + resist_bh
+
+            if g_rb < 0:
+                g = -resist_bh * 2 * np.pi * self.borehole.soil.conductivity
+                g_rb = g + resist_bh
+
+            temp_mft_hourly.append(delta_q * g_rb)
+
+        # aggregated load effects
+        temp_bh_agg = []
+        temp_mft_agg = []
+        if self.agg_loads_flag:
+            for i in range(len(self.agg_load_objects)):
+                if i == 0:
+                    continue
+                curr_obj = self.agg_load_objects[i]
+                prev_obj = self.agg_load_objects[i - 1]
+
+                t_agg = sim_hour - curr_obj.time()
+                ln_t_ts = np.log(t_agg * 3600 / self.ts)
+                g = self.g_func(ln_t_ts)
+                # calculate the average borehole temp
+                delta_q = (curr_obj.q - prev_obj.q) / (
+                    2 * np.pi * self.borehole.soil.conductivity * self.total_bh_length)
+                temp_bh_agg.append(delta_q * g)
+
+                # calculate the mean fluid temp
+                g_rb = g + resist_bh
+
+                if g_rb < 0:
+                    g = -resist_bh * 2 * np.pi * self.borehole.soil.conductivity
+                    g_rb = g + resist_bh
+
+                temp_mft_agg.append(delta_q * g_rb)
+
+            # aggregate load
+            if agg_hour == self.agg_load_intervals[0] + self.min_hourly_history - 1:
+                # this has one extra value for comparative purposes
+                # need to get rid of it here
+                self.hourly_loads.popleft()
+
+                # create new aggregated load object
+                self.aggregate_load()
+
+                # reset aggregation hour to '0'
+                agg_hour -= self.agg_load_intervals[0]
+
+        return sum(temp_bh_hourly) + sum(temp_bh_agg), sum(temp_mft_hourly) + sum(temp_mft_agg), agg_hour
+
+    def calc_load_run_lengths(self):
+        """
+        :return: array of the number of hours from each hour of the year to the end of its run of equal loads
+        """
+
+        loads = np.asarray(self.sim_loads, dtype=float)
+        hours = np.arange(len(loads))
+
+        # first hour after each run
+        run_ends = np.append(np.flatnonzero(loads[1:] != loads[:-1]) + 1, len(loads))
+
+        return run_ends[np.searchsorted(run_ends, hours, side='right')] - hours
+
+    def get_fast_forward_hours(self, curr_index, agg_hour, max_hours):
+        """
+        :param curr_index: index of the load of the next hour
+        :param agg_hour: hours since the last load aggregation
+        :param max_hours: most hours which may be fast-forwarded
+        :return: number of hours from the next hour which can be fast-forwarded. Zero if the load changes.
+        """
+
+        if not self.fast_forward_flag or self.sim_loads[curr_index] != self.hourly_loads[-1]:
+            return 0
+
+        num_hours = min(self.load_run_lengths[curr_index], max_hours)
+
+        # stop at the next load aggregation, which changes the terms
+        agg_end = self.agg_load_intervals[0] + self.min_hourly_history - 1 - agg_hour
+        if self.agg_loads_flag and agg_end > 0:
+            num_hours = min(num_hours, agg_end)
+
+        num_terms = agg_hour + len(self.agg_load_objects)
+
+        return max(min(num_hours, self.max_fast_forward_terms // num_terms), 1)
+
+    def fast_forward(self, sim_hour, agg_hour, num_hours):
+        """
+        Advances over hours whose load is unchanged from the previous hour, and records their temperatures.
+
+        The new hours add no superposition terms, so every hour superposes the hourly and aggregated load
+        changes from before the run. These are evaluated for all hours at once. The hours are then appended
+        to the hourly loads, and aggregated at the last hour if needed, as in calc_temp_rise.
+
+        :param sim_hour: last simulated hour
+        :param agg_hour: hours since the last load aggregation
+        :param num_hours: number of hours to advance
+        :return: last simulated hour, and the updated aggregation hour
+        """
+
+        hours = sim_hour + np.arange(1, num_hours + 1)
+
+        # runs of unchanged load end with the year, so the resistances do not wrap
+        first_index = sim_hour % ConstantClass.hours_in_year
+        resist_bh = np.asarray(self.resist_bh_hourly[first_index:first_index + num_hours], dtype=float)[:, np.newaxis]
+
+        two_pi_k = 2 * np.pi * self.borehole.soil.conductivity
+        scale = two_pi_k * self.total_bh_length
+
+        # hourly load changes over the last 'agg_hour' hours, oldest first
+        hourly_loads = np.array(self.hourly_loads, dtype=float)[len(self.hourly_loads) - agg_hour - 1:]
+        delta_q = np.diff(hourly_loads) / scale
+        lags = np.arange(num_hours)[:, np.newaxis] + np.arange(agg_hour, 0, -1)
+        g_hourly = np.asarray(self.g_func_hourly, dtype=float)
+
+        delta_qs = [np.broadcast_to(delta_q, lags.shape)]
+        gs = [g_hourly[lags]]
+
+        # aggregated load changes
+        if self.agg_loads_flag and len(self.agg_load_objects) > 1:
+            agg_q = np.array([obj.q for obj in self.agg_load_objects], dtype=float)
+            agg_times = np.array([obj.time() for obj in self.agg_load_objects[1:]], dtype=float)
+            t_agg = hours[:, np.newaxis] - agg_times
+            delta_qs.append(np.broadcast_to(np.diff(agg_q) / scale, t_agg.shape))
+            gs.append(self.g_func_array(np.log(t_agg * 3600 / self.ts)))
+
+        delta_q = np.concatenate(delta_qs, axis=1)
+        g = np.concatenate(gs, axis=1)
+
+        # limit the terms where g + Rb < 0, as in calc_temp_rise
+        g_rb = np.where(g + resist_bh < 0, -resist_bh * two_pi_k + resist_bh, g + resist_bh)
+
+        temp_bh = self.borehole.soil.undisturbed_temp + np.sum(delta_q * g, axis=1)
+        temp_mft = self.borehole.soil.undisturbed_temp + np.sum(delta_q * g_rb, axis=1)
+
+        load = self.hourly_loads[-1]
+
+        for i in range(num_hours):
+            sim_hour += 1
+            agg_hour += 1
+            self.hourly_loads.append(load)
+            self.record_temps(sim_hour, temp_bh[i], temp_mft[i])
+
+        if self.agg_loads_flag and agg_hour == self.agg_load_intervals[0] + self.min_hourly_history - 1:
+            self.hourly_loads.popleft()
+            self.aggregate_load()
+            agg_hour -= self.agg_load_intervals[0]
+
+        return sim_hour, agg_hour
+
+    def calc_bh_temps(self, num_hours, ref_temp_bh=None, max_error=None):
+        """
+        Calculates the borehole temperatures over the first hours of the simulation.
+        Fluid properties and resistances are not updated, so this is much faster than a full simulation.
+        Used to estimate load aggregation errors.
+
+        If reference temperatures and a maximum error are given, stops at the first hour whose error exceeds it.
+
+        :param num_hours: number of hours to calculate
+        :param ref_temp_bh: array of reference borehole temperatures
+        :param max_error: maximum absolute error from the reference [C]
+        :return: array of borehole temperatures, up to the last hour calculated
+        """
+
+        self.init_load_history()
+
+        temp_bh = np.zeros(num_hours)
+        agg_hour = 0
+
+        for sim_hour in range(1, num_hours + 1):
+            agg_hour += 1
+
+            curr_index = (sim_hour - 1) % ConstantClass.hours_in_year
+            self.hourly_loads.append(self.sim_loads[curr_index])
+
+            temp_rise_bh, temp_rise_mft, agg_hour = self.calc_temp_rise(sim_hour, agg_hour, 0)
+            temp_bh[sim_hour - 1] = self.borehole.soil.undisturbed_temp + temp_rise_bh
+
+            if max_error is not None and abs(temp_bh[sim_hour - 1] - ref_temp_bh[sim_hour - 1]) > max_error:
+                return temp_bh[:sim_hour]
+
+        return temp_bh
+
+    def calc_superposition_cost(self):
+        """
+        Estimates the mean number of superposition terms per hour over the full simulation.
+
+        Blocks at each interval accumulate until they are merged into the next interval, so on average
+        each level holds half of the ratio to the next interval. Blocks at the last interval are never merged.
+
+        :return: mean number of superposition terms per hour
+        """
+
+        max_sim_hours = ConstantClass.hours_in_year * self.sim_years
+
+        if not self.agg_loads_flag:
+            return (max_sim_hours + 1) / 2.0
+
+        intervals = self.agg_load_intervals
+
+        # hourly terms cycle between the min hourly history and one interval more
+        num_terms = self.min_hourly_history + intervals[0] / 2.0
+
+        for k in range(len(intervals) - 1):
+            num_terms += intervals[k + 1] / (2.0 * intervals[k])
+
+        num_terms += max_sim_hours / (2.0 * intervals[-1])
+
+        return num_terms
+
     def simulate(self):
         """
         More docs to come...
@@ -165,15 +489,11 @@ class GHXArrayFixedAggBlocks(BaseGHXClass):
             PrintClass.my_print("G-functions not present", 'warn')
             self.calc_g_func()
 
-        # pre-load hourly g-functions
-        for hour in range(self.agg_load_intervals[0] + self.min_hourly_history):
-            ln_t_ts = np.log((hour + 1) * 3600 / self.ts)
-            self.g_func_hourly.append(self.g_func(ln_t_ts))
+        self.init_load_history()
 
-        # set aggregate load container max length
-        len_hourly_loads = self.min_hourly_history + self.agg_load_intervals[0]
-        self.hourly_loads = deque(
-            [0] * len_hourly_loads, maxlen=len_hourly_loads)
+        self.init_resistances()
+
+        self.load_run_lengths = self.calc_load_run_lengths()
 
         agg_hour = 0
         sim_hour = 0
@@ -184,104 +504,39 @@ class GHXArrayFixedAggBlocks(BaseGHXClass):
                 PrintClass.my_print("....Year/Month: %d/%d" %
                                     (year + 1, month + 1))
 
-                for hour in range(ConstantClass.hours_in_month):
+                hour = 0
+                while hour < ConstantClass.hours_in_month:
 
+                    curr_index = month * ConstantClass.hours_in_month + hour
+
+                    num_hours = self.get_fast_forward_hours(curr_index, agg_hour,
+                                                            ConstantClass.hours_in_month - hour)
+                    if num_hours > 0:
+                        sim_hour, agg_hour = self.fast_forward(sim_hour, agg_hour, num_hours)
+                        hour += num_hours
+                        continue
+
+                    hour += 1
                     agg_hour += 1
                     sim_hour += 1
 
                     # get raw hourly load and append to hourly list
-                    curr_index = month * ConstantClass.hours_in_month + hour
                     self.hourly_loads.append(self.sim_loads[curr_index])
-                    curr_flow_rate = self.total_flow_rate[curr_index]
-
-                    # update borehole flow rate
-                    self.borehole.pipe.fluid.update_fluid_state(
-                        new_flow_rate=curr_flow_rate)
-
-                    # calculate borehole resistance
-                    self.borehole.calc_bh_resistance()
-
-                    # calculate borehole temp
-                    # hourly effects
-                    temp_bh_hourly = []
-                    temp_mft_hourly = []
-                    start_hourly = len(self.hourly_loads) - 1
-                    end_hourly = start_hourly - agg_hour
-                    g_func_index = -1
-                    for i in range(start_hourly, end_hourly, -1):
-                        g_func_index += 1
-                        q_curr = self.hourly_loads[i]
-                        q_prev = self.hourly_loads[i - 1]
-                        g = self.g_func_hourly[g_func_index]
-                        # calculate average bh temp
-                        delta_q = (q_curr - q_prev) / \
-                                  (2 * np.pi * self.borehole.soil.conductivity *
-                                   self.total_bh_length)
-                        temp_bh_hourly.append(delta_q * g)
-
-                        # calculate mean fluid temp
-                        g_rb = g + self.borehole.resist_bh
-
-                        if g_rb < 0:
-                            g = -self.borehole.resist_bh * 2 * np.pi * self.borehole.soil.conductivity
-                            g_rb = g + self.borehole.resist_bh
-
-                        temp_mft_hourly.append(delta_q * g_rb)
-
-                    # aggregated load effects
-                    temp_bh_agg = []
-                    temp_mft_agg = []
-                    if self.agg_loads_flag:
-                        for i in range(len(self.agg_load_objects)):
-                            if i == 0:
-                                continue
-                            curr_obj = self.agg_load_objects[i]
-                            prev_obj = self.agg_load_objects[i - 1]
-
-                            t_agg = sim_hour - curr_obj.time()
-                            ln_t_ts = np.log(t_agg * 3600 / self.ts)
-                            g = self.g_func(ln_t_ts)
-                            # calculate the average borehole temp
-                            delta_q = (curr_obj.q - prev_obj.q) / (
-                                2 * np.pi * self.borehole.soil.conductivity * self.total_bh_length)
-                            temp_bh_agg.append(delta_q * g)
-
-                            # calculate the mean fluid temp
-                            g_rb = g + self.borehole.resist_bh
-
-                            if g_rb < 0:
-                                g = -self.borehole.resist_bh * 2 * np.pi * self.borehole.soil.conductivity
-                                g_rb = g + self.borehole.resist_bh
-
-                            temp_mft_agg.append(delta_q * g_rb)
-
-                        # aggregate load
-                        if agg_hour == self.agg_load_intervals[0] + self.min_hourly_history - 1:
-                            # this has one extra value for comparative purposes
-                            # need to get rid of it here
-                            self.hourly_loads.popleft()
-
-                            # create new aggregated load object
-                            self.aggregate_load()
-
-                            # reset aggregation hour to '0'
-                            agg_hour -= self.agg_load_intervals[0]
+
+                    # pre-solved borehole resistance
+                    resist_bh = self.resist_bh_hourly[curr_index]
+
+                    temp_rise_bh, temp_rise_mft, agg_hour = self.calc_temp_rise(
+                        sim_hour, agg_hour, resist_bh)
 
                     # final bh temp
-                    self.temp_bh.append(
-                        self.borehole.soil.undisturbed_temp + sum(temp_bh_hourly) + sum(temp_bh_agg))
+                    temp_bh = self.borehole.soil.undisturbed_temp + temp_rise_bh
 
                     # final mean fluid temp
-                    self.temp_mft.append(
-                        self.borehole.soil.undisturbed_temp + sum(temp_mft_hourly) + sum(temp_mft_agg))
-
-                    # update borehole temperature
-                    self.borehole.pipe.fluid.update_fluid_state(new_temp=self.temp_mft[-1])
+                    temp_mft = self.borehole.soil.undisturbed_temp + temp_rise_mft
 
-        self.generate_output_reports()
+                    self.record_temps(sim_hour, temp_bh, temp_mft)
 
-        PrintClass.my_print("Simulation complete", "success")
-        PrintClass.my_print("Simulation time: %0.3f sec" %
-                            (timeit.default_timer() - self.timer_start))
+        self.correct_resistances()
 
-        PrintClass.write_log_file()
+        return self.complete_simulation()
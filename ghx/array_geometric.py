@@ -0,0 +1,191 @@
+import numpy as np
+
+from ghx.base import BaseGHXClass
+from ghx.constants import ConstantClass
+from ghx.my_print import PrintClass
+
+
+class GHXArrayGeometricAggBlocks(BaseGHXClass):
+    """
+    GHXArrayGeometricAggBlocks aggregates loads into cells whose widths grow geometrically with age.
+    There are 'History Depth' cells at each width, and widths increase by 'History Expansion Rate'.
+
+    The cells are held in fixed-size arrays, so shifting loads between cells is a single vectorized update
+    per time step. The number of cells grows with the log of the simulation length.
+
+    Claesson, J. and Javed, S. 2012. 'A load-aggregation method to calculate extraction temperatures of
+    borehole heat exchangers.' ASHRAE Transactions, 118(1): 530-539.
+    """
+
+    def __init__(self, json_data, loads_path, output_path, print_output=True):
+        """
+        Constructor for the class.
+        """
+
+        PrintClass(print_output, output_path)
+
+        # init base class
+        BaseGHXClass.__init__(self, json_data, loads_path,
+                              output_path, print_output)
+
+        errors_found = False
+
+        try:
+            self.history_depth = json_data['Simulation Configuration']['History Depth']
+        except:  # pragma: no cover
+            PrintClass.my_print(
+                "....'History Depth' key not found", 'warn')
+            errors_found = True
+
+        try:
+            self.history_expansion_rate = json_data['Simulation Configuration']['History Expansion Rate']
+        except:  # pragma: no cover
+            PrintClass.my_print("....'History Expansion Rate' key not found", 'warn')
+            errors_found = True
+
+        if not errors_found:
+            # success
+            PrintClass.my_print("Simulation successfully initialized")
+        else:  # pragma: no cover
+            PrintClass.fatal_error(message="Error initializing GHXArrayGeometricAggBlocks")
+
+        # class data
+
+        # cells are ordered newest to oldest
+        self.cell_widths = None
+        self.cell_starts = None
+        self.cell_loads = None
+        self.cell_g_func = None
+
+        # cells fill in order. only the first cell which is not full has a partial count.
+        self.num_full_cells = 0
+        self.partial_count = 0
+
+        # set load aggregation cells
+        self.set_load_aggregation()
+
+    def set_load_aggregation(self):
+        """
+        Sets the cell widths so the cells span the full simulation.
+        """
+
+        max_sim_hours = self.sim_years * ConstantClass.hours_in_year
+
+        widths = []
+        agg_sim_hours = 0
+        level = 0
+        while max_sim_hours > agg_sim_hours:
+            level_interval = self.history_expansion_rate ** level
+            for depth in range(self.history_depth):
+                widths.append(level_interval)
+                agg_sim_hours += level_interval
+            level += 1
+
+        self.cell_widths = np.array(widths, dtype=float)
+        self.cell_starts = np.concatenate(([0], np.cumsum(self.cell_widths)[:-1]))
+        self.cell_loads = np.zeros(len(widths))
+
+    def shift_loads(self, curr_load):
+        """
+        Shifts the loads between cells so energy is conserved.
+
+        Each full cell passes its mean hourly load to the next cell and receives the mean hourly load
+        of the previous cell. The first cell which is not full only receives.
+        """
+
+        num_full = self.num_full_cells
+
+        if num_full < len(self.cell_loads):
+            # load passed into the first cell which is not full
+            if num_full == 0:
+                load_in = curr_load
+            else:
+                load_in = self.cell_loads[num_full - 1]
+
+            count = self.partial_count
+            self.cell_loads[num_full] = (self.cell_loads[num_full] * count + load_in) / (count + 1)
+            self.partial_count += 1
+
+        # shift the full cells, using the loads from the previous time step
+        loads_in = np.empty(num_full)
+        if num_full > 0:
+            loads_in[0] = curr_load
+            loads_in[1:] = self.cell_loads[:num_full - 1]
+            self.cell_loads[:num_full] += (loads_in - self.cell_loads[:num_full]) / self.cell_widths[:num_full]
+
+        if num_full < len(self.cell_loads) and self.partial_count == self.cell_widths[num_full]:
+            self.num_full_cells += 1
+            self.partial_count = 0
+
+    def load_g_functions(self):
+        """
+        Pre-computes the g-functions at the end of each cell.
+        """
+
+        cell_ends = self.cell_starts + self.cell_widths
+        self.cell_g_func = self.g_func_array(np.log(cell_ends * ConstantClass.sec_in_hour / self.ts))
+
+    def simulate(self):
+        """
+        Main simulation routine.
+        """
+
+        PrintClass.my_print("Beginning simulation")
+
+        # calculate g-functions if not present
+        if not self.g_func_present:
+            PrintClass.my_print("G-functions not present", 'warn')
+            self.calc_g_func()
+
+        self.load_g_functions()
+
+        self.init_resistances()
+
+        two_pi_k = 2 * np.pi * self.borehole.soil.conductivity
+        scale = two_pi_k * self.total_bh_length
+
+        for year in range(self.sim_years):
+            for month in range(ConstantClass.months_in_year):
+
+                PrintClass.my_print("....Year/Month: %d/%d" %
+                                    (year + 1, month + 1))
+
+                for hour in range(ConstantClass.hours_in_month):
+
+                    # get raw hourly load and shift it into the cells
+                    curr_index = month * ConstantClass.hours_in_month + hour
+                    sim_index = year * ConstantClass.hours_in_year + curr_index
+                    self.shift_loads(self.sim_loads[curr_index])
+
+                    # pre-solved borehole resistance
+                    resist_bh = self.resist_bh_hourly[curr_index]
+
+                    # cells holding loads
+                    num_cells = self.num_full_cells
+                    g = self.cell_g_func[:num_cells + 1].copy()
+                    if self.partial_count > 0:
+                        # cell is still filling, so it ends before its full width
+                        num_cells += 1
+                        cell_end = self.cell_starts[num_cells - 1] + self.partial_count
+                        g[-1] = self.g_func(np.log(cell_end * ConstantClass.sec_in_hour / self.ts))
+                    g = g[:num_cells]
+
+                    # oldest load steps up from zero
+                    q = self.cell_loads[:num_cells]
+                    delta_q = q - np.append(q[1:], 0)
+
+                    # calculate mean fluid temp
+                    g_rb = g + resist_bh
+                    g_rb = np.where(g_rb < 0, resist_bh - resist_bh * two_pi_k, g_rb)
+
+                    # final bh temp
+                    temp_bh = self.borehole.soil.undisturbed_temp + np.dot(delta_q, g) / scale
+
+                    # final mean fluid temp
+                    temp_mft = self.borehole.soil.undisturbed_temp + np.dot(delta_q, g_rb) / scale
+
+                    self.record_temps(sim_index + 1, temp_bh, temp_mft)
+
+        self.correct_resistances()
+
+        return self.complete_simulation()
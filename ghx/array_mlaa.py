@@ -0,0 +1,206 @@
+import numpy as np
+
+from ghx.base import BaseGHXClass
+from ghx.constants import ConstantClass
+from ghx.my_print import PrintClass
+
+
+class GHXArrayMLAA(BaseGHXClass):
+    """
+    GHXArrayMLAA uses the multiple load aggregation algorithm (MLAA) to simulate the ground heat exchanger array.
+
+    Loads are aggregated into daily, weekly, and monthly blocks once they are older than the minimum
+    hourly, daily, and weekly histories. Block loads are computed from the cumulative hourly loads, so each hour
+    only requires the block boundaries, not individual block objects. Loads repeat annually, so the cumulative
+    loads of any hour are found from those of one year.
+
+    Hourly g-functions are pre-loaded for the whole simulation if hourly results are stored. Otherwise they are
+    evaluated at the block boundaries each hour, so memory does not grow with the simulation length.
+
+    Bernier, M.A., Labib, R., Pinel, P., and Paillot, R. 2004. 'A multiple load aggregation algorithm for
+    annual hourly simulations of GCHP systems.' HVAC&R Research, 10(4): 471-487.
+    """
+
+    def __init__(self, json_data, loads_path, output_path, print_output=True):
+        """
+        Constructor for the class.
+        """
+
+        PrintClass(print_output, output_path)
+
+        # init base class
+        BaseGHXClass.__init__(self, json_data, loads_path,
+                              output_path, print_output)
+
+        errors_found = False
+
+        try:
+            self.min_hourly_history = json_data['Simulation Configuration']['Min Hourly History']
+        except:  # pragma: no cover
+            PrintClass.my_print(
+                "....'Min Hourly History' key not found", 'warn')
+            errors_found = True
+
+        try:
+            self.min_daily_history = json_data['Simulation Configuration']['Min Daily History']
+        except:  # pragma: no cover
+            PrintClass.my_print(
+                "....'Min Daily History' key not found", 'warn')
+            errors_found = True
+
+        try:
+            self.min_weekly_history = json_data['Simulation Configuration']['Min Weekly History']
+        except:  # pragma: no cover
+            PrintClass.my_print(
+                "....'Min Weekly History' key not found", 'warn')
+            errors_found = True
+
+        if not errors_found:
+            # success
+            PrintClass.my_print("Simulation successfully initialized")
+        else:  # pragma: no cover
+            PrintClass.fatal_error(message="Error initializing GHXArrayMLAA")
+
+        # class data
+
+        # hours currently held in each aggregation level
+        self.span_monthly = 0
+        self.span_weekly = 0
+        self.span_daily = 0
+        self.span_hourly = 0
+
+        self.g_func_hourly = None
+        self.cumulative_loads = None
+
+    def update_block_spans(self):
+        """
+        Advances the aggregation levels by one hour.
+
+        Once a level holds a full block beyond its minimum history, the oldest block is moved to the next level.
+        """
+
+        self.span_hourly += 1
+
+        if self.span_hourly >= self.min_hourly_history + ConstantClass.hours_in_day:
+            self.span_hourly -= ConstantClass.hours_in_day
+            self.span_daily += ConstantClass.hours_in_day
+
+        if self.span_daily >= self.min_daily_history + ConstantClass.hours_in_week:
+            self.span_daily -= ConstantClass.hours_in_week
+            self.span_weekly += ConstantClass.hours_in_week
+
+        if self.span_weekly >= self.min_weekly_history + ConstantClass.hours_in_month:
+            self.span_weekly -= ConstantClass.hours_in_month
+            self.span_monthly += ConstantClass.hours_in_month
+
+    def get_block_starts(self):
+        """
+        Determines the starting hour of each load block, oldest to newest.
+
+        Monthly, daily, and hourly blocks are aligned from the start of their level. Weekly blocks are
+        aligned from the end of the weekly level, so the oldest weekly block may be partial.
+
+        :return: array of block starting hours
+        """
+
+        end_monthly = self.span_monthly
+        end_weekly = end_monthly + self.span_weekly
+        end_daily = end_weekly + self.span_daily
+        end_hourly = end_daily + self.span_hourly
+
+        starts_weekly = np.arange(end_weekly - ConstantClass.hours_in_week,
+                                  end_monthly, -ConstantClass.hours_in_week)[::-1]
+
+        if self.span_weekly > 0:
+            starts_weekly = np.concatenate(([end_monthly], starts_weekly))
+
+        return np.concatenate((np.arange(0, end_monthly, ConstantClass.hours_in_month),
+                               starts_weekly,
+                               np.arange(end_weekly, end_daily, ConstantClass.hours_in_day),
+                               np.arange(end_daily, end_hourly)))
+
+    def calc_cumulative_loads(self, hours):
+        """
+        :param hours: array of simulation hours
+        :return: array of the cumulative loads up to each hour
+        """
+
+        years, hour_of_year = np.divmod(hours, ConstantClass.hours_in_year)
+
+        return years * self.cumulative_loads[..., -1:] + self.cumulative_loads[..., hour_of_year]
+
+    def simulate(self):
+        """
+        Main simulation routine.
+        """
+
+        PrintClass.my_print("Beginning simulation")
+
+        # calculate g-functions if not present
+        if not self.g_func_present:
+            PrintClass.my_print("G-functions not present", 'warn')
+            self.calc_g_func()
+
+        max_sim_hours = ConstantClass.hours_in_year * self.sim_years
+
+        # pre-load hourly g-functions
+        self.g_func_hourly = None
+        if self.store_results:
+            hours = np.arange(1, max_sim_hours + 1)
+            self.g_func_hourly = self.g_func_array(np.log(hours * ConstantClass.sec_in_hour / self.ts))
+
+        self.init_resistances()
+
+        # cumulative sum of loads over one year. the first value is zero.
+        loads = np.asarray(self.sim_loads[:ConstantClass.hours_in_year], dtype=float)
+        self.cumulative_loads = np.concatenate(([0], np.cumsum(loads)))
+
+        two_pi_k = 2 * np.pi * self.borehole.soil.conductivity
+        scale = two_pi_k * self.total_bh_length
+
+        sim_hour = 0
+
+        for year in range(self.sim_years):
+            for month in range(ConstantClass.months_in_year):
+
+                PrintClass.my_print("....Year/Month: %d/%d" %
+                                    (year + 1, month + 1))
+
+                for hour in range(ConstantClass.hours_in_month):
+
+                    sim_hour += 1
+
+                    # pre-solved borehole resistance
+                    curr_index = month * ConstantClass.hours_in_month + hour
+                    resist_bh = self.resist_bh_hourly[curr_index]
+
+                    # update aggregation blocks
+                    self.update_block_spans()
+                    starts = self.get_block_starts()
+                    ends = np.append(starts[1:], sim_hour)
+
+                    # mean block loads
+                    q = np.diff(self.calc_cumulative_loads(np.append(starts, sim_hour))) / (ends - starts)
+                    delta_q = np.diff(q, prepend=0)
+
+                    # calculate average bh temp
+                    if self.g_func_hourly is not None:
+                        g = self.g_func_hourly[sim_hour - starts - 1]
+                    else:
+                        g = self.g_func_array(np.log((sim_hour - starts) * ConstantClass.sec_in_hour / self.ts))
+
+                    # calculate mean fluid temp
+                    g_rb = g + resist_bh
+                    g_rb = np.where(g_rb < 0, resist_bh - resist_bh * two_pi_k, g_rb)
+
+                    # final bh temp
+                    temp_bh = self.borehole.soil.undisturbed_temp + np.dot(delta_q, g) / scale
+
+                    # final mean fluid temp
+                    temp_mft = self.borehole.soil.undisturbed_temp + np.dot(delta_q, g_rb) / scale
+
+                    self.record_temps(sim_hour, temp_bh, temp_mft)
+
+        self.correct_resistances()
+
+        return self.complete_simulation()
@@ -1,5 +1,3 @@
-import timeit
-
 import numpy as np
 
 from ghx.aggregated_loads import AggregatedLoadShifting
@@ -14,6 +12,8 @@ class GHXArrayShiftingAggBlocks(BaseGHXClass):
         Class constructor
         """
 
+        PrintClass(print_output, output_path)
+
         # init base class
         BaseGHXClass.__init__(self, json_data, loads_path,
                               output_path, print_output)
@@ -104,7 +104,7 @@ class GHXArrayShiftingAggBlocks(BaseGHXClass):
 
         for this_block in self.agg_load_objects:
             hour += this_block.max_num_loads
-            ln_t_ts = np.log((hour + 1) * 3600 / self.ts)
+            ln_t_ts = np.log(hour * 3600 / self.ts)
             this_block.g_func = self.g_func(ln_t_ts)
 
     def simulate(self):
@@ -114,6 +114,8 @@ class GHXArrayShiftingAggBlocks(BaseGHXClass):
 
         PrintClass.my_print("Beginning simulation")
 
+        self.init_resistances()
+
         sim_hour = 0
         sim_hour_old = 0
 
@@ -123,12 +125,12 @@ class GHXArrayShiftingAggBlocks(BaseGHXClass):
                 PrintClass.my_print("....Year/Month: %d/%d" %
                                     (year + 1, month + 1))
 
-                temp_bh_hourly = []
-                temp_mft_hourly = []
-
                 for hour in range(ConstantClass.hours_in_month):
                     sim_hour += 1
 
+                    temp_bh_hourly = []
+                    temp_mft_hourly = []
+
                     # get raw hourly load and append to hourly list
                     load_index = month * ConstantClass.hours_in_month + hour
                     curr_load = self.sim_loads[load_index]
@@ -137,62 +139,59 @@ class GHXArrayShiftingAggBlocks(BaseGHXClass):
                     energy = curr_load * (sim_hour - sim_hour_old) * ConstantClass.sec_in_hour
                     self.shift_loads(energy)
 
-                    # get current data
-                    curr_index = month * ConstantClass.hours_in_month + hour
-                    curr_flow_rate = self.total_flow_rate[curr_index]
-
-                    # update borehole flow rate
-                    self.borehole.pipe.fluid.update_fluid_state(
-                        new_flow_rate=curr_flow_rate)
+                    # pre-solved borehole resistance
+                    resist_bh = self.resist_bh_hourly[load_index]
 
-                    # calculate borehole resistance
-                    self.borehole.calc_bh_resistance()
+                    block_start_hour = 0
 
                     for i, curr_obj in enumerate(self.agg_load_objects):
 
                         if curr_obj.num_loads == 0:
                             break
 
-                        if i == 0:
-                            q_curr = curr_obj.q
-                            q_prev = 0
+                        # blocks are ordered newest to oldest, and the oldest load steps up from zero
+                        if i == len(self.agg_load_objects) - 1 or self.agg_load_objects[i + 1].num_loads == 0:
+                            q_next = 0
                         else:
-                            prev_obj = self.agg_load_objects[i - 1]
-                            q_curr = curr_obj.q
-                            q_prev = prev_obj.q
+                            q_next = self.agg_load_objects[i + 1].q
+
+                        q_curr = curr_obj.q
 
                         # calculate average bh temp
-                        delta_q = (q_curr - q_prev) / \
+                        delta_q = (q_curr - q_next) / \
                                   (2 * np.pi * self.borehole.soil.conductivity *
                                    self.total_bh_length)
 
-                        g = curr_obj.g_func
+                        if curr_obj.is_full:
+                            g = curr_obj.g_func
+                        else:
+                            # block is still filling, so it ends before its full length
+                            ln_t_ts = np.log((block_start_hour + curr_obj.num_loads) * 3600 / self.ts)
+                            g = self.g_func(ln_t_ts)
+
+                        block_start_hour += curr_obj.max_num_loads
+
                         temp_bh_hourly.append(delta_q * g)
 
                         # calculate mean fluid temp
-                        g_rb = g + self.borehole.resist_bh
+                        g_rb = g + resist_bh
 
                         if g_rb < 0:
-                            g = -self.borehole.resist_bh * 2 * np.pi * self.borehole.soil.conductivity
-                            g_rb = g + self.borehole.resist_bh
+                            g = -resist_bh * 2 * np.pi * self.borehole.soil.conductivity
+                            g_rb = g + resist_bh
 
                         temp_mft_hourly.append(delta_q * g_rb)
 
                     # final bh temp
-                    self.temp_bh.append(self.borehole.soil.undisturbed_temp + sum(temp_bh_hourly))
+                    temp_bh = self.borehole.soil.undisturbed_temp + sum(temp_bh_hourly)
 
                     # final mean fluid temp
-                    self.temp_mft.append(self.borehole.soil.undisturbed_temp + sum(temp_mft_hourly))
+                    temp_mft = self.borehole.soil.undisturbed_temp + sum(temp_mft_hourly)
 
-                    # update borehole temperature
-                    self.borehole.pipe.fluid.update_fluid_state(new_temp=self.temp_mft[-1])
+                    self.record_temps(sim_hour, temp_bh, temp_mft)
 
                     sim_hour_old = sim_hour
 
-        self.generate_output_reports()
-
-        PrintClass.my_print("Simulation complete", "success")
-        PrintClass.my_print("Simulation time: %0.3f sec" %
-                            (timeit.default_timer() - self.timer_start))
+        self.correct_resistances()
 
-        PrintClass.write_log_file()
+        return self.complete_simulation()
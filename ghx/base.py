@@ -1,32 +1,67 @@
 import os
 import timeit
-from collections import deque
 
 import numpy as np
 import simplejson as json
 
 from ghx.borehole import BoreholeClass
+from ghx.constants import ConstantClass
+from ghx.g_function import calc_g_func
 from ghx.my_print import PrintClass
+from ghx.results import ResultsClass
+from ghx.results_store import ResultsStoreSinkClass
+from ghx.statistics import StatisticsSinkClass
+from ghx.superposition import calc_delta_loads, fft_convolve
+
+
+def read_loads(loads):
+    """
+    Reads the hours, loads, and flow rates
+
+    :param loads: path of the loads file, or an array. Files ending in '.npy' are binary, and are memory-mapped.
+    :return: array of hours, loads, and flow rates
+    """
+
+    if isinstance(loads, str):
+        if loads.endswith('.npy'):
+            return np.load(loads, mmap_mode='r')
+        return np.genfromtxt(loads, delimiter=',', skip_header=1)
+
+    return np.asarray(loads, dtype=float)
 
 
 class BaseGHXClass:
     """
     Base class for GHXArray
+
+    Runs in memory if the output path is None. Nothing is written to disk, and the simulation results
+    are only returned.
+
+    Hourly temperatures are stored unless 'Store Hourly Results' is false. They are then only fed to the sinks,
+    such as the summary statistics set by the 'Statistics' key, so result memory does not grow with the
+    simulation length. Resistances are pre-solved for one year, since flow rates repeat annually. Load histories
+    still grow slowly: MLAA adds a block boundary each month, and fixed blocks keep a block per last interval.
+    The 'Results Store' key also writes the hourly temperatures to a chunked binary file, GHX.bin.
     """
 
     def __init__(self, json_data, loads_path, output_path, print_output=True):
         """
         Class constructor
+
+        :param json_data: GHX input data
+        :param loads_path: path of the loads file, or an array of hours, loads, and flow rates
+        :param output_path: path of the output directory. None for no file output.
         """
         self.timer_start = timeit.default_timer()
         errors_found = False
         self.output_path = output_path
 
-        if not os.path.exists(self.output_path):
-            os.makedirs(self.output_path)
+        if self.output_path is not None:
+            if not os.path.exists(self.output_path):
+                os.makedirs(self.output_path)
 
-        with open(os.path.join(self.output_path, 'in.json'), 'w') as outfile:
-            json.dump(json_data, outfile, indent=4, sort_keys=True)
+            with open(os.path.join(self.output_path, 'in.json'), 'w') as outfile:
+                json.dump(json_data, outfile, indent=4, sort_keys=True)
 
         # load data into data structs
         PrintClass.my_print("....Loading GHX data")
@@ -49,6 +84,53 @@ class BaseGHXClass:
             PrintClass.my_print("....'Aggregation Type' key not found", 'warn')
             errors_found = True
 
+        try:
+            self.resist_correction_passes = json_data['Simulation Configuration']['Resistance Correction Passes']
+        except KeyError:
+            # optional. resistances are only evaluated with the fluid at the undisturbed ground temperature.
+            self.resist_correction_passes = 0
+
+        try:
+            self.results_dtype = np.dtype(json_data['Simulation Configuration']['Results Data Type'])
+        except KeyError:
+            # optional. 'float32' halves the memory held for results.
+            self.results_dtype = np.dtype(np.float64)
+        except TypeError:  # pragma: no cover
+            PrintClass.my_print("....'Results Data Type' not valid", 'warn')
+            errors_found = True
+
+        try:
+            self.store_results = json_data['Simulation Configuration']['Store Hourly Results']
+        except KeyError:
+            # optional. hourly results are held in memory.
+            self.store_results = True
+
+        if not self.store_results and self.resist_correction_passes > 0:
+            PrintClass.my_print("....Hourly results are stored for the resistance correction passes", 'warn')
+            self.store_results = True
+
+        # output sinks, fed the hourly temperatures
+        self.sinks = []
+        self.statistics = None
+
+        try:
+            self.statistics = StatisticsSinkClass(json_data['Simulation Configuration']['Statistics'], print_output)
+            self.sinks.append(self.statistics)
+        except KeyError:
+            # optional. no summary statistics are kept.
+            pass
+
+        try:
+            store_config = json_data['Simulation Configuration']['Results Store']
+            if self.output_path is None:  # pragma: no cover
+                PrintClass.my_print("....'Results Store' needs an output path", 'warn')
+            else:
+                self.sinks.append(ResultsStoreSinkClass(os.path.join(self.output_path, 'GHX.bin'), store_config,
+                                                        self.results_dtype))
+        except KeyError:
+            # optional. hourly results are only written to GHX.csv.
+            pass
+
         try:
             self.g_func_lntts = []
             self.g_func_val = []
@@ -76,15 +158,11 @@ class BaseGHXClass:
 
         try:
             PrintClass.my_print("....Importing flow rates and loads")
-            load_pairs = np.genfromtxt(
-                loads_path, delimiter=',', skip_header=1)
-            self.sim_hours = []
-            self.sim_loads = []
-            self.total_flow_rate = []
-            for pair in load_pairs:
-                self.sim_hours.append(pair[0])
-                self.sim_loads.append(pair[1])
-                self.total_flow_rate.append(pair[2])
+            load_pairs = read_loads(loads_path)
+            # contiguous copies, so memory-mapped loads are not read column-wise through the file
+            self.sim_hours = np.ascontiguousarray(load_pairs[:, 0], dtype=float)
+            self.sim_loads = np.ascontiguousarray(load_pairs[:, 1], dtype=float)
+            self.total_flow_rate = np.ascontiguousarray(load_pairs[:, 2], dtype=float)
         except:  # pragma: no cover
             PrintClass.fatal_error(message="Error importing loads")
 
@@ -92,10 +170,19 @@ class BaseGHXClass:
             PrintClass.fatal_error(message="Error initializing BaseGHXClass")
 
         self.ts = self.calc_ts()
-        self.temp_bh = deque()
-        self.temp_mft = deque()
+
+        # results are preallocated for every hour of the simulation
+        num_hours = ConstantClass.hours_in_year * self.sim_years if self.store_results else 0
+        self.temp_bh = np.zeros(num_hours, dtype=self.results_dtype)
+        self.temp_mft = np.zeros(num_hours, dtype=self.results_dtype)
+
         self.agg_load_objects = []
         self.agg_loads_flag = True
+        self.resist_bh_hourly = None
+        self.results = None
+        self.num_recorded = 0
+
+        self.timer_init = timeit.default_timer() - self.timer_start
 
     def merge_dicts(self, list_of_dicts):
         """
@@ -147,11 +234,15 @@ class BaseGHXClass:
 
     def calc_g_func(self):
         """
-        Calculate g-functions for given ground heat exchangers.
+        Calculate g-functions for given ground heat exchangers with the finite line source.
         """
 
         try:
             PrintClass.my_print("Calculating g-functions")
+            locations = [this_bh.location for this_bh in self.ghx_list]
+            ln_t_ts, g = calc_g_func(locations, self.borehole.depth, self.borehole.radius)
+            self.g_func_lntts = list(ln_t_ts)
+            self.g_func_val = list(g)
             self.g_func_present = True
             PrintClass.my_print("....Success")
         except:  # pragma: no cover
@@ -180,6 +271,251 @@ class BaseGHXClass:
             # value is in range
             return np.interp(ln_t_ts, self.g_func_lntts, self.g_func_val)
 
+    def g_func_array(self, ln_t_ts):
+        """
+        Interpolates to the correct g-function values for an array of ln(t/ts) values.
+        Extrapolates in the same manner as g_func.
+        """
+
+        x = np.asarray(ln_t_ts, dtype=float)
+        lntts = self.g_func_lntts
+        vals = self.g_func_val
+
+        g = np.interp(x, lntts, vals)
+
+        # if values are below range, extrapolate down
+        slope_low = (vals[1] - vals[0]) / (lntts[1] - lntts[0])
+        g = np.where(x < lntts[0], (x - lntts[0]) * slope_low + vals[0], g)
+
+        # if values are above range, extrapolate up
+        slope_high = (vals[-2] - vals[-1]) / (lntts[-2] - lntts[-1])
+        g = np.where(x > lntts[-1], (x - lntts[-1]) * slope_high + vals[-1], g)
+
+        return g
+
+    def calc_resistance_array(self, flow_rates, temps=None, temp_resolution=None, soil_conductivity=None,
+                              grout_conductivity=None):
+        """
+        Calculates the borehole resistance at each flow rate and fluid temperature.
+        Resistance is evaluated once for each unique pair, with temperatures rounded to the given resolution.
+        All pairs are evaluated in one call to calc_bh_resistance_array, so the fluid state is not changed.
+
+        The resolution defaults to twice the fluid 'Temperature Tolerance', so each temperature is within the
+        tolerance of the one its properties are evaluated at, and to 0.1 C if there is no tolerance. Rounded
+        temperatures are recorded by the fluid as skipped updates, with their property error.
+
+        :param flow_rates: array of flow rates
+        :param temps: array of fluid temperatures. Defaults to the undisturbed ground temperature.
+        :param temp_resolution: resolution of the fluid temperatures [C]
+        :param soil_conductivity: array of sampled soil conductivities, passed to calc_bh_resistance_array
+        :param grout_conductivity: array of sampled grout conductivities, passed to calc_bh_resistance_array
+        :return: array of borehole resistances, samples x hours if conductivities are given
+        """
+
+        flow_rates = np.asarray(flow_rates, dtype=float)
+        fluid = self.borehole.pipe.fluid
+
+        if temp_resolution is None:
+            temp_resolution = 2 * fluid.temp_tolerance if fluid.temp_tolerance > 0 else 0.1
+
+        if temps is None:
+            temps = np.full(len(flow_rates), self.borehole.soil.undisturbed_temp)
+        else:
+            raw_temps = np.asarray(temps, dtype=float)
+            temps = np.round(raw_temps / temp_resolution) * temp_resolution
+            fluid.record_rounded_temps(raw_temps, temps)
+
+        states = np.stack((flow_rates, temps), axis=1)
+        unique_states, state_index = np.unique(states, axis=0, return_inverse=True)
+
+        resist_bh = self.borehole.calc_bh_resistance_array(unique_states[:, 0], unique_states[:, 1],
+                                                           soil_conductivity, grout_conductivity)
+
+        return resist_bh[..., state_index.ravel()]
+
+    def init_resistances(self):
+        """
+        Pre-solves the borehole resistance for each hour of the year, before the time loop.
+        Flow rates are read from the loads file, and the fluid is at the undisturbed ground temperature.
+        Flow rates repeat annually, so the resistances are indexed by the hour of the year, and their memory
+        does not grow with the simulation length.
+        """
+
+        flow_rates = np.asarray(self.total_flow_rate[:ConstantClass.hours_in_year], dtype=float)
+
+        self.resist_bh_hourly = self.calc_resistance_array(flow_rates)
+
+    def get_hourly_loads(self, num_hours):
+        """
+        :param num_hours: number of hours
+        :return: array of hourly loads, which repeat annually. One row for each row of the temperature arrays.
+        """
+
+        load_index = np.arange(num_hours) % ConstantClass.hours_in_year
+
+        return np.asarray(self.sim_loads, dtype=float)[np.newaxis, load_index]
+
+    def correct_resistances(self):
+        """
+        Applies the 'Resistance Correction Passes'. Each pass re-evaluates the hourly borehole resistance
+        at the simulated mean fluid temperature, then recalculates the mean fluid temperature.
+        Borehole temperatures do not depend on the borehole resistance, so they are not changed.
+        Each row of the temperature arrays is corrected at its own mean fluid temperatures.
+        """
+
+        if self.resist_correction_passes == 0:
+            return
+
+        num_hours = self.temp_bh.shape[-1]
+        load_index = np.arange(num_hours) % ConstantClass.hours_in_year
+        loads = self.get_hourly_loads(num_hours)
+        flow_rates = np.asarray(self.total_flow_rate, dtype=float)[load_index]
+
+        hours = np.arange(1, num_hours + 1)
+        g = self.g_func_array(np.log(hours * ConstantClass.sec_in_hour / self.ts))
+
+        temp_bh = np.asarray(self.temp_bh, dtype=float).reshape(-1, num_hours)
+        temp_mft = np.array(self.temp_mft, dtype=float).reshape(-1, num_hours)
+        resist_bh = np.zeros_like(temp_mft)
+
+        for correction_pass in range(self.resist_correction_passes):
+            max_change = 0.0
+
+            for i in range(len(temp_mft)):
+                resist_bh[i] = self.calc_resistance_array(flow_rates, temp_mft[i])
+                temp_mft_new = self.calc_mft(temp_bh[i], loads[i], resist_bh[i], g)
+                max_change = max(max_change, np.max(np.abs(temp_mft_new - temp_mft[i])))
+                temp_mft[i] = temp_mft_new
+
+            PrintClass.my_print("....Resistance correction pass %d: max MFT change %0.4f C" %
+                                (correction_pass + 1, max_change))
+
+        self.resist_bh_hourly = resist_bh.reshape(self.temp_mft.shape)
+        self.temp_mft[:] = temp_mft.reshape(self.temp_mft.shape)
+
+        self.borehole.pipe.fluid.report_property_updates()
+
+    def calc_mft(self, temp_bh, loads, resist_bh, g, soil_conductivity=None):
+        """
+        Calculates the mean fluid temperatures from the borehole temperatures.
+        Hourly terms where g + Rb < 0 are limited, as in the simulation routines.
+
+        :param temp_bh: array of hourly borehole temperatures
+        :param loads: array of hourly loads
+        :param resist_bh: array of hourly borehole resistances
+        :param g: array of hourly g-function values
+        :param soil_conductivity: sampled soil conductivity. Defaults to the soil conductivity.
+        :return: array of hourly mean fluid temperatures
+        """
+
+        if soil_conductivity is None:
+            soil_conductivity = self.borehole.soil.conductivity
+
+        two_pi_k = 2 * np.pi * soil_conductivity
+        scale = two_pi_k * self.total_bh_length
+
+        temp_mft = temp_bh + loads * resist_bh / scale
+
+        # g increases with time, so only the most recent hours are limited
+        delta_q = calc_delta_loads(loads)
+        num_limited = np.searchsorted(g, -np.min(resist_bh))
+        for k in range(num_limited):
+            limited = g[k] + resist_bh[k:] < 0
+            correction = (resist_bh[k:] - resist_bh[k:] * two_pi_k) - (g[k] + resist_bh[k:])
+            temp_mft[k:] += np.where(limited, delta_q[:len(loads) - k] * correction, 0) / scale
+
+        return temp_mft
+
+    def calc_reference_temps(self, num_hours=None):
+        """
+        Calculates the borehole and mean fluid temperatures by exact (non-aggregated)
+        superposition of all hourly loads. Used as the reference for aggregation errors.
+
+        Loads repeat annually, as they do in the simulation routines.
+        Borehole resistance is evaluated at each hourly flow rate with the fluid at the undisturbed ground temperature.
+
+        :param num_hours: number of hours to calculate. Defaults to the full simulation.
+        :returns tuple of borehole temperature and mean fluid temperature arrays
+        """
+
+        if num_hours is None:
+            num_hours = ConstantClass.hours_in_year * self.sim_years
+
+        load_index = np.arange(num_hours) % ConstantClass.hours_in_year
+        loads = np.asarray(self.sim_loads, dtype=float)[load_index]
+        flow_rates = np.asarray(self.total_flow_rate, dtype=float)[load_index]
+
+        hours = np.arange(1, num_hours + 1)
+        g = self.g_func_array(np.log(hours * ConstantClass.sec_in_hour / self.ts))
+
+        delta_q = calc_delta_loads(loads)
+        scale = 2 * np.pi * self.borehole.soil.conductivity * self.total_bh_length
+
+        temp_bh = self.borehole.soil.undisturbed_temp + fft_convolve(delta_q, g) / scale
+
+        resist_bh = self.calc_resistance_array(flow_rates)
+
+        temp_mft = self.calc_mft(temp_bh, loads, resist_bh, g)
+
+        return temp_bh, temp_mft
+
+    def add_sink(self, sink):
+        """
+        Adds an output sink. Sinks have update, flush, and generate_output_reports methods.
+        """
+
+        self.sinks.append(sink)
+
+    def record_temps(self, sim_hour, temp_bh, temp_mft):
+        """
+        Records the temperatures of a simulation hour. If hourly results are not stored, they are fed to the sinks.
+        Stored results are fed to the sinks when the simulation is complete, after any resistance correction.
+        """
+
+        if self.store_results:
+            self.temp_bh[sim_hour - 1] = temp_bh
+            self.temp_mft[sim_hour - 1] = temp_mft
+        else:
+            for sink in self.sinks:
+                sink.update(temp_bh, temp_mft)
+
+        self.num_recorded = sim_hour
+
+    def complete_simulation(self):
+        """
+        Collects the results, and writes the output files if there is an output path
+
+        :return: ResultsClass object
+        """
+
+        for sink in self.sinks:
+            if self.store_results:
+                sink.update(self.temp_bh[:self.num_recorded], self.temp_mft[:self.num_recorded])
+            sink.flush()
+
+        timer_total = timeit.default_timer() - self.timer_start
+        timing = {'Initialization': self.timer_init,
+                  'Simulation': timer_total - self.timer_init,
+                  'Total': timer_total}
+
+        # the results hold views of the simulation arrays
+        self.results = ResultsClass(self.name, self.aggregation_type, self.temp_bh, self.temp_mft, timing,
+                                    self.temp_bh.shape[-1] // self.sim_years, self.statistics)
+
+        if self.output_path is not None:
+            if self.store_results:
+                self.generate_output_reports()
+            for sink in self.sinks:
+                sink.generate_output_reports(self.output_path)
+
+        PrintClass.my_print("Simulation complete", "success")
+        PrintClass.my_print("Simulation time: %0.3f sec" %
+                            (timeit.default_timer() - self.timer_start))
+
+        PrintClass.write_log_file()
+
+        return self.results
+
     def generate_output_reports(self):  # pragma: no cover
         """
         Generates output results
@@ -1,12 +1,21 @@
 import numpy as np
 
 from ghx.base_properties import BasePropertiesClass
+from ghx.multipole import calc_bh_average_resistance, calc_bh_total_internal_resistance, get_multipole
 from ghx.my_print import PrintClass
 from ghx.pipe import PipeClass
 from ghx.soil import SoilClass
 
 
 class BoreholeClass:
+    """
+    Borehole with one or more U-tubes.
+
+    Single U-tubes use the first-order multipole closed forms by default. The optional 'Multipole Order' selects
+    the multipole method of that order, which is also used for more than one U-tube, given by the optional
+    'Number of U-tubes'. U-tubes are connected in parallel, with the legs evenly spaced at the shank spacing.
+    """
+
     def __init__(self, json_data, print_output):
 
         try:
@@ -40,14 +49,27 @@ class BoreholeClass:
             PrintClass.my_print("....'Shank Spacing' key not found", 'warn')
             PrintClass.fatal_error(message="Error initializing BoreholeClass")
 
+        try:
+            self.num_u_tubes = json_data['Number of U-tubes']
+        except KeyError:
+            # optional. single U-tube.
+            self.num_u_tubes = 1
+
+        try:
+            self.multipole_order = json_data['Multipole Order']
+        except KeyError:
+            # optional. closed forms for single U-tubes.
+            self.multipole_order = None if self.num_u_tubes == 1 else 3
+
         self.soil = SoilClass(json_data['Soil'], print_output)
         self.grout = BasePropertiesClass(json_data['Grout'], print_output)
         self.pipe = PipeClass(
             json_data['Pipe'], json_data['Fluid'], json_data['Soil']['Temperature'], print_output)
+        self.pipe.num_u_tubes = self.num_u_tubes
 
-        # validate shank spacing
+        # validate shank spacing. neighboring legs must not overlap.
         if self.shank_space > (2 * self.radius - self.pipe.outer_diameter) \
-                or self.shank_space < self.pipe.outer_diameter:  # pragma: no cover
+                or self.shank_space * np.sin(np.pi / (2 * self.num_u_tubes)) < self.pipe.outer_diameter:  # pragma: no cover
             PrintClass.my_print("Invalid shank spacing", 'warn')
             PrintClass.my_print(
                 "Check shank spacing, pipe diameter, and borehole radius", 'warn')
@@ -65,7 +87,42 @@ class BoreholeClass:
                      (self.grout.conductivity + self.soil.conductivity)
         self.beta = None
 
-        self.calc_bh_resistance()
+        self.multipole = None
+        self.init_multipole()
+
+        self.calc_bh_resistance(update_pipe=True)
+
+    def init_multipole(self):
+        """
+        Gets the multipole solver, if used. Its geometry-dependent systems are solved once, so only the pipe
+        resistance is updated as the flow rate and temperature change.
+        """
+
+        if self.multipole_order is None:
+            self.multipole = None
+        else:
+            self.multipole = get_multipole(self.shank_space, self.radius, self.pipe.outer_radius,
+                                           self.grout.conductivity, self.soil.conductivity, self.multipole_order,
+                                           self.num_u_tubes)
+
+        return self.multipole
+
+    def set_conductivities(self, soil_conductivity, grout_conductivity):
+        """
+        Updates the soil and grout conductivities, and the borehole resistances which depend on them.
+        The pipe resistance is not recalculated.
+        """
+
+        self.soil.conductivity = soil_conductivity
+        self.soil.thermal_diffusivity = soil_conductivity / self.soil.heat_capacity
+        self.grout.conductivity = grout_conductivity
+
+        self.sigma = (self.grout.conductivity - self.soil.conductivity) / \
+                     (self.grout.conductivity + self.soil.conductivity)
+
+        self.init_multipole()
+        self.calc_bh_average_resistance()
+        self.calc_bh_total_internal_resistance()
 
     def calc_bh_average_resistance(self):
         """
@@ -75,22 +132,19 @@ class BoreholeClass:
         for Grouted Single U-tube Ground Heat Exchangers.' J. Energy Engineering. Draft in progress.
 
         Equation 13
+
+        Uses the multipole solver instead, if set.
         """
 
         self.beta = 2 * np.pi * self.grout.conductivity * self.pipe.resist_pipe
 
-        final_term_1 = np.log(
-            self.theta_2 / (2 * self.theta_1 * (1 - self.theta_1 ** 4) ** self.sigma))
-        num_final_term_2 = self.theta_3 ** 2 * \
-            (1 - (4 * self.sigma * self.theta_1 ** 4) / (1 - self.theta_1 ** 4)) ** 2
-        den_final_term_2_pt_1 = (1 + self.beta) / (1 - self.beta)
-        den_final_term_2_pt_2 = self.theta_3 ** 2 * \
-            (1 + (16 * self.sigma * self.theta_1 ** 4) / (1 - self.theta_1 ** 4) ** 2)
-        den_final_term_2 = den_final_term_2_pt_1 + den_final_term_2_pt_2
-        final_term_2 = num_final_term_2 / den_final_term_2
+        if self.multipole is not None:
+            self.resist_bh_ave = float(self.multipole.calc_resistances(self.pipe.resist_pipe)[0])
+            return self.resist_bh_ave
 
-        self.resist_bh_ave = (1 / (4 * np.pi * self.grout.conductivity)
-                              ) * (self.beta + final_term_1 - final_term_2)
+        self.resist_bh_ave = float(calc_bh_average_resistance(self.shank_space, self.radius, self.pipe.outer_radius,
+                                                              self.grout.conductivity, self.soil.conductivity,
+                                                              self.pipe.resist_pipe))
 
         return self.resist_bh_ave
 
@@ -102,27 +156,74 @@ class BoreholeClass:
         for Grouted Single U-tube Ground Heat Exchangers.' J. Energy Engineering. Draft in progress.
 
         Equation 26
+
+        Uses the multipole solver instead, if set.
         """
 
         self.beta = 2 * np.pi * self.grout.conductivity * self.pipe.resist_pipe
 
-        final_term_1 = np.log(
-            ((1 + self.theta_1 ** 2) ** self.sigma) / (self.theta_3 * (1 - self.theta_1 ** 2) ** self.sigma))
-        num_term_2 = self.theta_3 ** 2 * \
-            (1 - self.theta_1 ** 4 + 4 * self.sigma * self.theta_1 ** 2) ** 2
-        den_term_2_pt_1 = (1 + self.beta) / (1 - self.beta) * \
-            (1 - self.theta_1 ** 4) ** 2
-        den_term_2_pt_2 = self.theta_3 ** 2 * (1 - self.theta_1 ** 4) ** 2
-        den_term_2_pt_3 = 8 * self.sigma * self.theta_1 ** 2 * \
-            self.theta_3 ** 2 * (1 + self.theta_1 ** 4)
-        den_term_2 = den_term_2_pt_1 - den_term_2_pt_2 + den_term_2_pt_3
-        final_term_2 = num_term_2 / den_term_2
-
-        self.resist_bh_total_internal = (1 / (np.pi * self.grout.conductivity)) * \
-                                        (self.beta + final_term_1 - final_term_2)
+        if self.multipole is not None:
+            self.resist_bh_total_internal = float(self.multipole.calc_resistances(self.pipe.resist_pipe)[1])
+            return self.resist_bh_total_internal
+
+        self.resist_bh_total_internal = float(calc_bh_total_internal_resistance(self.shank_space, self.radius,
+                                                                                self.pipe.outer_radius,
+                                                                                self.grout.conductivity,
+                                                                                self.soil.conductivity,
+                                                                                self.pipe.resist_pipe))
 
         return self.resist_bh_total_internal
 
+    def calc_bh_resistance_array(self, flow_rates, temps, soil_conductivity=None, grout_conductivity=None):
+        """
+        Calculates the effective thermal resistance of the borehole for arrays of flow rates and fluid
+        temperatures, as in calc_bh_resistance. Arrays are broadcast together.
+
+        Arrays of sampled soil and grout conductivities may be given, in which case the result has one row for
+        each sample. Pipe resistances do not depend on the conductivities, so are evaluated once for all samples.
+
+        :param flow_rates: array of volume flow rates [m3/s]
+        :param temps: array of fluid temperatures [C]
+        :param soil_conductivity: array of soil conductivities [W/m-K]. Defaults to the soil conductivity.
+        :param grout_conductivity: array of grout conductivities [W/m-K]. Defaults to the grout conductivity.
+        :returns array of borehole resistances, samples x states if conductivities are given
+        """
+
+        resist_pipe = self.pipe.calc_pipe_resistance_array(flow_rates, temps)
+
+        if soil_conductivity is None:
+            soil_conductivity = self.soil.conductivity
+            grout_conductivity = self.grout.conductivity
+        else:
+            soil_conductivity = np.asarray(soil_conductivity, dtype=float)[:, np.newaxis]
+            grout_conductivity = np.asarray(grout_conductivity, dtype=float)[:, np.newaxis]
+
+        if self.multipole is None:
+            resist_bh_ave = calc_bh_average_resistance(self.shank_space, self.radius, self.pipe.outer_radius,
+                                                       grout_conductivity, soil_conductivity, resist_pipe)
+            resist_bh_total_internal = calc_bh_total_internal_resistance(self.shank_space, self.radius,
+                                                                         self.pipe.outer_radius,
+                                                                         grout_conductivity,
+                                                                         soil_conductivity, resist_pipe)
+        elif np.ndim(soil_conductivity) == 0:
+            resist_bh_ave, resist_bh_total_internal = self.multipole.calc_resistances(resist_pipe)
+        else:
+            # the multipole systems depend on the conductivities, so are solved for each sample
+            resist_bh_ave = np.zeros((len(soil_conductivity),) + np.shape(resist_pipe))
+            resist_bh_total_internal = np.zeros_like(resist_bh_ave)
+
+            for i in range(len(soil_conductivity)):
+                multipole = get_multipole(self.shank_space, self.radius, self.pipe.outer_radius,
+                                          grout_conductivity[i, 0], soil_conductivity[i, 0], self.multipole_order,
+                                          self.num_u_tubes)
+                resist_bh_ave[i], resist_bh_total_internal[i] = multipole.calc_resistances(resist_pipe)
+
+        heat_capacity = self.pipe.fluid.heat_capacity_array(temps, flow_rates)
+
+        resist_short_circuiting = (1 / (3 * resist_bh_total_internal)) * (self.depth / heat_capacity) ** 2
+
+        return resist_bh_ave + resist_short_circuiting
+
     def calc_bh_grout_resistance(self):
         """
         Calculates borehole resistance. Use for validation.
@@ -133,7 +234,7 @@ class BoreholeClass:
 
         return self.resist_bh_grout
 
-    def calc_bh_resistance(self):
+    def calc_bh_resistance(self, update_pipe=False):
         """
         Calculates the effective thermal resistance of the borehole assuming a uniform heat flux.
 
@@ -148,10 +249,12 @@ class BoreholeClass:
         for Grouted Single U-tube Ground Heat Exchangers.' J. Energy Engineering. Draft in progress.
 
         Equation 14
+
+        :param update_pipe: if True, the pipe resistance is updated even if the flow rate has not changed
         """
 
         # only update if flow rate has changed
-        if self.pipe.fluid.flow_rate != self.pipe.fluid.flow_rate_prev:
+        if update_pipe or self.pipe.fluid.flow_rate != self.pipe.fluid.flow_rate_prev:
             self.beta = 2 * np.pi * self.grout.conductivity * self.pipe.calc_pipe_resistance()
             self.calc_bh_average_resistance()
             self.calc_bh_total_internal_resistance()
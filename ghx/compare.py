@@ -0,0 +1,196 @@
+import multiprocessing
+import os
+import re
+
+import numpy as np
+
+from ghx.results_store import ResultsStoreClass
+
+# files which mark a run directory
+results_file_names = ['GHX.bin', 'GHX.csv']
+
+# columns of the comparison table
+compare_columns = ['Rank', 'Dir', 'RMS Error BH Temp', 'Max Abs Err BH Temp', 'RMS Error MFT',
+                   'Max Abs Err MFT', 'Abs Sim Time', 'Percent of Base Sim Time']
+
+# keys of the comparison metrics, in the order of the table columns
+metric_keys = ['RMS BH', 'Max Abs BH', 'RMS MFT', 'Max Abs MFT', 'Sim Time', 'Percent Base Sim Time']
+
+sim_time_pattern = re.compile(rb'Simulation time: ([0-9.eE+-]+) sec')
+
+# base run temperatures, set once in each pool process
+base_temps = None
+
+
+def read_run_temps(run_dir):
+    """
+    Reads the hourly temperatures of a run directory, from the results store if there is one.
+
+    :param run_dir: path of the run directory
+    :returns array of borehole and mean fluid temperatures, 2 x hours
+    """
+
+    store_path = os.path.join(run_dir, 'GHX.bin')
+
+    if os.path.exists(store_path):
+        with ResultsStoreClass(store_path) as store:
+            return np.vstack(store.read())
+
+    with open(os.path.join(run_dir, 'GHX.csv'), 'rb') as in_file:
+        in_file.readline()
+        text = in_file.read().replace(b',', b' ')
+
+    # hour, borehole temperature, mean fluid temperature
+    values = np.fromstring(text, sep=' ')
+
+    return values.reshape(-1, 3)[:, 1:].T
+
+
+def read_sim_time(run_dir):
+    """
+    :returns last simulation time in the log of a run directory [sec]. NaN if there is none.
+    """
+
+    try:
+        with open(os.path.join(run_dir, 'ghx.log'), 'rb') as in_file:
+            matches = sim_time_pattern.findall(in_file.read())
+    except OSError:
+        return np.nan
+
+    if len(matches) == 0:
+        return np.nan
+
+    return float(matches[-1])
+
+
+def calc_errors(base, test):
+    """
+    Calculates the errors of each row of test temperatures against the base temperatures
+
+    :param base: array of base temperatures, rows x hours
+    :param test: array of test temperatures, rows x hours
+    :returns arrays of the root-mean-square and maximum absolute errors of each row.
+    NaN if the shapes do not match.
+    """
+
+    if base.shape != test.shape:
+        nan = np.full(base.shape[0], np.nan)
+        return nan, nan
+
+    diff = test - base
+
+    return np.sqrt(np.mean(diff * diff, axis=1)), np.max(np.abs(diff), axis=1)
+
+
+def find_run_dirs(path_to_root):
+    """
+    :returns sorted list of the directories under the root which hold results
+    """
+
+    run_dirs = []
+
+    for root, dirs, files in os.walk(path_to_root):
+        if any(name in files for name in results_file_names):
+            run_dirs.append(root)
+
+    return sorted(run_dirs)
+
+
+def set_base(temps):
+    """
+    Process pool initializer. Holds the base temperatures so they are sent to each process once.
+    """
+
+    global base_temps
+    base_temps = temps
+
+
+def compare_run(run_dir):
+    """
+    Process pool entry point. Compares one run directory against the base temperatures.
+
+    :returns tuple of the run directory, and the errors and simulation time
+    """
+
+    rms, max_abs = calc_errors(base_temps, read_run_temps(run_dir))
+
+    return run_dir, [rms[0], max_abs[0], rms[1], max_abs[1], read_sim_time(run_dir)]
+
+
+class CompareClass:
+    """
+    Compares the results of every run directory under a root against a base run.
+
+    Run directories are those holding a GHX.bin results store or a GHX.csv file. Each run's borehole and mean
+    fluid temperatures are compared over all hours at once, in a process pool if more than one process is used.
+    Simulation times are read from the run logs. Runs are ranked by the root-mean-square mean fluid temperature
+    error. Runs of a different length from the base have NaN errors and are ranked last.
+    """
+
+    def __init__(self, path_to_base, path_to_root, num_processes=1):
+        """
+        Constructor for the class.
+
+        :param path_to_base: path of the base run directory
+        :param path_to_root: path of the directory searched for runs
+        :param num_processes: number of processes comparing runs
+        """
+
+        self.path_to_base = path_to_base
+        self.path_to_root = path_to_root
+        self.num_processes = num_processes
+
+        self.base_temps = read_run_temps(path_to_base)
+        self.base_sim_time = read_sim_time(path_to_base)
+
+        self.rows = []
+
+    def compare(self):
+        """
+        Compares the runs, and ranks them
+
+        :return: list of dictionaries of the metrics of each run, in rank order
+        """
+
+        base_dir = os.path.realpath(self.path_to_base)
+        run_dirs = [d for d in find_run_dirs(self.path_to_root) if os.path.realpath(d) != base_dir]
+
+        if self.num_processes > 1 and len(run_dirs) > 1:
+            pool = multiprocessing.Pool(min(self.num_processes, len(run_dirs)), set_base, (self.base_temps,))
+            results = pool.map(compare_run, run_dirs, chunksize=max(len(run_dirs) // (4 * self.num_processes), 1))
+            pool.close()
+            pool.join()
+        else:
+            set_base(self.base_temps)
+            results = [compare_run(run_dir) for run_dir in run_dirs]
+
+        if len(results) == 0:
+            self.rows = []
+            return self.rows
+
+        metrics = np.array([result[1] for result in results], dtype=float).reshape(-1, len(metric_keys) - 1)
+        metrics = np.column_stack((metrics, metrics[:, 4] / self.base_sim_time))
+
+        # NaN errors sort last
+        order = np.argsort(metrics[:, 2], kind='stable')
+
+        self.rows = []
+        for rank, i in enumerate(order):
+            row = {'Rank': rank + 1, 'Dir': results[i][0]}
+            row.update(zip(metric_keys, metrics[i].tolist()))
+            self.rows.append(row)
+
+        return self.rows
+
+    def write_table(self, path):
+        """
+        Writes the ranked comparison table
+
+        :param path: path of the table file
+        """
+
+        with open(path, 'w') as out_file:
+            out_file.write("%s\n" % ",".join(compare_columns))
+            for row in self.rows:
+                out_file.write("%d,%s,%0.5f,%0.5f,%0.5f,%0.5f,%0.3f,%0.4f\n" %
+                               tuple([row['Rank'], row['Dir']] + [row[key] for key in metric_keys]))
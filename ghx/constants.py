@@ -1,5 +1,7 @@
 class ConstantClass:
     months_in_year = 12
+    hours_in_day = 24
+    hours_in_week = 168
     hours_in_month = 730
     hours_in_year = months_in_year * hours_in_month
     sec_in_hour = 3600
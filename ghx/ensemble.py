@@ -0,0 +1,160 @@
+import os
+
+import numpy as np
+
+from ghx.array_mlaa import GHXArrayMLAA
+from ghx.constants import ConstantClass
+from ghx.my_print import PrintClass
+
+
+class GHXArrayEnsemble(GHXArrayMLAA):
+    """
+    GHXArrayEnsemble simulates one ground heat exchanger array against many load scenarios in a single pass.
+
+    Superposition is linear in load, so the g-functions and the MLAA block boundaries are shared by all scenarios.
+    Each hour advances all scenarios together as one matrix product. Flow rates are read from the loads file
+    and are shared by all scenarios. Borehole resistance is pre-solved for each hour by calc_resistance_array,
+    with the fluid at the undisturbed ground temperature, so the fluid state does not follow each scenario.
+    'Resistance Correction Passes' correct each scenario at its own mean fluid temperatures.
+
+    Output sinks take one series of hourly temperatures, so they are not supported.
+    """
+
+    def __init__(self, json_data, loads_path, output_path, scenario_loads, print_output=True):
+        """
+        Constructor for the class.
+
+        :param scenario_loads: 2-D array of hourly loads, scenarios x hours. Loads repeat annually.
+        """
+
+        PrintClass(print_output, output_path)
+
+        # init base class
+        GHXArrayMLAA.__init__(self, json_data, loads_path, output_path, print_output)
+
+        self.scenario_loads = np.asarray(scenario_loads, dtype=float)
+
+        if self.scenario_loads.ndim != 2 or self.scenario_loads.shape[1] < ConstantClass.hours_in_year:
+            PrintClass.fatal_error(message="Scenario loads must be a 2-D array with at least %d hours per scenario"
+                                           % ConstantClass.hours_in_year)
+
+        self.num_scenarios = self.scenario_loads.shape[0]
+
+    def simulate(self):
+        """
+        Main simulation routine.
+        """
+
+        PrintClass.my_print("Beginning simulation")
+
+        if len(self.sinks) > 0:
+            PrintClass.fatal_error(message="Output sinks are not supported by GHXArrayEnsemble")
+
+        # calculate g-functions if not present
+        if not self.g_func_present:
+            PrintClass.my_print("G-functions not present", 'warn')
+            self.calc_g_func()
+
+        max_sim_hours = ConstantClass.hours_in_year * self.sim_years
+
+        # pre-load hourly g-functions
+        hours = np.arange(1, max_sim_hours + 1)
+        self.g_func_hourly = self.g_func_array(np.log(hours * ConstantClass.sec_in_hour / self.ts))
+
+        self.init_resistances()
+
+        # cumulative sum of loads over one year for each scenario. the first value is zero.
+        loads = self.scenario_loads[:, :ConstantClass.hours_in_year]
+        self.cumulative_loads = np.concatenate((np.zeros((self.num_scenarios, 1)), np.cumsum(loads, axis=1)), axis=1)
+
+        self.temp_bh = np.zeros((self.num_scenarios, max_sim_hours))
+        self.temp_mft = np.zeros((self.num_scenarios, max_sim_hours))
+
+        two_pi_k = 2 * np.pi * self.borehole.soil.conductivity
+        scale = two_pi_k * self.total_bh_length
+
+        sim_hour = 0
+
+        for year in range(self.sim_years):
+            for month in range(ConstantClass.months_in_year):
+
+                PrintClass.my_print("....Year/Month: %d/%d" %
+                                    (year + 1, month + 1))
+
+                for hour in range(ConstantClass.hours_in_month):
+
+                    sim_hour += 1
+
+                    # pre-solved borehole resistance
+                    curr_index = month * ConstantClass.hours_in_month + hour
+                    resist_bh = self.resist_bh_hourly[curr_index]
+
+                    # update aggregation blocks
+                    self.update_block_spans()
+                    starts = self.get_block_starts()
+                    ends = np.append(starts[1:], sim_hour)
+
+                    # mean block loads, scenarios x blocks
+                    q = np.diff(self.calc_cumulative_loads(np.append(starts, sim_hour))) / (ends - starts)
+                    delta_q = np.diff(q, prepend=0, axis=1)
+
+                    # calculate average bh temp
+                    g = self.g_func_hourly[sim_hour - starts - 1]
+
+                    # calculate mean fluid temp
+                    g_rb = g + resist_bh
+                    g_rb = np.where(g_rb < 0, resist_bh - resist_bh * two_pi_k, g_rb)
+
+                    # final bh temps
+                    self.temp_bh[:, sim_hour - 1] = self.borehole.soil.undisturbed_temp + np.dot(delta_q, g) / scale
+
+                    # final mean fluid temps
+                    self.temp_mft[:, sim_hour - 1] = self.borehole.soil.undisturbed_temp + \
+                        np.dot(delta_q, g_rb) / scale
+
+        self.correct_resistances()
+
+        return self.complete_simulation()
+
+    def get_hourly_loads(self, num_hours):
+        """
+        :param num_hours: number of hours
+        :return: array of hourly loads, which repeat annually, scenarios x hours
+        """
+
+        load_index = np.arange(num_hours) % ConstantClass.hours_in_year
+
+        return self.scenario_loads[:, load_index]
+
+    def generate_output_reports(self):  # pragma: no cover
+        """
+        Generates output results. One file is written for each scenario.
+        """
+
+        try:
+            PrintClass.my_print("Writing output results")
+            cwd = os.getcwd()
+            path_to_output_dir = os.path.join(cwd, self.output_path)
+
+            if not os.path.exists(path_to_output_dir):
+                os.makedirs(path_to_output_dir)
+
+            for scenario in range(self.num_scenarios):
+                # open files
+                out_file = open(os.path.join(path_to_output_dir, "GHX_%d.csv" % (scenario + 1)), 'w')
+
+                # write headers
+                out_file.write("Hour, BH Temp [C], MFT [C]\n")
+
+                for i in range(self.temp_bh.shape[1]):
+                    out_file.write("%d, %0.4f, %0.4f\n" % (i + 1,
+                                                           self.temp_bh[scenario, i],
+                                                           self.temp_mft[scenario, i]))
+
+                # close file
+                out_file.close()
+
+            PrintClass.my_print("....Success")
+
+        except:  # pragma: no cover
+            PrintClass.fatal_error(message="Error writing output results")
@@ -0,0 +1,152 @@
+import os
+import re
+
+import CoolProp.CoolProp as cp
+import numpy as np
+
+from ghx.constants import ConstantClass
+
+# CoolProp incompressible mixtures, keyed by fluid type
+mixture_names = {'PropyleneGlycol': 'MPG',
+                 'EthyleneGlycol': 'MEG'}
+
+# property tables, keyed by CoolProp fluid name, pressure, and the table parameters
+property_tables = {}
+
+# columns of the property tables, after temperature
+property_keys = ['D', 'C', 'V', 'L']
+
+# temperature step of the property tables [C]
+table_temp_step = 0.05
+
+# highest temperature of the property tables [C]. water boils just below 100 C at atmospheric pressure.
+table_max_temp = 95.0
+
+
+def get_table_dir():
+    """
+    :returns directory of the cached property tables. Set by the GHX_CACHE_DIR environment variable.
+    """
+
+    return os.environ.get('GHX_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'ghx'))
+
+
+def get_coolprop_name(fluid_type, concentration):
+    """
+    Gets the CoolProp name of a fluid
+
+    :param fluid_type: 'Water', a glycol from mixture_names, or a CoolProp fluid name
+    :param concentration: mass concentration of glycol mixtures [%]
+    :returns CoolProp fluid name
+    """
+
+    if fluid_type in mixture_names:
+        if concentration <= 0:
+            return 'Water'
+        return "INCOMP::%s[%g]" % (mixture_names[fluid_type], concentration / 100.0)
+
+    return fluid_type
+
+
+def calc_table_temps(fluid_name):
+    """
+    :returns array of table temperatures, from just above freezing to the highest table temperature [C]
+    """
+
+    if fluid_name.startswith('INCOMP::'):
+        temp_min = cp.PropsSI('T_freeze', 'T', 0, 'P', 0, fluid_name)
+    else:
+        temp_min = cp.PropsSI('Tmin', fluid_name)
+
+    temp_min -= ConstantClass.celsius_to_kelvin
+    temp_min = round(np.ceil(temp_min / table_temp_step + 1) * table_temp_step, 10)
+
+    num_temps = int(round((table_max_temp - temp_min) / table_temp_step)) + 1
+
+    return temp_min + table_temp_step * np.arange(num_temps)
+
+
+def build_property_table(fluid_name, pressure):
+    """
+    Builds a property table with one CoolProp call per property
+
+    :returns array of temperatures [C], and density, specific heat, viscosity, and conductivity, temperatures x 5
+    """
+
+    temps = calc_table_temps(fluid_name)
+
+    table = np.zeros((len(temps), len(property_keys) + 1))
+    table[:, 0] = temps
+
+    for i, key in enumerate(property_keys):
+        table[:, i + 1] = cp.PropsSI(key, 'T', temps + ConstantClass.celsius_to_kelvin, 'P', pressure, fluid_name)
+
+    return table
+
+
+def get_property_table(fluid_name, pressure):
+    """
+    Gets the property table of a fluid. Tables are built once, saved to the cache directory, and memory-mapped.
+    Tables are held in memory if the cache directory cannot be written.
+
+    Tables are keyed by every parameter which shapes them: the fluid, pressure, temperature step, highest
+    temperature, and the CoolProp version, so a table is never reused for a different range.
+
+    :returns property table
+    """
+
+    key = (fluid_name, pressure, table_temp_step, table_max_temp, cp.get_global_param_string('version'))
+
+    if key in property_tables:
+        return property_tables[key]
+
+    file_name = "%s_%g_%g_%g_%s.npy" % (re.sub(r'[^A-Za-z0-9.-]+', '_', fluid_name), pressure, table_temp_step,
+                                        table_max_temp, key[-1])
+    table_path = os.path.join(get_table_dir(), file_name)
+
+    try:
+        table = np.load(table_path, mmap_mode='r')
+    except (OSError, ValueError):
+        table = build_property_table(fluid_name, pressure)
+        try:
+            os.makedirs(get_table_dir(), exist_ok=True)
+            # write then rename, so other processes never read a partial table
+            tmp_path = "%s.%d.tmp" % (table_path, os.getpid())
+            with open(tmp_path, 'wb') as tmp_file:
+                np.save(tmp_file, table)
+            os.replace(tmp_path, table_path)
+            table = np.load(table_path, mmap_mode='r')
+        except OSError:  # pragma: no cover
+            pass
+
+    property_tables[key] = table
+
+    return table
+
+
+def interp_properties(table, temps):
+    """
+    Interpolates the property table linearly at an array of temperatures
+
+    :param table: property table
+    :param temps: array of temperatures [C]. Temperatures outside the table are not valid.
+    :returns array of properties, temperatures x 4
+    """
+
+    temps = np.asarray(temps, dtype=float)
+
+    position = (temps - table[0, 0]) / table_temp_step
+    index = np.clip(np.floor(position).astype(int), 0, len(table) - 2)
+    weight = (position - index)[..., np.newaxis]
+
+    return (1 - weight) * table[index, 1:] + weight * table[index + 1, 1:]
+
+
+def in_table(table, temps):
+    """
+    :returns True where the temperatures are within the table
+    """
+
+    temps = np.asarray(temps, dtype=float)
+
+    return (temps >= table[0, 0]) & (temps <= table[-1, 0])
@@ -1,12 +1,26 @@
 import CoolProp.CoolProp as cp
+import numpy as np
 
 from ghx.constants import ConstantClass
+from ghx.fluid_tables import get_coolprop_name, get_property_table, interp_properties, in_table, property_keys
 from ghx.my_print import PrintClass
 
 
 class FluidsClass:
     """
     Contains all fluid properties, correlations, etc.
+
+    Properties are re-evaluated only once the temperature has drifted beyond the optional
+    'Temperature Tolerance' since the last evaluation. Skipped updates are counted, and the largest relative
+    property error they cause is estimated from the change in each property between evaluations. The tolerance
+    also sets the temperature resolution of the borehole resistances evaluated by the 'Resistance Correction
+    Passes'. Temperatures rounded to that resolution are counted as skipped updates, and their property error is
+    measured directly. Resistances pre-solved before the time loop are at the undisturbed ground temperature, so
+    it has no effect on them.
+
+    'Type' is 'Water', 'PropyleneGlycol', 'EthyleneGlycol', or a CoolProp fluid name. Glycol 'Concentration' is
+    the mass concentration [%]. Properties are interpolated from a table for each fluid and concentration, which is
+    built once and cached on disk. Temperatures outside the table are evaluated by CoolProp directly.
     """
 
     def __init__(self, json_data, initial_temp, print_output):
@@ -30,9 +44,33 @@ class FluidsClass:
             PrintClass.my_print("....'Flow Rate' key not found", 'warn')
             PrintClass.fatal_error(message="Error initializing FluidsClass")
 
+        try:
+            self.temp_tolerance = json_data['Temperature Tolerance']
+        except KeyError:
+            # optional. properties are re-evaluated whenever the temperature changes.
+            self.temp_tolerance = 0.0
+
         self.temperature = initial_temp
         self.temperature_prev = None
         self.pressure = 101325
+
+        self.coolprop_name = get_coolprop_name(self.fluid_type, self.concentration)
+
+        try:
+            self.property_table = get_property_table(self.coolprop_name, self.pressure)
+        except ValueError:  # pragma: no cover
+            PrintClass.my_print("....Fluid '%s' not supported by CoolProp" % self.coolprop_name, 'warn')
+            PrintClass.fatal_error(message="Error initializing FluidsClass")
+
+        # property update statistics
+        self.temperature_eval = None
+        self.temperature_checked = None
+        self.num_evaluations = 0
+        self.num_skipped = 0
+        self.max_drift = 0.0
+        self.max_skipped_drift = 0.0
+        self.max_property_error = 0.0
+
         self.mass_flow_rate = self.calc_mass_flow_rate()
         self.dens_val = self.dens()
         self.cp_val = self.cp()
@@ -41,6 +79,112 @@ class FluidsClass:
         self.pr_val = self.pr()
         self.heat_capacity_val = self.heat_capacity()
 
+    def calc_properties(self, temps):
+        """
+        Evaluates the density, specific heat, viscosity, and conductivity at an array of temperatures, in Celsius.
+
+        :param temps: array of temperatures
+        :returns array of properties, with a last axis ordered as the property keys
+        """
+
+        temps = np.asarray(temps, dtype=float)
+
+        vals = interp_properties(self.property_table, temps)
+
+        outside = ~in_table(self.property_table, temps)
+        if np.any(outside):
+            flat_temps = temps.ravel()
+            flat_vals = vals.reshape(-1, len(property_keys))
+            for i in np.flatnonzero(outside):
+                temp = flat_temps[i] + ConstantClass.celsius_to_kelvin
+                flat_vals[i] = [cp.PropsSI(key, 'T', temp, 'P', self.pressure, self.coolprop_name)
+                                for key in property_keys]
+
+        return vals
+
+    def update_properties(self):
+        """
+        Re-evaluates the density, specific heat, viscosity, and conductivity if the temperature has drifted
+        beyond the tolerance since the last evaluation.
+        Uses the CoolProp python library.
+        """
+
+        if self.temperature == self.temperature_checked:
+            return
+
+        self.temperature_checked = self.temperature
+
+        if self.temperature_eval is not None:
+            drift = abs(self.temperature - self.temperature_eval)
+            if drift <= self.temp_tolerance:
+                if drift > 0:
+                    self.num_skipped += 1
+                    self.max_drift = max(self.max_drift, drift)
+                    self.max_skipped_drift = max(self.max_skipped_drift, drift)
+                return
+
+        new_vals = list(self.calc_properties(self.temperature))
+
+        # skipped updates held the properties at the last evaluation. the change in each property since then
+        # gives its slope, and so the error at the largest drift.
+        if self.max_drift > 0:
+            old_vals = [self.dens_val, self.cp_val, self.visc_val, self.cond_val]
+            delta_temp = abs(self.temperature - self.temperature_eval)
+            for old_val, new_val in zip(old_vals, new_vals):
+                error = abs(new_val - old_val) / (abs(old_val) * delta_temp) * self.max_drift
+                self.max_property_error = max(self.max_property_error, error)
+            self.max_drift = 0.0
+
+        self.dens_val, self.cp_val, self.visc_val, self.cond_val = new_vals
+        self.temperature_eval = self.temperature
+        self.num_evaluations += 1
+
+    def record_rounded_temps(self, temps, rounded_temps):
+        """
+        Records temperatures whose properties are evaluated at a rounded temperature as skipped updates.
+        The property error of each is measured against the properties at its own temperature. Properties are
+        counted as evaluated once for each rounded temperature.
+
+        :param temps: array of temperatures
+        :param rounded_temps: array of the temperatures the properties are evaluated at
+        """
+
+        temps = np.asarray(temps, dtype=float)
+        rounded_temps = np.asarray(rounded_temps, dtype=float)
+
+        self.num_evaluations += len(np.unique(rounded_temps))
+
+        drift = np.abs(temps - rounded_temps)
+        skipped = drift > 0
+
+        if not np.any(skipped):
+            return
+
+        vals = self.calc_properties(temps[skipped])
+        rounded_vals = self.calc_properties(rounded_temps[skipped])
+
+        self.num_skipped += int(np.count_nonzero(skipped))
+        self.max_skipped_drift = max(self.max_skipped_drift, float(np.max(drift)))
+        self.max_property_error = max(self.max_property_error,
+                                      float(np.max(np.abs(vals - rounded_vals) / np.abs(rounded_vals))))
+
+    def report_property_updates(self):
+        """
+        Reports the number of property evaluations, skipped updates, and the largest estimated property error
+
+        :return: dictionary of property update statistics
+        """
+
+        PrintClass.my_print("....Fluid properties: %d evaluations, %d updates skipped, max drift %0.3g C, "
+                            "max estimated property error %0.3g%%" %
+                            (self.num_evaluations, self.num_skipped, self.max_skipped_drift,
+                             self.max_property_error * 100))
+
+        return {'Evaluations': self.num_evaluations,
+                'Skipped': self.num_skipped,
+                'Max Drift': float(self.max_skipped_drift),
+                'Max Property Error': float(self.max_property_error)}
+
     def dens(self):
         """
         Determines the fluid density as a function of temperature, in Celsius.
@@ -49,9 +193,7 @@ class FluidsClass:
 
         :returns fluid density in [kg/m3]
         """
-        if self.temperature != self.temperature_prev:
-            self.dens_val = cp.PropsSI('D', 'T', self.temperature + ConstantClass.celsius_to_kelvin, 'P', self.pressure,
-                                       self.fluid_type)
+        self.update_properties()
 
         return self.dens_val
 
@@ -64,9 +206,7 @@ class FluidsClass:
         :returns fluid specific heat in [J/kg-K]
         """
 
-        if self.temperature != self.temperature_prev:
-            self.cp_val = cp.PropsSI('C', 'T', self.temperature + ConstantClass.celsius_to_kelvin, 'P', self.pressure,
-                                     self.fluid_type)
+        self.update_properties()
 
         return self.cp_val
 
@@ -79,9 +219,7 @@ class FluidsClass:
         :returns fluid viscosity in [Pa-s]
         """
 
-        if self.temperature != self.temperature_prev:
-            self.visc_val = cp.PropsSI('V', 'T', self.temperature + ConstantClass.celsius_to_kelvin, 'P', self.pressure,
-                                       self.fluid_type)
+        self.update_properties()
 
         return self.visc_val
 
@@ -94,9 +232,7 @@ class FluidsClass:
         :returns fluid conductivity in [W/m-K]
         """
 
-        if self.temperature != self.temperature_prev:
-            self.cond_val = cp.PropsSI('L', 'T', self.temperature + ConstantClass.celsius_to_kelvin, 'P', self.pressure,
-                                       self.fluid_type)
+        self.update_properties()
 
         return self.cond_val
 
@@ -118,6 +254,66 @@ class FluidsClass:
 
         return self.mass_flow_rate * self.cp()
 
+    def calc_property_array(self, key, temps):
+        """
+        Evaluates a fluid property at an array of temperatures, in Celsius.
+
+        :param key: CoolProp output key
+        :param temps: array of temperatures
+        :returns array of property values, with the same shape as the temperatures
+        """
+
+        return self.calc_properties(temps)[..., property_keys.index(key)]
+
+    def dens_array(self, temps):
+        """
+        :returns array of fluid densities in [kg/m3] at an array of temperatures, in Celsius
+        """
+
+        return self.calc_property_array('D', temps)
+
+    def cp_array(self, temps):
+        """
+        :returns array of fluid specific heats in [J/kg-K] at an array of temperatures, in Celsius
+        """
+
+        return self.calc_property_array('C', temps)
+
+    def visc_array(self, temps):
+        """
+        :returns array of fluid viscosities in [Pa-s] at an array of temperatures, in Celsius
+        """
+
+        return self.calc_property_array('V', temps)
+
+    def cond_array(self, temps):
+        """
+        :returns array of fluid conductivities in [W/m-K] at an array of temperatures, in Celsius
+        """
+
+        return self.calc_property_array('L', temps)
+
+    def pr_array(self, temps):
+        """
+        :returns array of fluid Prandtl numbers at an array of temperatures, in Celsius
+        """
+
+        return self.cp_array(temps) * self.visc_array(temps) / self.cond_array(temps)
+
+    def heat_capacity_array(self, temps, flow_rates=None):
+        """
+        Calculates fluid thermal capacitance at arrays of temperatures and flow rates
+
+        :param temps: array of temperatures, in Celsius
+        :param flow_rates: array of volume flow rates. Defaults to the current flow rate.
+        :returns array of fluid thermal capacitances in [W/K]
+        """
+
+        if flow_rates is None:
+            flow_rates = self.flow_rate
+
+        return np.asarray(flow_rates, dtype=float) * self.dens_array(temps) * self.cp_array(temps)
+
     def calc_mass_flow_rate(self):
         """
         Calculates the fluid mass flow rate
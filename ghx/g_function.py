@@ -0,0 +1,128 @@
+import math
+
+import numpy as np
+
+# g-functions are cached by borehole field geometry
+g_func_cache = {}
+
+# default non-dimensional times for calculated g-functions
+default_ln_t_ts = np.linspace(-8.5, 3.0, 47)
+
+calc_erf = np.vectorize(math.erf, otypes=[float])
+
+
+def calc_erf_integral(x):
+    """
+    Integral of the error function from 0 to x
+
+    :param x: array of values
+    :returns array of integrals
+    """
+
+    x = np.asarray(x, dtype=float)
+
+    return x * calc_erf(x) - (1 - np.exp(-x ** 2)) / np.sqrt(np.pi)
+
+
+def calc_fls_response(distances, depth, burial_depth, ln_t_ts, points_per_decade=100):
+    """
+    Finite line source response at a distance from a borehole with uniform heat flux, averaged over the length
+    of a parallel borehole of the same length and burial depth. The ground surface is held at the undisturbed
+    temperature by an image source.
+
+    h(d, t) = 1/2 * integral from 1/sqrt(4 * alpha * t) to infinity of exp(-d^2 s^2) / (H s^2) * Y(s) ds
+
+    Y(s) = 2 ierf(H s) + 2 ierf((2D + H) s) - ierf(2D s) - ierf((2D + 2H) s)
+
+    With t expressed as ln(t/ts), where ts = H^2 / (9 * alpha), the response does not depend on the diffusivity.
+    The integrals are evaluated by the trapezoidal rule on a logarithmic grid, cumulative from the upper limit,
+    so all times are found from one pass for each distance.
+
+    Claesson, J. and Javed, S. 2011. 'An analytical method to calculate borehole fluid temperatures for
+    time-scales from minutes to decades.' ASHRAE Transactions, 117(2): 279-288.
+
+    :param distances: array of distances between boreholes. The borehole radius is used for the self-response.
+    :param depth: borehole length [m]
+    :param burial_depth: depth to the top of the boreholes [m]
+    :param ln_t_ts: array of non-dimensional times, ln(t/ts)
+    :param points_per_decade: integration points per decade of s
+    :returns array of responses, distances x times
+    """
+
+    distances = np.asarray(distances, dtype=float)
+    ln_t_ts = np.asarray(ln_t_ts, dtype=float)
+
+    # lower integration limits
+    s_lower = 3 / (2 * depth * np.exp(ln_t_ts / 2))
+
+    # the integrand is negligible once d * s is large
+    s_upper = 8 / np.min(distances)
+    ln_s_min = np.log(min(np.min(s_lower), s_upper / 10))
+    ln_s_max = np.log(s_upper)
+
+    num_points = int(np.ceil((ln_s_max - ln_s_min) / np.log(10) * points_per_decade)) + 1
+    ln_s = np.linspace(ln_s_min, ln_s_max, num_points)
+    s = np.exp(ln_s)
+
+    y = 2 * calc_erf_integral(depth * s) + 2 * calc_erf_integral((2 * burial_depth + depth) * s) - \
+        calc_erf_integral(2 * burial_depth * s) - calc_erf_integral((2 * burial_depth + 2 * depth) * s)
+
+    # integrand in terms of ln(s), distances x points
+    integrand = np.exp(-(distances[:, np.newaxis] * s[np.newaxis, :]) ** 2) * y / (depth * s)
+
+    # cumulative integrals from the upper limit
+    steps = (integrand[:, 1:] + integrand[:, :-1]) / 2 * np.diff(ln_s)
+    cumulative = np.zeros_like(integrand)
+    cumulative[:, :-1] = np.cumsum(steps[:, ::-1], axis=1)[:, ::-1]
+
+    response = np.zeros((len(distances), len(ln_t_ts)))
+    for i in range(len(distances)):
+        response[i] = 0.5 * np.interp(np.log(s_lower), ln_s, cumulative[i])
+
+    return response
+
+
+def calc_g_func(locations, depth, radius, burial_depth=0.0, ln_t_ts=None):
+    """
+    Calculates the g-function of a field of boreholes of equal length with the finite line source.
+
+    Each borehole has the same uniform heat flux, and the g-function is the mean response over all boreholes.
+    At long times this is somewhat higher than the uniform borehole wall temperature g-functions of Eskilson.
+    Pairs of boreholes at the same distance are calculated once, and results are cached by field geometry.
+
+    :param locations: list of [x, y] borehole locations [m]
+    :param depth: borehole length [m]
+    :param radius: borehole radius [m]
+    :param burial_depth: depth to the top of the boreholes [m]
+    :param ln_t_ts: non-dimensional times, ln(t/ts). Defaults to -8.5 to 3.0.
+    :returns tuple of ln(t/ts) and g-function arrays
+    """
+
+    if ln_t_ts is None:
+        ln_t_ts = default_ln_t_ts
+
+    locations = np.asarray(locations, dtype=float).reshape(-1, 2)
+    ln_t_ts = np.asarray(ln_t_ts, dtype=float)
+
+    key = (tuple(np.round(locations, 4).ravel()), round(depth, 4), round(radius, 6), round(burial_depth, 4),
+           tuple(np.round(ln_t_ts, 6)))
+
+    if key in g_func_cache:
+        return ln_t_ts, g_func_cache[key].copy()
+
+    # distances between all pairs of boreholes
+    delta = locations[:, np.newaxis, :] - locations[np.newaxis, :, :]
+    distances = np.sqrt(np.sum(delta ** 2, axis=2))
+
+    # co-located boreholes, including each borehole with itself, respond at the borehole radius
+    distances = np.maximum(distances, radius)
+
+    unique_distances, counts = np.unique(np.round(distances, 4), return_counts=True)
+
+    response = calc_fls_response(unique_distances, depth, burial_depth, ln_t_ts)
+
+    g = np.dot(counts, response) / len(locations)
+
+    g_func_cache[key] = g
+
+    return ln_t_ts, g.copy()
@@ -0,0 +1,239 @@
+import multiprocessing
+import os
+import re
+
+import simplejson as json
+
+# EnergyPlus object converted to GHX input data
+ghx_object_type = 'GroundHeatExchanger:Vertical'
+
+# fields of the object before the g-function pairs
+vertical_fields = ['Name',
+                   'Inlet Node Name',
+                   'Outlet Node Name',
+                   'Design Flow Rate',
+                   'Number of Bore Holes',
+                   'Bore Hole Length',
+                   'Bore Hole Radius',
+                   'Ground Thermal Conductivity',
+                   'Ground Thermal Heat Capacity',
+                   'Ground Temperature',
+                   'Grout Thermal Conductivity',
+                   'Pipe Thermal Conductivity',
+                   'Pipe Out Diameter',
+                   'U-Tube Distance',
+                   'Pipe Thickness',
+                   'Maximum Length of Simulation',
+                   'G-Function Reference Ratio',
+                   'Number of Data Pairs of the G Function']
+
+# simulation configuration of the converted input data. 'Simulation Years' is taken from the object.
+default_sim_config = {'Aggregation Type': 'Fixed',
+                      'Min Hourly History': 5,
+                      'Intervals': [12, 48, 192, 384]}
+
+# properties which are not in the object
+default_properties = {'Fluid Type': 'Water',
+                      'Fluid Concentration': 100,
+                      'Soil Density': 1500,
+                      'Pipe Density': 800,
+                      'Pipe Specific Heat': 1000,
+                      'Grout Density': 1000,
+                      'Grout Specific Heat': 1000}
+
+
+def read_idf_objects(path_to_idf, object_type=ghx_object_type):
+    """
+    Reads the objects of one type from an IDF file.
+
+    The file is read a line at a time, and fields are only kept for objects of the requested type, so memory
+    does not depend on the size of the file. Lines of other objects are skipped up to the ';' ending the object.
+    Comments, following '!', are dropped. Object types are matched without regard to case, as in EnergyPlus.
+
+    :param path_to_idf: path of the IDF file
+    :param object_type: EnergyPlus object type
+    :returns generator of lists of the field strings of each object, without the object type
+    """
+
+    object_type = object_type.lower()
+
+    # fields of the object being read. None if the object is skipped.
+    fields = None
+    in_object = False
+    token = ''
+
+    with open(path_to_idf, 'r') as in_file:
+        for line in in_file:
+            line = line.split('!', 1)[0]
+
+            if in_object and fields is None:
+                if ';' not in line:
+                    continue
+                line = line.split(';', 1)[1]
+                in_object = False
+                token = ''
+
+            for part in re.split(r'([,;])', line):
+                if part != ',' and part != ';':
+                    token += part
+                    continue
+
+                token = token.strip()
+
+                if not in_object:
+                    in_object = True
+                    fields = [] if token.lower() == object_type else None
+                elif fields is not None:
+                    fields.append(token)
+
+                token = ''
+
+                if part == ';':
+                    if fields is not None:
+                        yield fields
+                    fields = None
+                    in_object = False
+
+
+def vertical_to_json(fields, sim_config=None):
+    """
+    Converts the fields of a GroundHeatExchanger:Vertical object to GHX input data.
+
+    Each borehole has the properties of the object, at location [0, 0], since the g-function already describes
+    the field. The shank spacing is the U-tube distance, which is between the pipe walls, plus the pipe diameter.
+    The ground heat capacity is divided into the soil density and specific heat. Every g-function pair is kept.
+
+    :param fields: list of field strings of the object
+    :param sim_config: simulation configuration. Defaults to default_sim_config.
+    :returns dictionary of GHX input data
+    """
+
+    if len(fields) < len(vertical_fields):
+        raise ValueError("'%s' has %d fields, %d are required" % (fields[0], len(fields), len(vertical_fields)))
+
+    try:
+        vals = dict(zip(vertical_fields[3:], [float(field) for field in fields[3:len(vertical_fields)]]))
+        pairs = [float(field) for field in fields[len(vertical_fields):]]
+    except ValueError:
+        raise ValueError("'%s' has a field which is not a number" % fields[0])
+
+    num_pairs = min(int(vals['Number of Data Pairs of the G Function']), len(pairs) // 2)
+
+    if sim_config is None:
+        sim_config = default_sim_config
+
+    json_data = {'Name': fields[0],
+                 'Simulation Configuration': dict(sim_config)}
+
+    json_data['Simulation Configuration'].setdefault('Simulation Years', int(vals['Maximum Length of Simulation']))
+
+    borehole = {'Location': [0, 0],
+                'Depth': vals['Bore Hole Length'],
+                'Radius': vals['Bore Hole Radius'],
+                'Shank Spacing': vals['U-Tube Distance'] + vals['Pipe Out Diameter'],
+                'Pipe': {'Outside Diameter': vals['Pipe Out Diameter'],
+                         'Wall Thickness': vals['Pipe Thickness'],
+                         'Conductivity': vals['Pipe Thermal Conductivity'],
+                         'Density': default_properties['Pipe Density'],
+                         'Specific Heat': default_properties['Pipe Specific Heat']},
+                'Fluid': {'Type': default_properties['Fluid Type'],
+                          'Concentration': default_properties['Fluid Concentration'],
+                          'Flow Rate': vals['Design Flow Rate']},
+                'Soil': {'Conductivity': vals['Ground Thermal Conductivity'],
+                         'Density': default_properties['Soil Density'],
+                         'Specific Heat': vals['Ground Thermal Heat Capacity'] / default_properties['Soil Density'],
+                         'Temperature': vals['Ground Temperature']},
+                'Grout': {'Conductivity': vals['Grout Thermal Conductivity'],
+                          'Density': default_properties['Grout Density'],
+                          'Specific Heat': default_properties['Grout Specific Heat']}}
+
+    json_data['GHXs'] = []
+    for i in range(int(vals['Number of Bore Holes'])):
+        json_data['GHXs'].append(dict({'Name': "BH %d" % (i + 1)}, **borehole))
+
+    json_data['G-func Pairs'] = [pairs[2 * i:2 * i + 2] for i in range(num_pairs)]
+
+    return json_data
+
+
+def convert_idf(path_to_idf, path_to_json, sim_config=None):
+    """
+    Converts the GroundHeatExchanger:Vertical objects of an IDF file to GHX input data files.
+
+    If the file holds one object, it is written to the JSON path. Otherwise, each object is written beside it,
+    with the object name appended to the file name.
+
+    :param path_to_idf: path of the IDF file
+    :param path_to_json: path of the JSON file
+    :param sim_config: simulation configuration. Defaults to default_sim_config.
+    :returns list of paths of the written files
+    """
+
+    objects = [vertical_to_json(fields, sim_config) for fields in read_idf_objects(path_to_idf)]
+
+    if len(objects) == 0:
+        raise ValueError("'%s' has no %s objects" % (path_to_idf, ghx_object_type))
+
+    out_dir = os.path.dirname(path_to_json)
+    if out_dir and not os.path.exists(out_dir):
+        os.makedirs(out_dir, exist_ok=True)
+
+    paths = []
+    for json_data in objects:
+        if len(objects) == 1:
+            path = path_to_json
+        else:
+            root, ext = os.path.splitext(path_to_json)
+            path = "%s_%s%s" % (root, re.sub(r'[^A-Za-z0-9.-]+', '_', json_data['Name']), ext)
+
+        with open(path, 'w') as out_file:
+            json.dump(json_data, out_file, indent=4)
+
+        paths.append(path)
+
+    return paths
+
+
+def convert_file(args):
+    """
+    Process pool entry point. Converts one IDF file.
+
+    :param args: tuple of the IDF path, JSON path, and simulation configuration
+    :returns tuple of the IDF path, the list of written paths, and the error message. None if there is no error.
+    """
+
+    path_to_idf, path_to_json, sim_config = args
+
+    try:
+        return path_to_idf, convert_idf(path_to_idf, path_to_json, sim_config), None
+    except (OSError, ValueError) as error:
+        return path_to_idf, [], str(error)
+
+
+def convert_dir(path_to_idf_dir, path_to_json_dir, sim_config=None, num_processes=1):
+    """
+    Converts every IDF file in a directory, in a process pool if more than one process is used.
+    Files which cannot be converted are reported, and do not stop the others.
+
+    :param path_to_idf_dir: path of the directory of IDF files
+    :param path_to_json_dir: path of the output directory
+    :param sim_config: simulation configuration. Defaults to default_sim_config.
+    :param num_processes: number of processes converting files
+    :returns list of tuples of the IDF path, the list of written paths, and the error message for each file
+    """
+
+    names = sorted(name for name in os.listdir(path_to_idf_dir) if name.lower().endswith('.idf'))
+
+    args = [(os.path.join(path_to_idf_dir, name),
+             os.path.join(path_to_json_dir, os.path.splitext(name)[0] + '.json'),
+             sim_config) for name in names]
+
+    if num_processes > 1 and len(args) > 1:
+        pool = multiprocessing.Pool(min(num_processes, len(args)))
+        results = pool.map(convert_file, args)
+        pool.close()
+        pool.join()
+    else:
+        results = [convert_file(arg) for arg in args]
+
+    return results
@@ -0,0 +1,361 @@
+import copy
+import multiprocessing
+import os
+import timeit
+
+import numpy as np
+import simplejson as json
+
+from ghx.base import read_loads
+from ghx.g_function import calc_g_func
+from ghx.my_print import PrintClass
+from ghx.sizing import SizingClass
+
+# optimizer which sizes the layouts, set once in each pool process
+layout_optimizer = None
+
+
+def set_optimizer(optimizer):
+    """
+    Process pool initializer. Holds the optimizer so its input data and loads are sent to each process once.
+    """
+
+    global layout_optimizer
+    layout_optimizer = optimizer
+
+
+def size_layout(args):
+    """
+    Process pool entry point. Sizes one layout.
+
+    :param args: tuple of the layout, and the design mode flag
+    :returns dictionary of sizing results. None if the layout could not be sized.
+    """
+
+    layout, design_mode = args
+
+    return layout_optimizer.size_layout(layout, design_mode)
+
+
+class LayoutOptimizerClass:
+    """
+    Finds the borehole field layout with the least total borehole length which fits on the land area
+    and keeps the mean fluid temperature within the given limits.
+
+    Rectangular and L-shaped layouts are enumerated for each spacing. Every layout is first screened by sizing
+    in design mode. Layouts which cannot be sized within the depth limits are discarded. The rest are sized
+    by exact superposition in order of their screened total length, and a layout is skipped once its screened
+    length exceeds the best sized length by more than the screening margin. Layouts are sized in batches,
+    in a process pool if more than one process is used. One pool is used for the whole optimization, and the
+    input data and loads are sent to each process once, so each process also keeps its g-function cache.
+
+    Each layout uses the first borehole of the input data as its template. G-functions are calculated with
+    the finite line source at the template depth, then again at the sized depth before a final sizing.
+    Loads are read once, and layouts are sized in memory, so only the optimizer writes output files.
+    """
+
+    shape_names = ['Rectangle', 'L']
+
+    def __init__(self, json_data, loads_path, output_path, land_width, land_length, min_mft=None, max_mft=None,
+                 print_output=True, spacings=(5.0, 6.0, 8.0), shapes=('Rectangle', 'L'), min_depth=30.0,
+                 max_depth=150.0, max_boreholes=100, screening_margin=0.1, peak_duration=6, num_processes=1):
+        """
+        Constructor for the class.
+
+        :param json_data: GHX input data. The first borehole is the template for all boreholes.
+        :param loads_path: path of the loads file, or an array of hours, loads, and flow rates
+        :param output_path: path of the output directory
+        :param land_width: width of the land area [m]
+        :param land_length: length of the land area [m]
+        :param min_mft: minimum allowable mean fluid temperature [C]. None if not limited.
+        :param max_mft: maximum allowable mean fluid temperature [C]. None if not limited.
+        :param spacings: candidate borehole spacings [m]
+        :param shapes: candidate layout shapes
+        :param min_depth: minimum allowable borehole depth [m]
+        :param max_depth: maximum allowable borehole depth [m]
+        :param max_boreholes: maximum number of boreholes
+        :param screening_margin: fraction by which a screened length may exceed the best sized length
+        and still be sized
+        :param peak_duration: 'Peak Duration' used for design mode screening [hr]
+        :param num_processes: number of processes. Layouts are sized in a process pool if greater than 1.
+        """
+
+        PrintClass(print_output, output_path)
+
+        self.timer_start = timeit.default_timer()
+
+        for shape in shapes:
+            if shape not in self.shape_names:  # pragma: no cover
+                PrintClass.my_print("....'%s' is not a layout shape" % shape, 'warn')
+                PrintClass.fatal_error(message="Error initializing LayoutOptimizerClass")
+
+        self.json_data = copy.deepcopy(json_data)
+        self.loads = read_loads(loads_path)
+        self.output_path = output_path
+        self.print_output = print_output
+        self.land_width = land_width
+        self.land_length = land_length
+        self.min_mft = min_mft
+        self.max_mft = max_mft
+        self.spacings = list(spacings)
+        self.shapes = list(shapes)
+        self.min_depth = min_depth
+        self.max_depth = max_depth
+        self.max_boreholes = max_boreholes
+        self.screening_margin = screening_margin
+        self.peak_duration = peak_duration
+        self.num_processes = num_processes
+
+        self.template_bh = self.json_data['GHXs'][0]
+
+        # class data
+
+        self.layouts = []
+        self.screened = []
+        self.results = []
+        self.best = None
+
+    def enumerate_layouts(self):
+        """
+        Enumerates the layouts which fit on the land area. Layouts which are mirror images of each other
+        have the same g-function, so only one is kept.
+
+        :return: list of layouts
+        """
+
+        self.layouts = []
+
+        for spacing in self.spacings:
+            max_cols = int(np.floor(self.land_width / spacing + 1e-9)) + 1
+            max_rows = int(np.floor(self.land_length / spacing + 1e-9)) + 1
+
+            found = set()
+
+            for cols in range(1, max_cols + 1):
+                for rows in range(1, max_rows + 1):
+                    key = (min(cols, rows), max(cols, rows))
+
+                    if 'Rectangle' in self.shapes and cols * rows <= self.max_boreholes and key not in found:
+                        found.add(key)
+                        locations = [[i * spacing, j * spacing] for j in range(rows) for i in range(cols)]
+                        self.layouts.append({'Name': "Rectangle_%dx%d_%gm" % (cols, rows, spacing),
+                                             'Shape': 'Rectangle',
+                                             'Spacing': spacing,
+                                             'Locations': locations})
+
+                    # legs along the two edges share the corner borehole
+                    num_bh = cols + rows - 1
+                    if 'L' in self.shapes and cols > 1 and rows > 1 and num_bh <= self.max_boreholes and \
+                            ('L',) + key not in found:
+                        found.add(('L',) + key)
+                        locations = [[i * spacing, 0.0] for i in range(cols)]
+                        locations += [[0.0, j * spacing] for j in range(1, rows)]
+                        self.layouts.append({'Name': "L_%dx%d_%gm" % (cols, rows, spacing),
+                                             'Shape': 'L',
+                                             'Spacing': spacing,
+                                             'Locations': locations})
+
+        PrintClass.my_print("....%d layouts found" % len(self.layouts))
+
+        return self.layouts
+
+    def make_json(self, layout, depth, design_mode=False):
+        """
+        Creates GHX input data for a layout, with g-functions at the given depth
+
+        :return: GHX input data
+        """
+
+        json_data = copy.deepcopy(self.json_data)
+
+        json_data['GHXs'] = []
+        for i, location in enumerate(layout['Locations']):
+            json_data_bh = copy.deepcopy(self.template_bh)
+            json_data_bh['Name'] = "BH %d" % (i + 1)
+            json_data_bh['Location'] = list(location)
+            json_data_bh['Depth'] = depth
+            json_data['GHXs'].append(json_data_bh)
+
+        ln_t_ts, g = calc_g_func(layout['Locations'], depth, self.template_bh['Radius'])
+        json_data['G-func Pairs'] = [[float(x), float(y)] for x, y in zip(ln_t_ts, g)]
+
+        if design_mode:
+            json_data['Simulation Configuration']['Aggregation Type'] = "Design"
+            json_data['Simulation Configuration']['Peak Duration'] = self.peak_duration
+
+        return json_data
+
+    def size_layout(self, layout, design_mode):
+        """
+        Sizes one layout. The detailed sizing is repeated once with g-functions at the sized depth.
+
+        :return: dictionary of sizing results. None if the layout could not be sized within the depth limits.
+        """
+
+        depth = self.template_bh['Depth']
+
+        num_passes = 1 if design_mode else 2
+
+        ret = None
+        for _ in range(num_passes):
+            json_data = self.make_json(layout, depth, design_mode)
+            sizing = SizingClass(json_data, self.loads, None, min_mft=self.min_mft, max_mft=self.max_mft,
+                                 print_output=False, design_mode=design_mode)
+            ret = sizing.size()
+
+            if ret is None or not self.min_depth <= ret['Depth'] <= self.max_depth:
+                return None
+
+            depth = ret['Depth']
+
+        ret['Name'] = layout['Name']
+        ret['Number of Boreholes'] = len(layout['Locations'])
+
+        return ret
+
+    def map_layouts(self, layouts, design_mode, pool=None):
+        """
+        Sizes the layouts, in the process pool if there is one
+
+        :param pool: process pool, started with set_optimizer as its initializer. None to size in this process.
+        :return: list of sizing results
+        """
+
+        args = [(layout, design_mode) for layout in layouts]
+
+        if pool is not None and len(layouts) > 1:
+            results = pool.map(size_layout, args)
+        else:
+            set_optimizer(self)
+            results = [size_layout(arg) for arg in args]
+
+        # sizing resets the print options
+        PrintClass(self.print_output, self.output_path)
+
+        return results
+
+    def optimize(self):
+        """
+        Main optimization routine.
+
+        :return: sizing results of the best layout. None if no layout could be sized.
+        """
+
+        PrintClass.my_print("Beginning layout optimization")
+
+        self.enumerate_layouts()
+
+        pool = None
+        if self.num_processes > 1 and len(self.layouts) > 1:
+            pool = multiprocessing.Pool(min(self.num_processes, len(self.layouts)), set_optimizer, (self,))
+
+        # screen all layouts in design mode
+        screened = self.map_layouts(self.layouts, True, pool)
+
+        self.screened = []
+        for layout, ret in zip(self.layouts, screened):
+            if ret is not None:
+                self.screened.append((ret['Total Length'], layout))
+
+        self.screened.sort(key=lambda x: x[0])
+
+        PrintClass.my_print("....%d layouts passed screening" % len(self.screened))
+
+        # size the shortest screened layouts until the rest are dominated
+        self.results = []
+        self.best = None
+
+        batch_size = max(self.num_processes, 1)
+        index = 0
+        while index < len(self.screened):
+            if self.best is not None and \
+                    self.screened[index][0] > self.best['Total Length'] * (1 + self.screening_margin):
+                break
+
+            batch = [layout for _, layout in self.screened[index:index + batch_size]]
+            index += batch_size
+
+            for ret in self.map_layouts(batch, False, pool):
+                if ret is None:
+                    continue
+                self.results.append(ret)
+                if self.best is None or ret['Total Length'] < self.best['Total Length']:
+                    self.best = ret
+
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+        PrintClass.my_print("....%d layouts sized" % len(self.results))
+
+        if self.best is not None:
+            PrintClass.my_print("....Best layout: %s, Depth: %0.2f m, Total length: %0.2f m" % (
+                self.best['Name'], self.best['Depth'], self.best['Total Length']))
+        else:
+            PrintClass.my_print("....No layout met the limits", 'warn')
+
+        self.generate_output_reports()
+
+        PrintClass.my_print("Optimization complete", "success")
+        PrintClass.my_print("Optimization time: %0.3f sec" %
+                            (timeit.default_timer() - self.timer_start))
+
+        PrintClass.write_log_file()
+
+        return self.best
+
+    def apply(self):
+        """
+        Optimizes, then creates GHX input data for the best layout at its sized depth
+
+        :return: GHX input data. None if no layout could be sized.
+        """
+
+        best = self.optimize()
+
+        if best is None:
+            return None
+
+        layout = [this_layout for this_layout in self.layouts if this_layout['Name'] == best['Name']][0]
+
+        json_data = self.make_json(layout, best['Depth'])
+        json_data['Name'] = "%s %s" % (self.json_data['Name'], layout['Name'])
+
+        return json_data
+
+    def generate_output_reports(self):  # pragma: no cover
+        """
+        Generates output results. Writes the sized layouts and the input data of the best layout.
+        """
+
+        try:
+            PrintClass.my_print("Writing output results")
+            cwd = os.getcwd()
+            path_to_output_dir = os.path.join(cwd, self.output_path)
+
+            if not os.path.exists(path_to_output_dir):
+                os.makedirs(path_to_output_dir)
+
+            out_file = open(os.path.join(path_to_output_dir, "Layouts.csv"), 'w')
+
+            out_file.write("Layout, Boreholes, Depth [m], Total Length [m], Min MFT [C], Max MFT [C]\n")
+
+            for ret in sorted(self.results, key=lambda x: x['Total Length']):
+                out_file.write("%s, %d, %0.2f, %0.2f, %0.4f, %0.4f\n" % (ret['Name'],
+                                                                         ret['Number of Boreholes'],
+                                                                         ret['Depth'],
+                                                                         ret['Total Length'],
+                                                                         ret['Min MFT'],
+                                                                         ret['Max MFT']))
+
+            out_file.close()
+
+            if self.best is not None:
+                layout = [this_layout for this_layout in self.layouts if this_layout['Name'] == self.best['Name']][0]
+                with open(os.path.join(path_to_output_dir, "Best.json"), 'w') as out_file:
+                    json.dump(self.make_json(layout, self.best['Depth']), out_file, indent=4, sort_keys=True)
+
+            PrintClass.my_print("....Success")
+
+        except:  # pragma: no cover
+            PrintClass.fatal_error(message="Error writing output results")
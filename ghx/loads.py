@@ -0,0 +1,102 @@
+import os
+
+import numpy as np
+
+from ghx.constants import ConstantClass
+
+# parameters of the synthetic load profiles, after the amplitude
+profile_params = {'Asymmetric': {'B': 1000, 'C': 80, 'D': 0.01, 'E': 0.95, 'F': 4.0 / 3.0, 'G': 2190},
+                  'Symmetric': {'B': 2190, 'C': 80, 'D': 0.01, 'E': 0.95, 'F': 2.0, 'G': 0.0}}
+
+# header of the loads files
+loads_header = "Hour,Load [W],Flow Rate [m3/s]"
+
+
+def calc_synthetic_loads(times, amplitude, B, C, D, E, F, G):
+    """
+    Calculates the synthetic loads of Pinel and Bernier et al., at an array of times.
+
+    Pinel, P. 2003. Amelioration, Validation et Implantation D'un Algorithme de Calcul pour Evaluer le Transfert
+    Thermique Dans les Puits Verticaux de Systemes de Pompes a Chaleur Geothermiques. M.S.Sc. Thesis.
+    Ecole Polytechnique Montreal
+
+    Bernier, M.A., Labib, R., Pinel, P., and Paillot, R. 2004. 'A multiple load aggregation algorithm for annual
+    hourly simulations of GCHP systems.' HVAC&R Research, 10(4): 471-487. The equation is referenced here,
+    but it has typos.
+
+    The amplitude and parameters may be arrays, which are broadcast against each other to give a family of
+    profiles. Each profile is evaluated over all times at once.
+
+    :param times: array of times, counted from zero [hr]
+    :param amplitude: load amplitude [W], or array of amplitudes
+    :returns array of loads [W], profiles x times. One-dimensional if all parameters are scalars.
+    """
+
+    params = np.broadcast_arrays(*[np.asarray(p, dtype=float) for p in [amplitude, B, C, D, E, F, G]])
+    # profiles along the first axes, times along the last
+    amplitude, B, C, D, E, F, G = [p[..., np.newaxis] if p.ndim > 0 else p for p in params]
+
+    times = np.asarray(times, dtype=float)
+    shifted = times - B
+
+    q1 = amplitude * np.sin(np.pi * shifted / 12) * np.sin(F * np.pi * shifted / ConstantClass.hours_in_year)
+
+    q2 = (168 - C) / 168
+    for i in range(1, 4):
+        q2 = q2 + (np.cos(i * np.pi * C / 84) - 1) * np.sin(i * np.pi * shifted / 84) / (i * np.pi)
+
+    # (-1) ** FL, where FL is the floor of F * (t - B) / 8760
+    sign_fl = 1 - 2 * (np.floor(F * shifted / ConstantClass.hours_in_year) % 2)
+    sign_sn = np.where(np.cos(F * np.pi * (times - G) / 4380) + E >= 0, 1.0, -1.0)
+
+    q = q1 * q2
+
+    loads = q + sign_fl * (np.abs(q) + D * sign_sn)
+
+    return loads
+
+
+def make_loads(profile='Asymmetric', amplitude=2000, years=1, steps_per_hour=1, flow_rate=0.000303, **params):
+    """
+    Makes synthetic loads in the loads file layout
+
+    :param profile: name of the profile in profile_params
+    :param amplitude: load amplitude [W]
+    :param years: number of years
+    :param steps_per_hour: number of time steps in each hour. The simulation engines use hourly loads.
+    :param flow_rate: flow rate [m3/s], or array of flow rates at each time step
+    :param params: profile parameters, which replace those of the profile
+    :returns array of hours, loads, and flow rates, time steps x 3. Hours are counted from one.
+    """
+
+    profile_values = dict(profile_params[profile])
+    profile_values.update(params)
+
+    num_steps = years * ConstantClass.hours_in_year * steps_per_hour
+    steps = np.arange(num_steps)
+
+    loads = np.zeros((num_steps, 3))
+    loads[:, 0] = (steps + 1) / steps_per_hour
+    loads[:, 1] = calc_synthetic_loads(steps / steps_per_hour, amplitude, **profile_values)
+    loads[:, 2] = flow_rate
+
+    return loads
+
+
+def write_loads(path, loads):
+    """
+    Writes loads, in the binary .npy format if the path ends in '.npy', and as a CSV file otherwise.
+    Binary loads files are read back without parsing.
+
+    :param path: path of the loads file
+    :param loads: array of hours, loads, and flow rates
+    """
+
+    out_dir = os.path.dirname(path)
+    if out_dir and not os.path.exists(out_dir):
+        os.makedirs(out_dir)
+
+    if path.endswith('.npy'):
+        np.save(path, np.asarray(loads, dtype=float))
+    else:
+        np.savetxt(path, loads, fmt=['%g', '%0.2f', '%g'], delimiter=',', header=loads_header, comments='')
@@ -0,0 +1,285 @@
+import multiprocessing
+import os
+import timeit
+
+import numpy as np
+
+from ghx.base import BaseGHXClass
+from ghx.constants import ConstantClass
+from ghx.my_print import PrintClass
+from ghx.superposition import calc_delta_loads, fft_convolve
+
+
+monte_carlo_sim = None
+
+
+def set_monte_carlo(monte_carlo):
+    """
+    Process pool initializer. Holds the simulation so its input data and loads are sent to each process once.
+    """
+
+    global monte_carlo_sim
+    monte_carlo_sim = monte_carlo
+
+
+def calc_batch_temps(samples):
+    """
+    Process pool entry point. Evaluates one batch of samples.
+
+    :param samples: array of samples x properties
+    :returns tuple of borehole temperature and mean fluid temperature arrays, samples x hours
+    """
+
+    return monte_carlo_sim.calc_batch_temps(samples)
+
+
+class MonteCarloClass:
+    """
+    Samples the soil and grout properties and evaluates the resulting spread in borehole and mean fluid temperatures.
+
+    Properties are sampled from log-normal distributions with the input values as the means. Each sample rescales
+    the non-dimensional time 'ts', and so the g-function time axis. Samples are evaluated in batches by exact
+    superposition, with one FFT convolution per batch. Batches may be spread across a process pool.
+    Borehole resistances for all samples in a batch are evaluated in one call to calc_resistance_array of the GHX
+    array, and mean fluid temperatures by its calc_mft, as in the simulation routines.
+
+    Sample temperatures are written to memory-mapped files in the output directory as batches complete, so only
+    one batch is held in memory. Percentile bands are then calculated one year of hours at a time.
+    """
+
+    property_names = ['Soil Conductivity', 'Soil Heat Capacity', 'Grout Conductivity']
+
+    def __init__(self, json_data, loads_path, output_path, num_samples, print_output=True,
+                 relative_std=None, percentiles=(5, 50, 95), seed=None, batch_size=50, num_processes=1):
+        """
+        Constructor for the class.
+
+        :param json_data: GHX input data. Property values are the means of the sampled distributions.
+        :param loads_path: path of the loads file
+        :param output_path: path of the output directory
+        :param num_samples: number of samples
+        :param relative_std: dictionary of relative standard deviations, keyed by property name.
+        Properties which are not given default to 0.1.
+        :param percentiles: percentiles of the temperature bands
+        :param seed: random seed, for repeatable samples
+        :param batch_size: number of samples evaluated together. Limits memory use.
+        :param num_processes: number of processes. Batches are evaluated in a process pool if greater than 1.
+        """
+
+        PrintClass(print_output, output_path)
+
+        self.timer_start = timeit.default_timer()
+        self.output_path = output_path
+
+        self.ghx = BaseGHXClass(json_data, loads_path, output_path, print_output)
+
+        self.num_samples = num_samples
+        self.percentiles = list(percentiles)
+        self.seed = seed
+        self.batch_size = batch_size
+        self.num_processes = num_processes
+
+        self.relative_std = {}
+        for name in self.property_names:
+            self.relative_std[name] = 0.1
+
+        if relative_std is not None:
+            for name in relative_std:
+                if name not in self.relative_std:  # pragma: no cover
+                    PrintClass.my_print("....'%s' is not a sampled property" % name, 'warn')
+                    PrintClass.fatal_error(message="Error initializing MonteCarloClass")
+                self.relative_std[name] = relative_std[name]
+
+        self.num_hours = ConstantClass.hours_in_year * self.ghx.sim_years
+
+        # loads and flow rates repeat annually, as they do in the simulation routines
+        self.load_index = np.arange(self.num_hours) % ConstantClass.hours_in_year
+        self.loads = np.asarray(self.ghx.sim_loads, dtype=float)[self.load_index]
+        self.delta_q = calc_delta_loads(self.loads)
+
+        self.flow_rates = np.asarray(self.ghx.total_flow_rate[:ConstantClass.hours_in_year], dtype=float)
+
+        # class data
+
+        self.samples = None
+        self.temp_bh = None
+        self.temp_mft = None
+        self.bands_bh = None
+        self.bands_mft = None
+
+    def sample_properties(self):
+        """
+        Samples the soil and grout properties.
+
+        :return: array of samples x properties, ordered as the property names
+        """
+
+        soil = self.ghx.borehole.soil
+        means = [soil.conductivity, soil.heat_capacity, self.ghx.borehole.grout.conductivity]
+
+        random_state = np.random.RandomState(self.seed)
+
+        self.samples = np.zeros((self.num_samples, len(self.property_names)))
+
+        for i, name in enumerate(self.property_names):
+            # log-normal keeps the properties positive, with the requested mean and standard deviation
+            sigma = np.sqrt(np.log(1 + self.relative_std[name] ** 2))
+            mu = np.log(means[i]) - sigma ** 2 / 2
+            self.samples[:, i] = random_state.lognormal(mu, sigma, self.num_samples)
+
+        return self.samples
+
+    def calc_batch_temps(self, samples):
+        """
+        Calculates the hourly temperatures for a batch of samples.
+
+        :param samples: array of samples x properties
+        :returns tuple of borehole temperature and mean fluid temperature arrays, samples x hours
+        """
+
+        soil_conductivity = samples[:, 0]
+        soil_heat_capacity = samples[:, 1]
+        grout_conductivity = samples[:, 2]
+
+        # each sample rescales the g-function time axis
+        ts = self.ghx.borehole.depth ** 2 * soil_heat_capacity / (9 * soil_conductivity)
+        hours = np.arange(1, self.num_hours + 1)
+        g = self.ghx.g_func_array(np.log(hours[np.newaxis, :] * ConstantClass.sec_in_hour / ts[:, np.newaxis]))
+
+        scale = (2 * np.pi * soil_conductivity * self.ghx.total_bh_length)[:, np.newaxis]
+
+        temp_bh = self.ghx.borehole.soil.undisturbed_temp + fft_convolve(self.delta_q, g) / scale
+        temp_mft = np.zeros_like(temp_bh)
+
+        # one year of resistances for all samples
+        resist_bh = self.ghx.calc_resistance_array(self.flow_rates, soil_conductivity=soil_conductivity,
+                                                   grout_conductivity=grout_conductivity)
+
+        for i in range(len(samples)):
+            temp_mft[i] = self.ghx.calc_mft(temp_bh[i], self.loads, resist_bh[i, self.load_index], g[i],
+                                            soil_conductivity[i])
+
+        # single precision halves the size of the sample files
+        return temp_bh.astype(np.float32), temp_mft.astype(np.float32)
+
+    def calc_bands(self, temps):
+        """
+        Calculates the percentile bands over all samples, one year of hours at a time.
+
+        :param temps: array of sample temperatures, samples x hours
+        :returns array of percentiles x hours
+        """
+
+        bands = np.zeros((len(self.percentiles), self.num_hours))
+
+        for start in range(0, self.num_hours, ConstantClass.hours_in_year):
+            block = slice(start, start + ConstantClass.hours_in_year)
+            bands[:, block] = np.percentile(temps[:, block], self.percentiles, axis=0)
+
+        return bands
+
+    def simulate(self):
+        """
+        Main simulation routine. Samples the properties, evaluates the samples, and calculates the percentile bands.
+        """
+
+        PrintClass.my_print("Beginning Monte Carlo simulation")
+
+        self.sample_properties()
+
+        # earlier results are not sent to the processes
+        self.temp_bh = None
+        self.temp_mft = None
+
+        starts = range(0, self.num_samples, self.batch_size)
+        batches = [self.samples[start:start + self.batch_size] for start in starts]
+
+        PrintClass.my_print("....Evaluating %d samples in %d batches" % (self.num_samples, len(batches)))
+
+        pool = None
+        if self.num_processes > 1:
+            pool = multiprocessing.Pool(self.num_processes, set_monte_carlo, (self,))
+            results = pool.imap(calc_batch_temps, batches)
+        else:
+            results = map(self.calc_batch_temps, batches)
+
+        path_to_output_dir = os.path.join(os.getcwd(), self.output_path)
+
+        if not os.path.exists(path_to_output_dir):
+            os.makedirs(path_to_output_dir)
+
+        shape = (self.num_samples, self.num_hours)
+        temp_bh = np.lib.format.open_memmap(os.path.join(path_to_output_dir, "Samples_BH.npy"), mode='w+',
+                                            dtype=np.float32, shape=shape)
+        temp_mft = np.lib.format.open_memmap(os.path.join(path_to_output_dir, "Samples_MFT.npy"), mode='w+',
+                                             dtype=np.float32, shape=shape)
+
+        for start, (batch_bh, batch_mft) in zip(starts, results):
+            temp_bh[start:start + len(batch_bh)] = batch_bh
+            temp_mft[start:start + len(batch_mft)] = batch_mft
+
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+        temp_bh.flush()
+        temp_mft.flush()
+
+        self.temp_bh = temp_bh
+        self.temp_mft = temp_mft
+
+        self.bands_bh = self.calc_bands(self.temp_bh)
+        self.bands_mft = self.calc_bands(self.temp_mft)
+
+        self.generate_output_reports()
+
+        PrintClass.my_print("Simulation complete", "success")
+        PrintClass.my_print("Simulation time: %0.3f sec" %
+                            (timeit.default_timer() - self.timer_start))
+
+        PrintClass.write_log_file()
+
+    def generate_output_reports(self):  # pragma: no cover
+        """
+        Generates output results. Writes the temperature percentile bands and the sampled properties.
+        Sample temperatures are already written, to 'Samples_BH.npy' and 'Samples_MFT.npy'.
+        """
+
+        try:
+            PrintClass.my_print("Writing output results")
+            cwd = os.getcwd()
+            path_to_output_dir = os.path.join(cwd, self.output_path)
+
+            if not os.path.exists(path_to_output_dir):
+                os.makedirs(path_to_output_dir)
+
+            # percentile bands
+            out_file = open(os.path.join(path_to_output_dir, "Percentiles.csv"), 'w')
+
+            headers = ["Hour"]
+            headers += ["BH Temp P%g [C]" % p for p in self.percentiles]
+            headers += ["MFT P%g [C]" % p for p in self.percentiles]
+            out_file.write("%s\n" % ", ".join(headers))
+
+            for i in range(self.num_hours):
+                values = ["%d" % (i + 1)]
+                values += ["%0.4f" % val for val in self.bands_bh[:, i]]
+                values += ["%0.4f" % val for val in self.bands_mft[:, i]]
+                out_file.write("%s\n" % ", ".join(values))
+
+            out_file.close()
+
+            # sampled properties
+            out_file = open(os.path.join(path_to_output_dir, "Samples.csv"), 'w')
+
+            out_file.write("Sample, %s\n" % ", ".join(self.property_names))
+
+            for i in range(self.num_samples):
+                out_file.write("%d, %s\n" % (i + 1, ", ".join(["%0.6g" % val for val in self.samples[i]])))
+
+            out_file.close()
+
+            PrintClass.my_print("....Success")
+
+        except:  # pragma: no cover
+            PrintClass.fatal_error(message="Error writing output results")
@@ -0,0 +1,306 @@
+from functools import lru_cache
+
+import numpy as np
+
+# number of multipole solvers kept. Sampled conductivities give a new solver for each sample, so the least
+# recently used are dropped.
+multipole_cache_size = 64
+
+
+def calc_thetas(shank_spacing, bh_radius, pipe_outer_radius):
+    """
+    Calculates the non-dimensional geometry of a single U-tube borehole
+
+    :param shank_spacing: array of shank spacings [m]
+    :param bh_radius: array of borehole radii [m]
+    :param pipe_outer_radius: array of pipe outer radii [m]
+    :returns tuple of theta_1, theta_2, and theta_3 arrays
+    """
+
+    theta_1 = np.asarray(shank_spacing, dtype=float) / (2 * np.asarray(bh_radius, dtype=float))
+    theta_2 = np.asarray(bh_radius, dtype=float) / np.asarray(pipe_outer_radius, dtype=float)
+    theta_3 = 1 / (2 * theta_1 * theta_2)
+
+    return theta_1, theta_2, theta_3
+
+
+def calc_sigma(grout_conductivity, soil_conductivity):
+    """
+    :returns array of the conductivity ratios of the grout and soil
+    """
+
+    grout_conductivity = np.asarray(grout_conductivity, dtype=float)
+    soil_conductivity = np.asarray(soil_conductivity, dtype=float)
+
+    return (grout_conductivity - soil_conductivity) / (grout_conductivity + soil_conductivity)
+
+
+def calc_bh_average_resistance(shank_spacing, bh_radius, pipe_outer_radius, grout_conductivity, soil_conductivity,
+                               resist_pipe):
+    """
+    Calculates the average thermal resistance of the borehole using the first-order multipole method.
+    Arrays are broadcast together.
+
+    Javed, S. & Spitler, J.D. 2016. 'Accuracy of Borehole Thermal Resistance Calculation Methods
+    for Grouted Single U-tube Ground Heat Exchangers.' J. Energy Engineering. Draft in progress.
+
+    Equation 13
+
+    :returns array of average borehole resistances
+    """
+
+    theta_1, theta_2, theta_3 = calc_thetas(shank_spacing, bh_radius, pipe_outer_radius)
+    sigma = calc_sigma(grout_conductivity, soil_conductivity)
+    beta = 2 * np.pi * np.asarray(grout_conductivity, dtype=float) * np.asarray(resist_pipe, dtype=float)
+
+    final_term_1 = np.log(
+        theta_2 / (2 * theta_1 * (1 - theta_1 ** 4) ** sigma))
+    num_final_term_2 = theta_3 ** 2 * \
+        (1 - (4 * sigma * theta_1 ** 4) / (1 - theta_1 ** 4)) ** 2
+    den_final_term_2_pt_1 = (1 + beta) / (1 - beta)
+    den_final_term_2_pt_2 = theta_3 ** 2 * \
+        (1 + (16 * sigma * theta_1 ** 4) / (1 - theta_1 ** 4) ** 2)
+    den_final_term_2 = den_final_term_2_pt_1 + den_final_term_2_pt_2
+    final_term_2 = num_final_term_2 / den_final_term_2
+
+    return (1 / (4 * np.pi * np.asarray(grout_conductivity, dtype=float))) * (beta + final_term_1 - final_term_2)
+
+
+def calc_bh_total_internal_resistance(shank_spacing, bh_radius, pipe_outer_radius, grout_conductivity,
+                                      soil_conductivity, resist_pipe):
+    """
+    Calculates the total internal thermal resistance of the borehole using the first-order multipole method.
+    Arrays are broadcast together.
+
+    Javed, S. & Spitler, J.D. 2016. 'Accuracy of Borehole Thermal Resistance Calculation Methods
+    for Grouted Single U-tube Ground Heat Exchangers.' J. Energy Engineering. Draft in progress.
+
+    Equation 26
+
+    :returns array of total internal borehole resistances
+    """
+
+    theta_1, theta_2, theta_3 = calc_thetas(shank_spacing, bh_radius, pipe_outer_radius)
+    sigma = calc_sigma(grout_conductivity, soil_conductivity)
+    beta = 2 * np.pi * np.asarray(grout_conductivity, dtype=float) * np.asarray(resist_pipe, dtype=float)
+
+    final_term_1 = np.log(
+        ((1 + theta_1 ** 2) ** sigma) / (theta_3 * (1 - theta_1 ** 2) ** sigma))
+    num_term_2 = theta_3 ** 2 * \
+        (1 - theta_1 ** 4 + 4 * sigma * theta_1 ** 2) ** 2
+    den_term_2_pt_1 = (1 + beta) / (1 - beta) * \
+        (1 - theta_1 ** 4) ** 2
+    den_term_2_pt_2 = theta_3 ** 2 * (1 - theta_1 ** 4) ** 2
+    den_term_2_pt_3 = 8 * sigma * theta_1 ** 2 * \
+        theta_3 ** 2 * (1 + theta_1 ** 4)
+    den_term_2 = den_term_2_pt_1 - den_term_2_pt_2 + den_term_2_pt_3
+    final_term_2 = num_term_2 / den_term_2
+
+    return (1 / (np.pi * np.asarray(grout_conductivity, dtype=float))) * (beta + final_term_1 - final_term_2)
+
+
+def calc_bh_grout_resistance(shank_spacing, bh_radius, pipe_outer_radius, grout_conductivity, soil_conductivity,
+                             resist_pipe):
+    """
+    Calculates the grout thermal resistance of the borehole. Use for validation.
+
+    :returns array of grout resistances
+    """
+
+    return calc_bh_average_resistance(shank_spacing, bh_radius, pipe_outer_radius, grout_conductivity,
+                                      soil_conductivity, resist_pipe) - np.asarray(resist_pipe, dtype=float) / 2.0
+
+
+def calc_pipe_positions(shank_spacing, num_u_tubes=1):
+    """
+    Calculates the pipe positions of a borehole with one or more U-tubes. Pipes are spaced evenly on a circle
+    of diameter equal to the shank spacing, with the outlet of each U-tube opposite its inlet.
+
+    :param shank_spacing: center-to-center distance between the two legs of a U-tube [m]
+    :param num_u_tubes: number of U-tubes, connected in parallel
+    :returns tuple of the list of [x, y] pipe positions [m], and the lists of inlet and outlet pipe indices
+    """
+
+    num_pipes = 2 * num_u_tubes
+    angles = 2 * np.pi * np.arange(num_pipes) / num_pipes
+    positions = [[shank_spacing / 2 * np.cos(angle), shank_spacing / 2 * np.sin(angle)] for angle in angles]
+
+    return positions, [list(range(num_u_tubes)), list(range(num_u_tubes, num_pipes))]
+
+
+def get_multipole(shank_spacing, bh_radius, pipe_outer_radius, grout_conductivity, soil_conductivity, order,
+                  num_u_tubes=1):
+    """
+    Gets the multipole solver of a borehole. Solvers are built once for each geometry and conductivities,
+    and the last multipole_cache_size are shared.
+
+    :returns MultipoleClass object
+    """
+
+    return build_multipole(round(shank_spacing, 8), round(bh_radius, 8), round(pipe_outer_radius, 8),
+                           round(grout_conductivity, 8), round(soil_conductivity, 8), order, num_u_tubes)
+
+
+@lru_cache(maxsize=multipole_cache_size)
+def build_multipole(shank_spacing, bh_radius, pipe_outer_radius, grout_conductivity, soil_conductivity, order,
+                    num_u_tubes):
+    """
+    Builds the multipole solver of a borehole. Least recently used solvers are dropped from the cache.
+
+    :returns MultipoleClass object
+    """
+
+    positions, groups = calc_pipe_positions(shank_spacing, num_u_tubes)
+
+    return MultipoleClass(positions, groups, bh_radius, pipe_outer_radius, grout_conductivity, soil_conductivity,
+                          order)
+
+
+class MultipoleClass:
+    """
+    Multipole method of any order for the thermal resistances of a borehole with any number of pipes.
+
+    The temperature field in the grout is the sum of a line source and multipoles of order 1 to J at each pipe,
+    with their images across the borehole wall. The multipole strengths are found from the heat balance at the
+    pipe walls, which depends on the pipe resistance only through
+
+    P_mk = -(1 - k * beta) / (1 + k * beta) * conj(F_mk),  beta = 2 * pi * k_grout * R_pipe
+
+    where F_mk are the Fourier coefficients of the field of all other sources around pipe m. F is linear in the
+    line source and multipole strengths, with coefficients which depend only on the geometry and conductivities.
+    These are found once, by expanding each source about each pipe in a Fourier series. Written in terms of beta,
+    the linear system for the multipoles is
+
+    (A0 + beta * A1) * P = (b0 + beta * b1) * q
+
+    which is solved for every beta from one eigendecomposition of A0^-1 * A1. A new pipe resistance then costs
+    only a few small matrix products.
+
+    With J = 1 and a single U-tube, the resistances are the same as the first-order closed forms.
+
+    Claesson, J. & Hellstrom, G. 2011. 'Multipole method to calculate borehole thermal resistances in a
+    borehole heat exchanger.' HVAC&R Research, 17(6): 895-911.
+    """
+
+    def __init__(self, positions, groups, bh_radius, pipe_outer_radius, grout_conductivity, soil_conductivity,
+                 order, num_samples=256):
+        """
+        Constructor for the class.
+
+        :param positions: list of [x, y] pipe positions, relative to the borehole center [m]
+        :param groups: lists of inlet and outlet pipe indices. Pipes in a group have the same fluid temperature.
+        :param order: multipole order, J
+        :param num_samples: points on each pipe wall for the Fourier expansions
+        """
+
+        self.positions = np.array([complex(x, y) for x, y in positions])
+        self.groups = groups
+        self.bh_radius = bh_radius
+        self.pipe_outer_radius = pipe_outer_radius
+        self.grout_conductivity = grout_conductivity
+        self.sigma = float(calc_sigma(grout_conductivity, soil_conductivity))
+        self.order = order
+
+        num_pipes = len(self.positions)
+        num_coeffs = num_pipes * order
+
+        # multipole strengths are held as real and imaginary parts, pipes x orders each
+        num_unknowns = 2 * num_coeffs
+
+        # mean temperatures at the pipe walls, from unit line sources and multipoles
+        self.wall_q = np.zeros((num_pipes, num_pipes))
+        self.wall_p = np.zeros((num_pipes, num_unknowns))
+
+        # multipole equations, from unit line sources and multipoles
+        eqs_q = np.zeros((num_unknowns, num_pipes))
+        eqs_p = np.zeros((num_unknowns, num_unknowns))
+
+        orders = np.arange(1, order + 1)
+        angles = 2 * np.pi * np.arange(num_samples) / num_samples
+        radius_2 = bh_radius ** 2
+        line_coeff = 1 / (2 * np.pi * grout_conductivity)
+
+        for m in range(num_pipes):
+            z = self.positions[m] + pipe_outer_radius * np.exp(1j * angles)
+
+            # field of all sources around pipe m, except the line source and multipoles of pipe m itself
+            fields = np.zeros((num_samples, num_pipes + num_unknowns))
+
+            for n in range(num_pipes):
+                z_n = self.positions[n]
+                fields[:, n] = self.sigma * np.log(radius_2 / np.abs(radius_2 - z * np.conj(z_n)))
+                if n != m:
+                    fields[:, n] += np.log(bh_radius / np.abs(z - z_n))
+                fields[:, n] *= line_coeff
+
+                for k in orders:
+                    w = self.sigma * (pipe_outer_radius * np.conj(z) / (radius_2 - z_n * np.conj(z))) ** k
+                    if n != m:
+                        w += (pipe_outer_radius / (z - z_n)) ** k
+                    fields[:, num_pipes + n * order + k - 1] = np.real(w)
+                    fields[:, num_pipes + num_coeffs + n * order + k - 1] = -np.imag(w)
+
+            coeffs = np.fft.fft(fields, axis=0) / num_samples
+
+            self.wall_q[m] = np.real(coeffs[0, :num_pipes])
+            self.wall_q[m, m] += line_coeff * np.log(bh_radius / pipe_outer_radius)
+            self.wall_p[m] = np.real(coeffs[0, num_pipes:])
+
+            rows = m * order + orders - 1
+            f_mk = 2 * coeffs[orders]
+            eqs_q[rows] = np.real(f_mk[:, :num_pipes])
+            eqs_q[rows + num_coeffs] = -np.imag(f_mk[:, :num_pipes])
+            eqs_p[rows] = np.real(f_mk[:, num_pipes:])
+            eqs_p[rows + num_coeffs] = -np.imag(f_mk[:, num_pipes:])
+
+        k_diag = np.tile(orders, 2 * num_pipes)[:, np.newaxis]
+        identity = np.eye(num_unknowns)
+
+        a_0 = identity + eqs_p
+        a_1 = k_diag * (identity - eqs_p)
+
+        self.eigvals, self.eigvecs = np.linalg.eig(np.linalg.solve(a_0, a_1))
+        inv_eigvecs = np.linalg.inv(self.eigvecs)
+
+        self.rhs_0 = np.dot(inv_eigvecs, np.linalg.solve(a_0, -eqs_q))
+        self.rhs_1 = np.dot(inv_eigvecs, np.linalg.solve(a_0, k_diag * eqs_q))
+
+    def calc_resist_matrix(self, resist_pipe):
+        """
+        Calculates the matrix of resistances between the heat flows and the fluid temperatures of the pipes,
+        T_fluid - T_bh = R * q
+
+        :param resist_pipe: array of pipe resistances [K/(W/m)]
+        :returns array of resistance matrices, resistances x pipes x pipes
+        """
+
+        resist_pipe = np.asarray(resist_pipe, dtype=float)[..., np.newaxis, np.newaxis]
+        beta = 2 * np.pi * self.grout_conductivity * resist_pipe
+
+        # multipole strengths per unit line source, in the eigenvector basis
+        strengths = (self.rhs_0 + beta * self.rhs_1) / (1 + beta[..., 0] * self.eigvals)[..., np.newaxis]
+        strengths = np.real(np.matmul(self.eigvecs, strengths))
+
+        return self.wall_q + resist_pipe * np.eye(len(self.positions)) + np.matmul(self.wall_p, strengths)
+
+    def calc_resistances(self, resist_pipe):
+        """
+        Calculates the average and total internal borehole resistances. The average resistance is found with all
+        pipes at the same fluid temperature, and the total internal resistance between the inlet and outlet pipes.
+
+        :param resist_pipe: array of pipe resistances [K/(W/m)]
+        :returns tuple of arrays of average and total internal borehole resistances
+        """
+
+        conductances = np.linalg.inv(self.calc_resist_matrix(resist_pipe))
+
+        # conductances between the inlet and outlet groups
+        inlets, outlets = self.groups
+        g_ii = conductances[..., inlets, :][..., inlets].sum(axis=(-2, -1))
+        g_io = conductances[..., inlets, :][..., outlets].sum(axis=(-2, -1))
+        g_oi = conductances[..., outlets, :][..., inlets].sum(axis=(-2, -1))
+        g_oo = conductances[..., outlets, :][..., outlets].sum(axis=(-2, -1))
+
+        g_sum = g_ii + g_io + g_oi + g_oo
+
+        return 1 / g_sum, g_sum / (g_ii * g_oo - g_io * g_oi)
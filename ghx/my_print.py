@@ -38,14 +38,19 @@ class PrintClass:
             else:
                 print(message)
 
-        PrintClass.log_messages += ('%s\n' % message)
+        # the log is only kept if it can be written
+        if PrintClass.output_path is not None:
+            PrintClass.log_messages += ('%s\n' % message)
 
     @staticmethod
     def write_log_file():
         """
-        Write log file
+        Write log file. Nothing is written if there is no output path.
         """
 
+        if PrintClass.output_path is None:
+            return
+
         cwd = os.getcwd()
 
         path_to_output_dir = os.path.join(cwd, PrintClass.output_path)
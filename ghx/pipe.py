@@ -24,6 +24,9 @@ class PipeClass(BasePropertiesClass):
             PrintClass.my_print("....'Wall Thickness' key not found", 'warn')
             PrintClass.fatal_error(message="Error initializing PipeClass")
 
+        # the flow is split evenly between U-tubes connected in parallel. set by the borehole.
+        self.num_u_tubes = 1
+
         self.outer_radius = self.outer_diameter / 2
         self.inner_radius = self.outer_radius - self.thickness
         self.inner_diameter = self.outer_diameter - 2 * self.thickness
@@ -58,7 +61,7 @@ class PipeClass(BasePropertiesClass):
         lower_limit = 2000
         upper_limit = 4000
 
-        re = 4 * self.fluid.mass_flow_rate / \
+        re = 4 * self.fluid.mass_flow_rate / self.num_u_tubes / \
             (self.fluid.visc() * np.pi * self.inner_diameter)
 
         if re < lower_limit:
@@ -107,6 +110,77 @@ class PipeClass(BasePropertiesClass):
         else:
             return (0.79 * np.log(re) - 1.64) ** (-2.0)  # pure turbulent flow
 
+    def friction_factor_array(self, re):
+        """
+        Calculates the friction factor in smooth tubes for an array of Reynolds numbers.
+        Regimes are as in friction_factor.
+
+        :param re: array of Reynolds numbers
+        :returns array of friction factors
+        """
+
+        lower_limit = 1500
+        upper_limit = 5000
+
+        re = np.asarray(re, dtype=float)
+
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            f_low = 64.0 / re  # pure laminar flow
+            f_high = (0.79 * np.log(re) - 1.64) ** (-2.0)  # pure turbulent flow
+            sf = 1 / (1 + np.exp(-(re - 3000.0) / 450.0))  # smoothing function
+            f_transition = (1 - sf) * f_low + sf * f_high
+
+        return np.where(re < lower_limit, f_low, np.where(re < upper_limit, f_transition, f_high))
+
+    def calc_pipe_convection_resistance_array(self, flow_rates, temps):
+        """
+        Calculates the convection resistance for arrays of flow rates and fluid temperatures, in [k/(W/m)].
+        Regimes are as in calc_pipe_convection_resistance. Arrays are broadcast together.
+
+        :param flow_rates: array of volume flow rates [m3/s]
+        :param temps: array of fluid temperatures [C]
+        :returns array of convection resistances
+        """
+
+        lower_limit = 2000
+        upper_limit = 4000
+
+        flow_rates, temps = np.broadcast_arrays(np.asarray(flow_rates, dtype=float), np.asarray(temps, dtype=float))
+
+        props = self.fluid.calc_properties(temps)
+        dens = props[..., 0]
+        cp = props[..., 1]
+        visc = props[..., 2]
+        cond = props[..., 3]
+        pr = cp * visc / cond
+
+        re = 4 * flow_rates / self.num_u_tubes * dens / (visc * np.pi * self.inner_diameter)
+
+        nu_low = 4.01  # laminar mean(4.36, 3.66)
+
+        f = self.friction_factor_array(re)
+        with np.errstate(invalid='ignore'):
+            nu_high = (f / 8) * (re - 1000) * pr / (1 + 12.7 * (f / 8) ** 0.5 * (pr ** (2 / 3) - 1))
+        sigma = 1 / (1 + np.exp(-(re - 3000) / 150))  # smoothing function
+        nu_transition = (1 - sigma) * nu_low + sigma * nu_high
+
+        nu = np.where(re < lower_limit, nu_low, np.where(re < upper_limit, nu_transition, nu_high))
+
+        h = nu * cond / self.inner_diameter
+
+        return 1 / (h * np.pi * self.inner_diameter)
+
+    def calc_pipe_resistance_array(self, flow_rates, temps):
+        """
+        Calculates the combined conduction and convection pipe resistance for arrays of flow rates and fluid
+        temperatures
+
+        :returns array of pipe resistances
+        """
+
+        return self.calc_pipe_convection_resistance_array(flow_rates, temps) + \
+            self.calc_pipe_conduction_resistance()
+
     def calc_pipe_resistance(self):
         """
         Calculates the combined conduction and convection pipe resistance
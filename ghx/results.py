@@ -0,0 +1,89 @@
+import numpy as np
+
+
+class ResultsClass:
+    """
+    Results of a simulation, held in memory.
+
+    Temperatures are arrays, hourly for the simulation engines and monthly for GHXArrayDesign. They are views of
+    the arrays the engine filled, not copies, and keep the engine's data type.
+    Timing is a dictionary of the 'Initialization', 'Simulation', and 'Total' times [sec].
+    If hourly results were not stored, the temperature arrays are empty, and the summary is taken from the
+    statistics sink.
+    """
+
+    def __init__(self, name, aggregation_type, temp_bh, temp_mft, timing, steps_per_year=8760,
+                 statistics=None):
+        """
+        Constructor for the class.
+
+        :param name: name of the GHX array
+        :param aggregation_type: 'Aggregation Type' of the engine
+        :param temp_bh: array of borehole temperatures [C]
+        :param temp_mft: array of mean fluid temperatures [C]
+        :param timing: dictionary of times [sec]
+        :param steps_per_year: number of time steps in each year
+        :param statistics: StatisticsSinkClass object, if summary statistics were kept
+        """
+
+        self.name = name
+        self.aggregation_type = aggregation_type
+        self.temp_bh = np.asarray(temp_bh)
+        self.temp_mft = np.asarray(temp_mft)
+        self.timing = timing
+        self.steps_per_year = steps_per_year
+        self.statistics = statistics
+
+    @property
+    def num_steps(self):
+        """
+        :return: number of time steps
+        """
+
+        return self.temp_bh.shape[-1]
+
+    @property
+    def nbytes(self):
+        """
+        :return: memory held by the temperature arrays [bytes]
+        """
+
+        return self.temp_bh.nbytes + self.temp_mft.nbytes
+
+    def get_steps(self, start, end):
+        """
+        :param start: first time step, counted from zero
+        :param end: time step after the last
+        :return: tuple of views of the borehole and mean fluid temperatures over the time steps
+        """
+
+        return self.temp_bh[..., start:end], self.temp_mft[..., start:end]
+
+    def get_year(self, year):
+        """
+        :param year: year, counted from zero
+        :return: tuple of views of the borehole and mean fluid temperatures for the year
+        """
+
+        return self.get_steps(year * self.steps_per_year, (year + 1) * self.steps_per_year)
+
+    def summary(self):
+        """
+        :return: dictionary of the mean fluid temperature range and the timing
+        """
+
+        ret = {'Name': self.name,
+               'Aggregation Type': self.aggregation_type,
+               'Steps': self.num_steps}
+
+        if self.num_steps > 0:
+            ret['Min MFT'] = float(np.min(self.temp_mft))
+            ret['Max MFT'] = float(np.max(self.temp_mft))
+        elif self.statistics is not None:
+            statistics = self.statistics.summary()
+            ret['Min MFT'] = statistics['MFT Min [C]']
+            ret['Max MFT'] = statistics['MFT Max [C]']
+
+        ret.update(self.timing)
+
+        return ret
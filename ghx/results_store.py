@@ -0,0 +1,307 @@
+import mmap
+import os
+import struct
+import zlib
+
+import numpy as np
+import simplejson as json
+
+from ghx.constants import ConstantClass
+from ghx.my_print import PrintClass
+
+# identifies results store files
+store_magic = b'GHXR'
+
+# trailer at the end of the file: index offset, number of chunks, metadata length, magic
+trailer_format = '<QQQ4s'
+trailer_size = struct.calcsize(trailer_format)
+
+# columns of the results store
+store_columns = ['BH Temp [C]', 'MFT [C]']
+
+
+def shuffle_bytes(values):
+    """
+    Groups the bytes of an array by their position in each value, so the slowly changing sign, exponent,
+    and high mantissa bytes of a smooth series sit together and compress well.
+
+    :param values: array of values
+    :returns bytes
+    """
+
+    values = np.ascontiguousarray(values)
+
+    return values.view(np.uint8).reshape(-1, values.itemsize).T.tobytes()
+
+
+def unshuffle_bytes(data, dtype):
+    """
+    Reverses shuffle_bytes
+
+    :param data: shuffled bytes
+    :param dtype: data type of the values
+    :returns array of values
+    """
+
+    dtype = np.dtype(dtype)
+    shuffled = np.frombuffer(data, dtype=np.uint8).reshape(dtype.itemsize, -1)
+
+    return shuffled.T.copy().view(dtype).ravel()
+
+
+class ResultsStoreSinkClass:
+    """
+    Writes the hourly temperatures to a chunked, compressed, columnar binary file.
+
+    Hours are buffered into chunks. Each column of a chunk is byte-shuffled and compressed with zlib, and
+    written as soon as the chunk is full. The index of chunk start hours, lengths, and column offsets and sizes
+    is written as a footer after the last chunk, followed by a fixed-size trailer. Flushing writes any partial
+    chunk and rewrites the footer, so the file can always be read after a flush.
+
+    Optional keys are 'Chunk Hours' and 'Compression Level', 0 to 9.
+    """
+
+    def __init__(self, path, json_data=None, dtype=np.float64):
+        """
+        Constructor for the class.
+
+        :param path: path of the results store file
+        :param json_data: results store configuration. Defaults are used for missing keys.
+        :param dtype: data type of the stored temperatures
+        """
+
+        if json_data is None:
+            json_data = {}
+
+        try:
+            self.chunk_hours = json_data['Chunk Hours']
+        except KeyError:
+            # optional. one year of hours in each chunk.
+            self.chunk_hours = ConstantClass.hours_in_year
+
+        try:
+            self.compression_level = json_data['Compression Level']
+        except KeyError:
+            # optional. zlib default.
+            self.compression_level = 6
+
+        self.path = path
+        self.dtype = np.dtype(dtype)
+
+        self.buffer = np.zeros((len(store_columns), self.chunk_hours), dtype=self.dtype)
+        self.num_buffered = 0
+        self.num_hours = 0
+
+        # index rows are the start hour, number of hours, then the offset and size of each column
+        self.index = []
+        self.out_file = None
+        self.data_end = 0
+
+    def update(self, temp_bh, temp_mft):
+        """
+        Adds the temperatures of the next hour, or an array of the next hours
+
+        :param temp_bh: borehole temperature, or array of borehole temperatures
+        :param temp_mft: mean fluid temperature, or array of mean fluid temperatures
+        """
+
+        if np.ndim(temp_mft) == 0:
+            self.buffer[0, self.num_buffered] = temp_bh
+            self.buffer[1, self.num_buffered] = temp_mft
+            self.num_buffered += 1
+            if self.num_buffered == self.chunk_hours:
+                self.write_chunk()
+            return
+
+        temps = np.vstack((np.asarray(temp_bh), np.asarray(temp_mft)))
+
+        start = 0
+        while start < temps.shape[1]:
+            num = min(self.chunk_hours - self.num_buffered, temps.shape[1] - start)
+            self.buffer[:, self.num_buffered:self.num_buffered + num] = temps[:, start:start + num]
+            self.num_buffered += num
+            start += num
+            if self.num_buffered == self.chunk_hours:
+                self.write_chunk()
+
+    def write_chunk(self):
+        """
+        Compresses and writes the buffered hours as a chunk
+        """
+
+        if self.num_buffered == 0:
+            return
+
+        if self.out_file is None:
+            out_dir = os.path.dirname(self.path)
+            if out_dir and not os.path.exists(out_dir):
+                os.makedirs(out_dir)
+            self.out_file = open(self.path, 'wb')
+
+        # chunks overwrite the previous footer
+        self.out_file.seek(self.data_end)
+
+        row = [self.num_hours, self.num_buffered]
+        for column in self.buffer[:, :self.num_buffered]:
+            data = zlib.compress(shuffle_bytes(column), self.compression_level)
+            row += [self.out_file.tell(), len(data)]
+            self.out_file.write(data)
+
+        self.data_end = self.out_file.tell()
+        self.index.append(row)
+        self.num_hours += self.num_buffered
+        self.num_buffered = 0
+
+    def flush(self):
+        """
+        Writes any partial chunk and the footer
+        """
+
+        self.write_chunk()
+
+        if self.out_file is None:
+            return
+
+        metadata = json.dumps({'Columns': store_columns,
+                               'Data Type': self.dtype.str,
+                               'Hours': self.num_hours}).encode()
+
+        self.out_file.seek(self.data_end)
+        self.out_file.write(np.array(self.index, dtype='<i8').tobytes())
+        self.out_file.write(metadata)
+        self.out_file.write(struct.pack(trailer_format, self.data_end, len(self.index), len(metadata), store_magic))
+        self.out_file.truncate()
+        self.out_file.flush()
+
+    def close(self):
+        """
+        Flushes, then closes the file
+        """
+
+        self.flush()
+
+        if self.out_file is not None:
+            self.out_file.close()
+            self.out_file = None
+
+    def generate_output_reports(self, output_path):  # pragma: no cover
+        """
+        Closes the file. Hours are written as they are fed, so there is nothing else to write.
+        """
+
+        self.close()
+        PrintClass.my_print("....Results store written: %s" % self.path)
+
+
+def write_results_store(path, temp_bh, temp_mft, json_data=None):
+    """
+    Writes arrays of hourly temperatures to a results store file
+
+    :param path: path of the results store file
+    :param temp_bh: array of borehole temperatures
+    :param temp_mft: array of mean fluid temperatures
+    :param json_data: results store configuration
+    """
+
+    sink = ResultsStoreSinkClass(path, json_data, np.asarray(temp_mft).dtype)
+    sink.update(temp_bh, temp_mft)
+    sink.close()
+
+
+class ResultsStoreClass:
+    """
+    Reads a results store file. The file is memory-mapped, and only the chunks which overlap the requested
+    hours are decompressed, so reading one year of a long simulation does not depend on the file length.
+    """
+
+    def __init__(self, path):
+        """
+        Constructor for the class.
+
+        :param path: path of the results store file
+        """
+
+        self.path = path
+
+        with open(path, 'rb') as in_file:
+            self.map = mmap.mmap(in_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        index_offset, num_chunks, metadata_length, magic = struct.unpack(trailer_format,
+                                                                         self.map[-trailer_size:])
+
+        if magic != store_magic:  # pragma: no cover
+            self.map.close()
+            raise ValueError("'%s' is not a results store file" % path)
+
+        num_fields = 2 + 2 * len(store_columns)
+        index_end = index_offset + num_chunks * num_fields * 8
+
+        self.index = np.frombuffer(self.map[index_offset:index_end], dtype='<i8').reshape(num_chunks, num_fields)
+
+        metadata = json.loads(self.map[index_end:index_end + metadata_length].decode())
+
+        self.columns = metadata['Columns']
+        self.dtype = np.dtype(metadata['Data Type'])
+        self.num_hours = metadata['Hours']
+
+        self.chunk_starts = self.index[:, 0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Closes the memory map
+        """
+
+        self.map.close()
+
+    def read_chunk(self, chunk, column):
+        """
+        :return: array of the values of one column of a chunk
+        """
+
+        offset, size = self.index[chunk, 2 + 2 * column:4 + 2 * column]
+
+        return unshuffle_bytes(zlib.decompress(self.map[offset:offset + size]), self.dtype)
+
+    def read(self, start=0, end=None):
+        """
+        Reads a range of hours
+
+        :param start: first hour, counted from zero
+        :param end: hour after the last. Defaults to the end of the simulation.
+        :return: tuple of arrays of borehole and mean fluid temperatures over the hours
+        """
+
+        if end is None:
+            end = self.num_hours
+
+        start = max(start, 0)
+        end = min(end, self.num_hours)
+
+        if end <= start:
+            return tuple(np.zeros(0, dtype=self.dtype) for _ in self.columns)
+
+        first = np.searchsorted(self.chunk_starts, start, side='right') - 1
+        last = np.searchsorted(self.chunk_starts, end, side='left')
+
+        offset = start - self.chunk_starts[first]
+
+        ret = []
+        for column in range(len(self.columns)):
+            values = np.concatenate([self.read_chunk(chunk, column) for chunk in range(first, last)])
+            ret.append(values[offset:offset + end - start])
+
+        return tuple(ret)
+
+    def read_year(self, year):
+        """
+        :param year: year, counted from zero
+        :return: tuple of arrays of borehole and mean fluid temperatures for the year
+        """
+
+        return self.read(year * ConstantClass.hours_in_year, (year + 1) * ConstantClass.hours_in_year)
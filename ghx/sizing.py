@@ -0,0 +1,199 @@
+import copy
+
+import numpy as np
+
+from ghx.array_design import GHXArrayDesign
+from ghx.base import BaseGHXClass
+from ghx.my_print import PrintClass
+
+
+class SizingClass:
+    """
+    Finds the minimum borehole depth which keeps the mean fluid temperature within the given limits.
+
+    All borehole depths are scaled together. Each trial depth rescales 'ts', the total borehole length,
+    and the borehole resistance on a single engine, so loads and the g-function table are only read once.
+    The g-function is held constant in terms of ln(t/ts). Temperatures are calculated by exact superposition,
+    as in calc_reference_temps.
+    In design mode, the temperatures are the monthly and peak pulse temperatures of GHXArrayDesign,
+    which is faster and suited to screening.
+
+    The depth is bracketed by doubling or halving the initial depth, then found by the Illinois variant
+    of regula falsi.
+    """
+
+    def __init__(self, json_data, loads_path, output_path, min_mft=None, max_mft=None, print_output=True,
+                 depth_tolerance=0.1, max_iterations=50, design_mode=False):
+        """
+        Constructor for the class.
+
+        :param json_data: GHX input data. The initial depths are the starting point.
+        :param loads_path: path of the loads file, or an array of hours, loads, and flow rates
+        :param output_path: path of the output directory. None for no file output.
+        :param min_mft: minimum allowable mean fluid temperature [C]. None if not limited.
+        :param max_mft: maximum allowable mean fluid temperature [C]. None if not limited.
+        :param depth_tolerance: tolerance on the mean borehole depth [m]
+        :param max_iterations: maximum number of trial depths
+        :param design_mode: if True, temperatures are found by GHXArrayDesign. Requires the 'Peak Duration' key.
+        """
+
+        PrintClass(print_output, output_path)
+
+        if min_mft is None and max_mft is None:  # pragma: no cover
+            PrintClass.my_print("....No mean fluid temperature limits given", 'warn')
+            PrintClass.fatal_error(message="Error initializing SizingClass")
+
+        self.min_mft = min_mft
+        self.max_mft = max_mft
+        self.depth_tolerance = depth_tolerance
+        self.max_iterations = max_iterations
+        self.design_mode = design_mode
+
+        if design_mode:
+            self.ghx = GHXArrayDesign(json_data, loads_path, output_path, print_output)
+        else:
+            self.ghx = BaseGHXClass(json_data, loads_path, output_path, print_output)
+
+        self.init_depth = self.ghx.borehole.depth
+        self.init_depths = [this_bh.depth for this_bh in self.ghx.ghx_list]
+        self.init_total_bh_length = self.ghx.total_bh_length
+
+        self.num_simulations = 0
+
+        # mean fluid temperature range, keyed by depth
+        self.mft_ranges = {}
+
+    def set_depth(self, depth):
+        """
+        Scales all borehole depths so the mean depth is the given depth
+        """
+
+        ratio = depth / self.init_depth
+
+        for this_bh, init_depth in zip(self.ghx.ghx_list, self.init_depths):
+            this_bh.depth = init_depth * ratio
+
+        self.ghx.borehole.depth = depth
+        self.ghx.total_bh_length = self.init_total_bh_length * ratio
+        self.ghx.ts = self.ghx.calc_ts()
+
+    def calc_mft_range(self, depth):
+        """
+        :return: tuple of the minimum and maximum mean fluid temperatures at the given depth
+        """
+
+        if depth in self.mft_ranges:
+            return self.mft_ranges[depth]
+
+        self.set_depth(depth)
+        self.num_simulations += 1
+
+        if self.design_mode:
+            self.ghx.calc_monthly_temps()
+            self.mft_ranges[depth] = (float(np.min(self.ghx.temp_mft_min)), float(np.max(self.ghx.temp_mft_max)))
+        else:
+            temp_mft = self.ghx.calc_reference_temps()[1]
+            self.mft_ranges[depth] = (float(np.min(temp_mft)), float(np.max(temp_mft)))
+
+        return self.mft_ranges[depth]
+
+    def calc_excess(self, depth):
+        """
+        :return: largest exceedance of the mean fluid temperature limits [C]. Not positive if the limits are met.
+        """
+
+        min_mft, max_mft = self.calc_mft_range(depth)
+
+        excess = -np.inf
+
+        if self.max_mft is not None:
+            excess = max(excess, max_mft - self.max_mft)
+
+        if self.min_mft is not None:
+            excess = max(excess, self.min_mft - min_mft)
+
+        return excess
+
+    def size(self):
+        """
+        Finds the minimum depth which meets the mean fluid temperature limits.
+
+        :return: dictionary with the depth, total borehole length, mean fluid temperature range, and number of
+        simulations. None if the depth could not be found.
+        """
+
+        PrintClass.my_print("Sizing borehole depth")
+
+        # bracket the depth. the limits are met at the high depth, but not at the low depth.
+        low = high = self.init_depth
+        excess = self.calc_excess(high)
+
+        if excess > 0:
+            while excess > 0:
+                if self.num_simulations >= self.max_iterations:
+                    PrintClass.my_print("....Limits not met within the maximum iterations", 'warn')
+                    return None
+                low, excess_low = high, excess
+                high *= 2
+                excess = self.calc_excess(high)
+            excess_high = excess
+        else:
+            while excess <= 0:
+                if self.num_simulations >= self.max_iterations:
+                    PrintClass.my_print("....Depth not bracketed within the maximum iterations", 'warn')
+                    return None
+                high, excess_high = low, excess
+                low /= 2
+                excess = self.calc_excess(low)
+            excess_low = excess
+
+        # Illinois method. the retained end point is weighted down when the same side moves twice.
+        side = 0
+        while high - low > self.depth_tolerance and self.num_simulations < self.max_iterations:
+            depth = high - excess_high * (high - low) / (excess_high - excess_low)
+            excess = self.calc_excess(depth)
+
+            if excess > 0:
+                low, excess_low = depth, excess
+                if side == -1:
+                    excess_high /= 2
+                side = -1
+            else:
+                high, excess_high = depth, excess
+                if side == 1:
+                    excess_low /= 2
+                side = 1
+
+        min_mft, max_mft = self.calc_mft_range(high)
+
+        total_bh_length = self.init_total_bh_length * high / self.init_depth
+
+        PrintClass.my_print("....Depth: %0.2f m, Total length: %0.2f m" % (high, total_bh_length))
+        PrintClass.my_print("....MFT range: %0.3f to %0.3f C" % (min_mft, max_mft))
+        PrintClass.my_print("....Simulations: %d" % self.num_simulations)
+
+        return {'Depth': float(high),
+                'Total Length': float(total_bh_length),
+                'Min MFT': min_mft,
+                'Max MFT': max_mft,
+                'Simulations': self.num_simulations}
+
+    def apply(self, json_data):
+        """
+        Sizes, then sets the borehole depths on a copy of the GHX input data
+
+        :return: updated GHX input data. None if the depth could not be found.
+        """
+
+        result = self.size()
+
+        if result is None:
+            return None
+
+        ratio = result['Depth'] / self.init_depth
+
+        json_data = copy.deepcopy(json_data)
+        for json_data_bh in json_data['GHXs']:
+            json_data_bh['Depth'] *= ratio
+
+        return json_data
@@ -0,0 +1,300 @@
+import os
+from collections import deque
+
+import numpy as np
+import simplejson as json
+
+from ghx.constants import ConstantClass
+from ghx.my_print import PrintClass
+
+# hours in each period, keyed by resolution
+resolution_hours = {'Hourly': 1,
+                    'Daily': ConstantClass.hours_in_day,
+                    'Monthly': ConstantClass.hours_in_month,
+                    'Annual': ConstantClass.hours_in_year}
+
+# periods kept at each resolution. None keeps every period.
+default_retention = {'Hourly': 0,
+                     'Daily': 0,
+                     'Monthly': None,
+                     'Annual': None}
+
+# columns of the period statistics
+statistics_columns = ['Period', 'BH Temp Mean [C]', 'MFT Min [C]', 'MFT Mean [C]', 'MFT Max [C]',
+                      'Hours Below Min MFT', 'Hours Above Max MFT']
+
+
+class PeriodStatisticsClass:
+    """
+    Running statistics of the temperatures over periods of equal length.
+
+    Only the last 'retention' completed periods are kept, so memory does not grow with the simulation length.
+    """
+
+    def __init__(self, period_hours, retention):
+        """
+        Constructor for the class.
+
+        :param period_hours: hours in each period
+        :param retention: number of completed periods kept. None keeps every period.
+        """
+
+        self.period_hours = period_hours
+        self.retention = retention
+        self.rows = deque(maxlen=retention)
+
+        # sums, minimum, maximum, and hours outside the limits of the period in progress
+        self.partial = None
+
+    def update(self, start_hour, temp_bh, temp_mft, below, above):
+        """
+        Adds consecutive hours of temperatures
+
+        :param start_hour: simulation hour of the first temperature, counted from zero
+        :param temp_bh: array of borehole temperatures
+        :param temp_mft: array of mean fluid temperatures
+        :param below: array, 1 where the mean fluid temperature is below the limit
+        :param above: array, 1 where the mean fluid temperature is above the limit
+        """
+
+        num_hours = len(temp_mft)
+        hours = start_hour + np.arange(num_hours)
+
+        # first hour of each period within the hours
+        starts = np.flatnonzero(hours % self.period_hours == 0)
+        if len(starts) == 0 or starts[0] != 0:
+            starts = np.concatenate(([0], starts))
+
+        stats = np.column_stack((hours[starts] // self.period_hours,
+                                 np.add.reduceat(temp_bh, starts),
+                                 np.minimum.reduceat(temp_mft, starts),
+                                 np.add.reduceat(temp_mft, starts),
+                                 np.maximum.reduceat(temp_mft, starts),
+                                 np.add.reduceat(below, starts),
+                                 np.add.reduceat(above, starts),
+                                 np.diff(np.append(starts, num_hours))))
+
+        # continue the period in progress
+        if self.partial is not None and start_hour % self.period_hours != 0:
+            stats[0, [1, 3, 5, 6, 7]] += self.partial[[1, 3, 5, 6, 7]]
+            stats[0, 2] = min(stats[0, 2], self.partial[2])
+            stats[0, 4] = max(stats[0, 4], self.partial[4])
+
+        # the last period is complete if the hours end on a period boundary
+        if (start_hour + num_hours) % self.period_hours == 0:
+            self.partial = None
+        else:
+            self.partial = stats[-1]
+            stats = stats[:-1]
+
+        if len(stats) > 0 and self.retention != 0:
+            if self.retention is not None:
+                stats = stats[-self.retention:]
+            self.rows.extend(self.calc_rows(stats).tolist())
+
+    @staticmethod
+    def calc_rows(stats):
+        """
+        :return: array of period statistics, with columns as in statistics_columns
+        """
+
+        counts = stats[:, 7]
+
+        return np.column_stack((stats[:, 0] + 1, stats[:, 1] / counts, stats[:, 2], stats[:, 3] / counts,
+                                stats[:, 4], stats[:, 5], stats[:, 6]))
+
+    def get_rows(self):
+        """
+        :return: array of the kept period statistics, with columns as in statistics_columns
+        """
+
+        if len(self.rows) == 0:
+            return np.zeros((0, len(statistics_columns)))
+
+        return np.array(self.rows)
+
+
+class StatisticsSinkClass:
+    """
+    Streaming summary statistics of the simulated temperatures.
+
+    Engines feed the sink each hour, or all hours at once if they are stored. Hours are buffered, then reduced
+    a buffer at a time into hourly, daily, monthly, and annual period statistics, and into statistics of the
+    whole simulation. Memory does not depend on the simulation length unless every period is kept.
+
+    Optional keys are 'Retention', the number of periods kept at each resolution, where null keeps every
+    period, and 'Min MFT' and 'Max MFT', the limits for which hours outside are counted.
+    """
+
+    def __init__(self, json_data=None, print_output=True, buffer_hours=ConstantClass.hours_in_month):
+        """
+        Constructor for the class.
+
+        :param json_data: statistics configuration. Defaults are used for missing keys.
+        :param buffer_hours: hours buffered between reductions
+        """
+
+        if json_data is None:
+            json_data = {}
+
+        self.retention = dict(default_retention)
+
+        try:
+            self.retention.update(json_data['Retention'])
+        except KeyError:
+            # optional. monthly and annual periods are kept.
+            pass
+
+        for resolution in self.retention:
+            if resolution not in resolution_hours:  # pragma: no cover
+                PrintClass.my_print("....'%s' is not a statistics resolution" % resolution, 'warn')
+                PrintClass.fatal_error(message="Error initializing StatisticsSinkClass")
+
+        try:
+            self.min_mft = json_data['Min MFT']
+        except KeyError:
+            # optional. hours below are not counted.
+            self.min_mft = -np.inf
+
+        try:
+            self.max_mft = json_data['Max MFT']
+        except KeyError:
+            # optional. hours above are not counted.
+            self.max_mft = np.inf
+
+        self.periods = {}
+        for resolution, retention in self.retention.items():
+            self.periods[resolution] = PeriodStatisticsClass(resolution_hours[resolution], retention)
+
+        self.buffer_bh = np.zeros(buffer_hours)
+        self.buffer_mft = np.zeros(buffer_hours)
+        self.num_buffered = 0
+        self.num_hours = 0
+
+        # statistics of the whole simulation
+        self.sum_mft = 0.0
+        self.min_mft_val = np.inf
+        self.max_mft_val = -np.inf
+        self.min_mft_hour = None
+        self.max_mft_hour = None
+        self.hours_below = 0
+        self.hours_above = 0
+
+    def update(self, temp_bh, temp_mft):
+        """
+        Adds the temperatures of the next hour, or an array of the next hours
+
+        :param temp_bh: borehole temperature, or array of borehole temperatures
+        :param temp_mft: mean fluid temperature, or array of mean fluid temperatures
+        """
+
+        if np.ndim(temp_mft) == 0:
+            self.buffer_bh[self.num_buffered] = temp_bh
+            self.buffer_mft[self.num_buffered] = temp_mft
+            self.num_buffered += 1
+            if self.num_buffered == len(self.buffer_mft):
+                self.flush()
+            return
+
+        self.flush()
+        self.reduce(np.asarray(temp_bh, dtype=float), np.asarray(temp_mft, dtype=float))
+
+    def flush(self):
+        """
+        Reduces the buffered hours
+        """
+
+        if self.num_buffered > 0:
+            self.reduce(self.buffer_bh[:self.num_buffered], self.buffer_mft[:self.num_buffered])
+            self.num_buffered = 0
+
+    def reduce(self, temp_bh, temp_mft):
+        """
+        Reduces consecutive hours into the statistics
+        """
+
+        if len(temp_mft) == 0:
+            return
+
+        below = (temp_mft < self.min_mft).astype(float)
+        above = (temp_mft > self.max_mft).astype(float)
+
+        for period in self.periods.values():
+            period.update(self.num_hours, temp_bh, temp_mft, below, above)
+
+        index_min = int(np.argmin(temp_mft))
+        index_max = int(np.argmax(temp_mft))
+
+        if temp_mft[index_min] < self.min_mft_val:
+            self.min_mft_val = float(temp_mft[index_min])
+            self.min_mft_hour = self.num_hours + index_min + 1
+
+        if temp_mft[index_max] > self.max_mft_val:
+            self.max_mft_val = float(temp_mft[index_max])
+            self.max_mft_hour = self.num_hours + index_max + 1
+
+        self.sum_mft += float(np.sum(temp_mft))
+        self.hours_below += int(np.sum(below))
+        self.hours_above += int(np.sum(above))
+        self.num_hours += len(temp_mft)
+
+    def get_statistics(self, resolution):
+        """
+        :param resolution: 'Hourly', 'Daily', 'Monthly', or 'Annual'
+        :return: array of the kept period statistics, with columns as in statistics_columns.
+        Periods still in progress are not included.
+        """
+
+        self.flush()
+
+        return self.periods[resolution].get_rows()
+
+    def summary(self):
+        """
+        :return: dictionary of statistics of the whole simulation
+        """
+
+        self.flush()
+
+        return {'Hours': self.num_hours,
+                'MFT Min [C]': self.min_mft_val,
+                'MFT Min Hour': self.min_mft_hour,
+                'MFT Mean [C]': self.sum_mft / self.num_hours if self.num_hours > 0 else None,
+                'MFT Max [C]': self.max_mft_val,
+                'MFT Max Hour': self.max_mft_hour,
+                'Hours Below Min MFT': self.hours_below,
+                'Hours Above Max MFT': self.hours_above}
+
+    def generate_output_reports(self, output_path):  # pragma: no cover
+        """
+        Writes the whole-simulation statistics, and the kept statistics at each resolution
+        """
+
+        try:
+            PrintClass.my_print("Writing statistics")
+            cwd = os.getcwd()
+            path_to_output_dir = os.path.join(cwd, output_path)
+
+            if not os.path.exists(path_to_output_dir):
+                os.makedirs(path_to_output_dir)
+
+            with open(os.path.join(path_to_output_dir, "Statistics.json"), 'w') as out_file:
+                json.dump(self.summary(), out_file, indent=4, sort_keys=True, ignore_nan=True)
+
+            for resolution in self.periods:
+                if self.retention[resolution] == 0:
+                    continue
+
+                out_file = open(os.path.join(path_to_output_dir, "Statistics_%s.csv" % resolution), 'w')
+
+                out_file.write("%s\n" % ", ".join(statistics_columns))
+
+                for row in self.get_statistics(resolution):
+                    out_file.write("%d, %0.4f, %0.4f, %0.4f, %0.4f, %d, %d\n" % tuple(row))
+
+                out_file.close()
+
+            PrintClass.my_print("....Success")
+
+        except:  # pragma: no cover
+            PrintClass.fatal_error(message="Error writing statistics")
@@ -0,0 +1,48 @@
+import numpy as np
+
+
+def calc_delta_loads(loads):
+    """
+    Calculates the hourly load steps used for temporal superposition.
+    The load prior to the first hour is zero.
+
+    :param loads: hourly loads. Time is along the last axis.
+    :returns load steps, same shape as loads
+    """
+
+    loads = np.asarray(loads, dtype=float)
+    delta_q = np.empty_like(loads)
+    delta_q[..., 0] = loads[..., 0]
+    delta_q[..., 1:] = loads[..., 1:] - loads[..., :-1]
+
+    return delta_q
+
+
+def fft_convolve(delta_q, g_hourly):
+    """
+    Exact (non-aggregated) temporal superposition by FFT convolution.
+
+    out[..., n] = sum(delta_q[..., j] * g_hourly[..., n - j]) for j <= n
+
+    where g_hourly[..., i] is the response at (i + 1) hours.
+    Leading axes are broadcast, so a batch of load profiles or of responses is handled in one call.
+
+    :param delta_q: load steps. Time is along the last axis.
+    :param g_hourly: hourly response. Time is along the last axis.
+    :returns superposed response, with as many hours as delta_q
+    """
+
+    delta_q = np.asarray(delta_q, dtype=float)
+    g_hourly = np.asarray(g_hourly, dtype=float)
+
+    num_hours = delta_q.shape[-1]
+    g_hourly = g_hourly[..., :num_hours]
+
+    # zero padded so the circular convolution is linear
+    fft_len = 1
+    while fft_len < num_hours + g_hourly.shape[-1]:
+        fft_len *= 2
+
+    out = np.fft.irfft(np.fft.rfft(delta_q, fft_len) * np.fft.rfft(g_hourly, fft_len), fft_len)
+
+    return out[..., :num_hours]
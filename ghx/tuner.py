@@ -0,0 +1,221 @@
+import copy
+
+import numpy as np
+
+from ghx.array_fixed import GHXArrayFixedAggBlocks
+from ghx.constants import ConstantClass
+from ghx.my_print import PrintClass
+
+
+class AggregationTunerClass:
+    """
+    Chooses the 'Min Hourly History' and 'Intervals' settings for GHXArrayFixedAggBlocks.
+
+    Candidates are ranked by their estimated superposition cost. Starting from the cheapest, each candidate's
+    borehole temperature error is calculated over the verify window against exact superposition, stopping at
+    the first hour which misses the target. The first candidate which meets it is chosen. Candidates which are
+    coarser in every setting than one which failed are assumed to fail as well, and are skipped.
+
+    Only candidates whose longest interval forms within the verify window are considered, so every block size
+    is checked. Aggregation errors grow as blocks at the last interval accumulate, so candidates must meet the
+    target error scaled by the 'error_margin' over the verify window. This only screens candidates: a candidate
+    which passes is then run over the full simulation, and is chosen only if it meets the target error there.
+    The margin makes that check less likely to fail, so fewer candidates are run in full. It does not bound the
+    error by itself, as errors may grow by several times beyond the window for strongly unbalanced loads.
+    """
+
+    def __init__(self, json_data, loads_path, output_path, target_error, print_output=True,
+                 min_hourly_histories=(6, 12, 24, 48, 96, 192),
+                 first_intervals=(5, 10, 20, 40, 80),
+                 num_intervals=(1, 2, 3, 4, 5, 6, 7, 8),
+                 verify_hours=ConstantClass.hours_in_year,
+                 error_margin=0.9, verify_full=True):
+        """
+        Constructor for the class.
+
+        :param json_data: GHX input data. The aggregation settings are replaced by the tuner.
+        :param loads_path: path of the loads file
+        :param output_path: path of the output directory
+        :param target_error: maximum allowable borehole temperature error [C]
+        :param min_hourly_histories: candidate 'Min Hourly History' values
+        :param first_intervals: candidate first 'Intervals' values. Later intervals double.
+        :param num_intervals: candidate number of 'Intervals'
+        :param verify_hours: hours used to verify a candidate
+        :param error_margin: fraction of the target error which candidates must meet over the verify window
+        :param verify_full: if true, candidates which pass the verify window must meet the target error over
+        the full simulation
+        """
+
+        PrintClass(print_output, output_path)
+
+        self.target_error = target_error
+        self.verify_hours = verify_hours
+        self.max_error = target_error * error_margin
+
+        self.json_data = copy.deepcopy(json_data)
+        self.json_data['Simulation Configuration']['Aggregation Type'] = "Fixed"
+        self.json_data['Simulation Configuration']['Min Hourly History'] = min_hourly_histories[0]
+        self.json_data['Simulation Configuration']['Intervals'] = [first_intervals[0]]
+
+        # one engine is used for all candidates, so loads and g-functions are only read once
+        self.ghx = GHXArrayFixedAggBlocks(self.json_data, loads_path, output_path, print_output)
+
+        max_sim_hours = ConstantClass.hours_in_year * self.ghx.sim_years
+        self.verify_hours = min(self.verify_hours, max_sim_hours)
+        self.full_hours = max_sim_hours if verify_full else self.verify_hours
+
+        self.candidates = []
+        for min_hourly_history in min_hourly_histories:
+            for first_interval in first_intervals:
+                for num in num_intervals:
+                    intervals = [first_interval * 2 ** i for i in range(num)]
+                    if min_hourly_history + intervals[-1] <= self.verify_hours:
+                        self.candidates.append((min_hourly_history, intervals))
+
+        self.ref_temp_bh = None
+        self.num_evaluations = 0
+
+        # candidate closest to its error limit, as a tuple of error, limit, hours and candidate
+        self.best = None
+
+        # estimated errors, keyed by the settings which affect them
+        self.errors = {}
+
+    def set_candidate(self, min_hourly_history, intervals):
+        """
+        Sets the aggregation settings on the engine
+        """
+
+        self.ghx.min_hourly_history = min_hourly_history
+        self.ghx.agg_load_intervals = list(intervals)
+
+    def calc_cost(self, min_hourly_history, intervals):
+        """
+        :return: mean number of superposition terms per hour for the candidate
+        """
+
+        self.set_candidate(min_hourly_history, intervals)
+
+        return self.ghx.calc_superposition_cost()
+
+    def calc_error(self, min_hourly_history, intervals, num_hours, max_error=None):
+        """
+        :param max_error: the calculation stops at the first hour whose error exceeds this [C]
+        :return: maximum absolute borehole temperature error for the candidate over the first hours
+        """
+
+        # blocks at intervals which cannot fill within the window are never formed, so they do not change the result
+        used_intervals = [i for i in intervals if min_hourly_history + i <= num_hours]
+        key = (min_hourly_history, tuple(used_intervals or intervals[:1]), num_hours, max_error)
+
+        if key in self.errors:
+            return self.errors[key]
+
+        self.set_candidate(min_hourly_history, intervals)
+        self.num_evaluations += 1
+
+        ref_temp_bh = self.ref_temp_bh[:num_hours]
+        temp_bh = self.ghx.calc_bh_temps(num_hours, ref_temp_bh, max_error)
+
+        self.errors[key] = float(np.max(np.abs(temp_bh - ref_temp_bh[:len(temp_bh)])))
+
+        return self.errors[key]
+
+    @staticmethod
+    def is_coarser(candidate, other):
+        """
+        :return: True if the candidate keeps no more hourly history, and has no shorter first and last
+        intervals, than the other candidate
+        """
+
+        hist, intervals = candidate
+        other_hist, other_intervals = other
+
+        return hist <= other_hist and intervals[0] >= other_intervals[0] and intervals[-1] >= other_intervals[-1]
+
+    def tune(self):
+        """
+        Finds the cheapest candidate which meets the target error.
+
+        :return: dictionary with the chosen settings, error, and estimated cost. The error is over the full
+        simulation if it is verified. None if no candidate meets the target error.
+        """
+
+        PrintClass.my_print("Tuning aggregation intervals")
+
+        # exact superposition is cheap, so the reference covers the full simulation
+        self.ref_temp_bh = self.ghx.calc_reference_temps(self.full_hours)[0]
+        self.best = None
+
+        costs = [self.calc_cost(hist, intervals) for hist, intervals in self.candidates]
+        order = np.argsort(costs, kind='stable')
+
+        failed = []
+
+        for index in order:
+            hist, intervals = self.candidates[index]
+
+            if any(self.is_coarser(self.candidates[index], other) for other in failed):
+                continue
+
+            error = self.calc_error(hist, intervals, self.verify_hours, self.max_error)
+
+            if error > self.max_error:
+                self.record_failure(error, self.max_error, self.verify_hours, self.candidates[index])
+                failed.append(self.candidates[index])
+                continue
+
+            if self.full_hours > self.verify_hours:
+                error = self.calc_error(hist, intervals, self.full_hours, self.target_error)
+
+                if error > self.target_error:
+                    self.record_failure(error, self.target_error, self.full_hours, self.candidates[index])
+                    failed.append(self.candidates[index])
+                    continue
+
+            PrintClass.my_print("....Min Hourly History: %d, Intervals: %s" % (hist, intervals))
+            PrintClass.my_print("....Max error: %0.4f C, Cost: %0.1f terms/hr" % (error, costs[index]))
+            PrintClass.my_print("....Candidates evaluated: %d" % self.num_evaluations)
+
+            return {'Min Hourly History': hist,
+                    'Intervals': intervals,
+                    'Error': error,
+                    'Cost': costs[index]}
+
+        PrintClass.my_print("....No candidate meets the target error", 'warn')
+
+        if self.best is not None:
+            error, limit, num_hours, (hist, intervals) = self.best
+            PrintClass.my_print("....Closest: Min Hourly History: %d, Intervals: %s" % (hist, intervals), 'warn')
+            PrintClass.my_print("....Error reached %0.4f C over %d hours, against a limit of %0.4f C" %
+                                (error, num_hours, limit), 'warn')
+
+        return None
+
+    def record_failure(self, error, limit, num_hours, candidate):
+        """
+        Keeps the failed candidate whose error exceeds its limit by the least.
+        Errors are calculated until they first exceed the limit, so are lower bounds.
+        """
+
+        if self.best is None or error - limit < self.best[0] - self.best[1]:
+            self.best = (error, limit, num_hours, candidate)
+
+    def apply(self, json_data):
+        """
+        Tunes, then sets the chosen settings on a copy of the GHX input data
+
+        :return: updated GHX input data. None if no candidate meets the target error.
+        """
+
+        result = self.tune()
+
+        if result is None:
+            return None
+
+        json_data = copy.deepcopy(json_data)
+        json_data['Simulation Configuration']['Aggregation Type'] = "Fixed"
+        json_data['Simulation Configuration']['Min Hourly History'] = result['Min Hourly History']
+        json_data['Simulation Configuration']['Intervals'] = result['Intervals']
+
+        return json_data
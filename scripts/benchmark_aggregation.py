@@ -0,0 +1,130 @@
+import copy
+import os
+import sys
+import timeit
+
+import numpy as np
+import simplejson as json
+
+from ghx.array_fixed import GHXArrayFixedAggBlocks
+from ghx.array_geometric import GHXArrayGeometricAggBlocks
+from ghx.array_mlaa import GHXArrayMLAA
+from ghx.array_shifting import GHXArrayShiftingAggBlocks
+from ghx.my_print import PrintClass
+
+
+# nice usage function
+def usage():
+    print("""Call this script with up to one command line argument:
+    $ benchmark_aggregation.py <number of simulation years, default 5>""")
+
+
+examples_dir = os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "examples")
+run_dir = os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "run", "benchmark")
+
+input_path = os.path.join(examples_dir, "1x2_Std_GHX_Fixed.json")
+load_path = os.path.join(examples_dir, "1x2_Std_GHX_Sin.csv")
+
+# the full sin profile drives water below freezing in the 76.2 m boreholes,
+# so the benchmark field is deepened. the comparison is otherwise unchanged.
+bh_depth = 100.0
+
+cases = [
+    ("Fixed", GHXArrayFixedAggBlocks,
+     {"Aggregation Type": "Fixed",
+      "Min Hourly History": 5,
+      "Intervals": [12, 48, 192, 384]}),
+    ("Adaptive", GHXArrayFixedAggBlocks,
+     {"Aggregation Type": "Adaptive",
+      "Min Hourly History": 5,
+      "Intervals": [12, 48, 192, 384],
+      "Merge Tolerance": 100}),
+    ("MLAA", GHXArrayMLAA,
+     {"Aggregation Type": "MLAA",
+      "Min Hourly History": 12,
+      "Min Daily History": 48,
+      "Min Weekly History": 168}),
+    ("Shifting", GHXArrayShiftingAggBlocks,
+     {"Aggregation Type": "Shifting",
+      "History Depth": 5,
+      "History Expansion Rate": 2}),
+    ("Geometric", GHXArrayGeometricAggBlocks,
+     {"Aggregation Type": "Geometric",
+      "History Depth": 5,
+      "History Expansion Rate": 2}),
+]
+
+
+def run_case(name, engine_class, config, json_data, sim_years):
+    PrintClass.log_messages = ''
+    print("Running: %s" % name)
+
+    case_json = copy.deepcopy(json_data)
+    case_json['Simulation Configuration'] = {"Simulation Years": sim_years}
+    case_json['Simulation Configuration'].update(config)
+    for this_bh in case_json['GHXs']:
+        this_bh['Depth'] = bh_depth
+
+    timer_start = timeit.default_timer()
+    engine = engine_class(case_json, load_path, os.path.join(run_dir, name), False)
+    engine.simulate()
+    sim_time = timeit.default_timer() - timer_start
+
+    return engine, sim_time
+
+
+def benchmark(sim_years):
+    with open(input_path) as json_file:
+        json_data = json.load(json_file)
+
+    if not os.path.exists(run_dir):
+        os.makedirs(run_dir)
+
+    results = []
+    ref_bh = None
+    ref_mft = None
+
+    for name, engine_class, config in cases:
+        engine, sim_time = run_case(name, engine_class, config, json_data, sim_years)
+
+        if ref_bh is None:
+            ref_bh, ref_mft = engine.calc_reference_temps()
+
+        err_bh = np.array(engine.temp_bh) - ref_bh
+        err_mft = np.array(engine.temp_mft) - ref_mft
+
+        results.append((name,
+                        sim_time / sim_years,
+                        np.sqrt(np.mean(err_bh ** 2)),
+                        np.max(np.abs(err_bh)),
+                        np.sqrt(np.mean(err_mft ** 2)),
+                        np.max(np.abs(err_mft))))
+
+    out_file = open(os.path.join(run_dir, "benchmark.csv"), 'w')
+    out_file.write("Engine,"
+                   "Sim Time per Year [s],"
+                   "RMS Error BH Temp,"
+                   "Max Abs Err BH Temp,"
+                   "RMS Error MFT,"
+                   "Max Abs Err MFT\n")
+
+    print("%-10s %12s %12s %12s %12s %12s" % ("Engine", "s/year", "RMS BH", "Max BH", "RMS MFT", "Max MFT"))
+
+    for result in results:
+        out_file.write("%s,%0.3f,%0.5f,%0.5f,%0.5f,%0.5f\n" % result)
+        print("%-10s %12.3f %12.5f %12.5f %12.5f %12.5f" % result)
+
+    out_file.close()
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 2:
+        print("Invalid command line arguments")
+        usage()
+        sys.exit(1)
+
+    num_years = 5
+    if len(sys.argv) == 2:
+        num_years = int(sys.argv[1])
+
+    benchmark(num_years)
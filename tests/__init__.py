@@ -0,0 +1,4 @@
+import os
+
+# fluid property tables are cached with the test output, not in the home directory
+os.environ['GHX_CACHE_DIR'] = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', 'run', 'testing', 'cache')
@@ -0,0 +1,81 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import simplejson as json
+
+from ghx.array import run_simulation
+from ghx.array_mlaa import GHXArrayMLAA
+
+
+class TestGHXArray(unittest.TestCase):
+    def setUp(self):
+
+        json_file_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'examples', '1x2_Std_GHX_MLAA.json')
+
+        with open(json_file_path) as json_file:
+            self.dict_bh = json.load(json_file)
+
+        self.dict_bh['Simulation Configuration']['Simulation Years'] = 1
+
+        self.csv_file_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'examples', 'testing.csv')
+        self.output_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'run', 'testing')
+
+    def test_run_simulation(self):
+        """
+        Tests that an in-memory run matches a run with file output, and writes nothing
+        """
+
+        ref = GHXArrayMLAA(self.dict_bh, self.csv_file_path, self.output_path, False).simulate()
+
+        loads = np.genfromtxt(self.csv_file_path, delimiter=',', skip_header=1)
+
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            os.chdir(tmp_dir)
+            try:
+                results = run_simulation(self.dict_bh, loads)
+                self.assertEqual(os.listdir(tmp_dir), [])
+            finally:
+                os.chdir(cwd)
+
+        self.assertEqual(results.aggregation_type, "MLAA")
+        self.assertEqual(results.num_steps, 8760)
+        self.assertIsInstance(results.temp_mft, np.ndarray)
+        np.testing.assert_allclose(results.temp_bh, ref.temp_bh)
+        np.testing.assert_allclose(results.temp_mft, ref.temp_mft)
+
+        self.assertGreater(results.timing['Total'], 0)
+        self.assertAlmostEqual(results.timing['Initialization'] + results.timing['Simulation'],
+                               results.timing['Total'])
+
+        summary = results.summary()
+        self.assertAlmostEqual(summary['Max MFT'], np.max(ref.temp_mft))
+        self.assertEqual(summary['Steps'], 8760)
+
+    def test_results_data_type(self):
+        """
+        Tests single precision results, and that results are views of the simulation arrays
+        """
+
+        loads = np.genfromtxt(self.csv_file_path, delimiter=',', skip_header=1)
+
+        ref = run_simulation(self.dict_bh, loads)
+
+        self.dict_bh['Simulation Configuration']['Results Data Type'] = 'float32'
+        ghx = GHXArrayMLAA(self.dict_bh, loads, None, False)
+        results = ghx.simulate()
+
+        self.assertEqual(ref.temp_mft.dtype, np.float64)
+        self.assertEqual(results.temp_mft.dtype, np.float32)
+        self.assertEqual(results.nbytes, ref.nbytes // 2)
+        np.testing.assert_allclose(results.temp_mft, ref.temp_mft, atol=1e-4)
+
+        temp_bh, temp_mft = results.get_year(0)
+        self.assertEqual(len(temp_mft), 8760)
+        self.assertTrue(np.shares_memory(temp_mft, ghx.temp_mft))
+        self.assertTrue(np.shares_memory(results.get_steps(100, 200)[0], ghx.temp_bh))
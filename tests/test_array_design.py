@@ -0,0 +1,86 @@
+import os
+import unittest
+
+import numpy as np
+import simplejson as json
+
+from ghx.array_design import GHXArrayDesign
+
+
+class TestGHXArrayDesign(unittest.TestCase):
+    def setUp(self):
+
+        json_file_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'examples', '1x2_Std_GHX_Design.json')
+
+        with open(json_file_path) as json_file:
+            self.dict_bh = json.load(json_file)
+
+        self.csv_file_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'examples', 'testing.csv')
+        self.output_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'run', 'testing')
+
+    def test_init(self):
+        """
+        Tests initialization
+        """
+
+        curr_tst = GHXArrayDesign(
+            self.dict_bh, self.csv_file_path, self.output_path, False)
+
+        self.assertEqual(curr_tst.peak_duration,
+                         self.dict_bh['Simulation Configuration']['Peak Duration'])
+
+    def test_calc_monthly_loads(self):
+        """
+        Tests the monthly average and peak loads
+        """
+
+        curr_tst = GHXArrayDesign(
+            self.dict_bh, self.csv_file_path, self.output_path, False)
+
+        # a pulse shorter than the peak duration is averaged over the peak duration
+        curr_tst.sim_loads = [0.0] * 8760
+        curr_tst.sim_loads[100:103] = [1200.0] * 3
+        curr_tst.sim_loads[800:812] = [-730.0] * 12
+
+        curr_tst.calc_monthly_loads()
+
+        self.assertAlmostEqual(curr_tst.monthly_loads[0], 3600.0 / 730)
+        self.assertAlmostEqual(curr_tst.monthly_loads[1], -12.0)
+        self.assertAlmostEqual(curr_tst.peak_loads_max[0], 600.0)
+        self.assertAlmostEqual(curr_tst.peak_loads_min[1], -730.0)
+        self.assertAlmostEqual(curr_tst.peak_loads_min[2], 0.0)
+
+    def test_simulate(self):
+        """
+        Tests the monthly temperatures. Loads are constant, so the end of month temperatures are exact.
+        """
+
+        curr_tst = GHXArrayDesign(
+            self.dict_bh, self.csv_file_path, self.output_path, False)
+
+        curr_tst.simulate()
+
+        num_months = 12 * self.dict_bh['Simulation Configuration']['Simulation Years']
+        self.assertEqual(len(curr_tst.temp_mft), num_months)
+
+        temp_bh, temp_mft = curr_tst.calc_reference_temps()
+
+        np.testing.assert_allclose(curr_tst.temp_bh, temp_bh[729::730], atol=1e-9)
+        np.testing.assert_allclose(curr_tst.temp_mft, temp_mft[729::730], atol=1e-9)
+        np.testing.assert_allclose(curr_tst.temp_mft_min, curr_tst.temp_mft, atol=1e-9)
+        np.testing.assert_allclose(curr_tst.temp_mft_max, curr_tst.temp_mft, atol=1e-9)
+
+    def test_simulate_sinks(self):
+        """
+        Tests sinks are rejected, since the monthly temperatures are not hourly
+        """
+
+        self.dict_bh['Simulation Configuration']['Statistics'] = {'Max MFT': 30.0}
+
+        curr_tst = GHXArrayDesign(
+            self.dict_bh, self.csv_file_path, self.output_path, False)
+
+        self.assertRaises(SystemExit, curr_tst.simulate)
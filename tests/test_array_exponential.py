@@ -0,0 +1,80 @@
+import os
+import unittest
+
+import numpy as np
+import simplejson as json
+
+from ghx.array_exponential import GHXArrayExponentialSum
+
+
+class TestGHXArrayExponentialSum(unittest.TestCase):
+    def setUp(self):
+
+        json_file_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'examples', '1x2_Std_GHX_Exponential.json')
+
+        with open(json_file_path) as json_file:
+            self.dict_bh = json.load(json_file)
+
+        self.csv_file_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'examples', 'testing.csv')
+        self.output_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'run', 'testing')
+
+    def test_init(self):
+        """
+        Tests initialization
+        """
+
+        curr_tst = GHXArrayExponentialSum(
+            self.dict_bh, self.csv_file_path, self.output_path, False)
+
+        self.assertEqual(curr_tst.min_hourly_history,
+                         self.dict_bh['Simulation Configuration']['Min Hourly History'])
+        self.assertEqual(curr_tst.fit_tolerance,
+                         self.dict_bh['Simulation Configuration']['Fit Tolerance'])
+
+    def test_fit_exponentials(self):
+        """
+        Tests the exponential fit of the g-function tail
+        """
+
+        curr_tst = GHXArrayExponentialSum(
+            self.dict_bh, self.csv_file_path, self.output_path, False)
+
+        fit_error = curr_tst.fit_exponentials()
+
+        self.assertLessEqual(fit_error, curr_tst.fit_tolerance)
+        self.assertEqual(len(curr_tst.exp_weights), len(curr_tst.exp_taus))
+
+        # check the fit at a few points in the tail
+        t = np.array([100, 1000, 8000])
+        g = curr_tst.g_func_array(np.log(t * 3600 / curr_tst.ts))
+        g_fit = curr_tst.exp_const + np.sum(
+            curr_tst.exp_weights * (1 - np.exp(-t[:, np.newaxis] / curr_tst.exp_taus)), axis=1)
+
+        for i in range(len(t)):
+            self.assertAlmostEqual(g_fit[i], g[i], delta=curr_tst.fit_tolerance)
+
+    def test_simulate(self):
+        """
+        Tests the simulation against the step response for a constant load
+        """
+
+        curr_tst = GHXArrayExponentialSum(
+            self.dict_bh, self.csv_file_path, self.output_path, False)
+
+        curr_tst.simulate()
+
+        self.assertEqual(len(curr_tst.temp_bh), 8760)
+
+        # constant load, so the bh temp is the scaled step response
+        q = curr_tst.sim_loads[0] / (2 * np.pi * curr_tst.borehole.soil.conductivity * curr_tst.total_bh_length)
+        hours = np.arange(1, 8761)
+        temp_bh = curr_tst.borehole.soil.undisturbed_temp + \
+            q * curr_tst.g_func_array(np.log(hours * 3600 / curr_tst.ts))
+
+        tolerance = q * curr_tst.fit_tolerance
+
+        for i in [0, 10, 23, 24, 100, 1000, 8759]:
+            self.assertAlmostEqual(curr_tst.temp_bh[i], temp_bh[i], delta=tolerance)
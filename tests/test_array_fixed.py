@@ -2,6 +2,9 @@ import os
 import unittest
 from collections import deque
 
+import numpy as np
+import simplejson as json
+
 from ghx.aggregated_loads import AggregatedLoadFixed
 from ghx.array_fixed import GHXArrayFixedAggBlocks
 
@@ -494,3 +497,132 @@ class TestGHXArrayFixedAggBlocks(unittest.TestCase):
         self.assertEqual(curr_tst.agg_load_objects[1].q, 2.5)
         self.assertEqual(curr_tst.agg_load_objects[2].q, 5.0)
         self.assertEqual(curr_tst.agg_load_objects[3].q, 6.0)
+
+    def test_aggregate_load_adaptive(self):
+        """
+        Tests aggregate_load with adaptive aggregation, which also merges blocks with similar loads
+        """
+
+        json_file_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'examples', '1x2_Std_GHX_Adaptive.json')
+
+        with open(json_file_path) as json_file:
+            dict_bh = json.load(json_file)
+
+        csv_file_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'examples', 'testing.csv')
+        output_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'run', 'testing')
+        # init
+        curr_tst = GHXArrayFixedAggBlocks(
+            dict_bh, csv_file_path, output_path, False)
+
+        self.assertEqual(curr_tst.merge_tolerance,
+                         dict_bh['Simulation Configuration']['Merge Tolerance'])
+
+        curr_tst.agg_load_intervals = [5, 10, 20, 40]
+        curr_tst.merge_tolerance = 0.5
+
+        # blocks which fall between intervals
+        self.assertEqual(curr_tst.get_interval_index(5), 0)
+        self.assertEqual(curr_tst.get_interval_index(15), 1)
+        self.assertEqual(curr_tst.get_interval_index(100), 3)
+
+        # [0, 5, 5]
+        for load in [1, 1]:
+            curr_tst.hourly_loads = deque([load] * 5)
+            curr_tst.aggregate_load()
+
+        self.assertEqual(len(curr_tst.agg_load_objects), 3)
+
+        # two 5 hour blocks collapse into one 10 hour block
+        # [0, 10, 5]
+        curr_tst.hourly_loads = deque([1] * 5)
+        curr_tst.aggregate_load()
+
+        self.assertEqual(len(curr_tst.agg_load_objects), 3)
+        self.assertEqual(len(curr_tst.agg_load_objects[1].loads), 10)
+
+        # 10 and 5 hour blocks have the same load, so they merge early
+        # [0, 15, 5]
+        curr_tst.hourly_loads = deque([3] * 5)
+        curr_tst.aggregate_load()
+
+        self.assertEqual(len(curr_tst.agg_load_objects), 3)
+        self.assertEqual(len(curr_tst.agg_load_objects[1].loads), 15)
+        self.assertEqual(curr_tst.agg_load_objects[1].q, 1)
+        self.assertEqual(curr_tst.agg_load_objects[2].time(), 15)
+        self.assertEqual(curr_tst.agg_load_objects[2].q, 3)
+
+        # loads differ by more than the tolerance, so blocks are kept apart
+        # [0, 15, 10, 5]
+        for load in [3, 3]:
+            curr_tst.hourly_loads = deque([load] * 5)
+            curr_tst.aggregate_load()
+
+        self.assertEqual(len(curr_tst.agg_load_objects), 4)
+        self.assertEqual(len(curr_tst.agg_load_objects[1].loads), 15)
+        self.assertEqual(len(curr_tst.agg_load_objects[2].loads), 10)
+        self.assertEqual(curr_tst.agg_load_objects[2].time(), 15)
+        self.assertEqual(curr_tst.agg_load_objects[3].time(), 25)
+
+        # 15 and 10 hour blocks collapse by count into one 25 hour block
+        # [0, 25, 5, 5]
+        curr_tst.hourly_loads = deque([3] * 5)
+        curr_tst.aggregate_load()
+
+        self.assertEqual(len(curr_tst.agg_load_objects), 4)
+        self.assertEqual(len(curr_tst.agg_load_objects[1].loads), 25)
+        self.assertAlmostEqual(curr_tst.agg_load_objects[1].q, 1.8)
+
+        # [0, 25, 10, 5]
+        curr_tst.hourly_loads = deque([3] * 5)
+        curr_tst.aggregate_load()
+
+        self.assertEqual(len(curr_tst.agg_load_objects), 4)
+        self.assertEqual(len(curr_tst.agg_load_objects[2].loads), 10)
+
+        # 10 and 5 hour blocks merge early, before the count is reached
+        # [0, 25, 15, 5]
+        curr_tst.hourly_loads = deque([3] * 5)
+        curr_tst.aggregate_load()
+
+        self.assertEqual(len(curr_tst.agg_load_objects), 4)
+        self.assertEqual(len(curr_tst.agg_load_objects[2].loads), 15)
+        self.assertEqual(curr_tst.agg_load_objects[2].q, 3)
+        self.assertEqual(curr_tst.agg_load_objects[3].time(), 40)
+
+    def test_fast_forward(self):
+        """
+        Tests that runs of unchanged load are fast-forwarded to the same temperatures as a full simulation
+        """
+
+        json_file_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'examples', '1x2_Std_GHX_Fixed.json')
+
+        with open(json_file_path) as json_file:
+            dict_bh = json.load(json_file)
+
+        # plant off at night and for a month, a steady baseline, and a varying load
+        hours = np.arange(8760)
+        loads = np.zeros((8760, 3))
+        loads[:, 0] = hours + 1
+        loads[:, 1] = 2000 * np.sin(hours / 100.0)
+        loads[hours % 24 < 8, 1] = 0
+        loads[2000:2730, 1] = 0
+        loads[5000:5500, 1] = 3000
+        loads[:, 2] = 0.000303
+
+        curr_tst = GHXArrayFixedAggBlocks(dict_bh, loads, None, False)
+        results = curr_tst.simulate()
+
+        run_lengths = curr_tst.load_run_lengths
+        self.assertEqual(run_lengths[0], 8)
+        self.assertEqual(run_lengths[5000], 500)
+        self.assertEqual(run_lengths[-1], 1)
+
+        dict_bh['Simulation Configuration']['Fast Forward'] = False
+        full_results = GHXArrayFixedAggBlocks(dict_bh, loads, None, False).simulate()
+
+        np.testing.assert_allclose(results.temp_bh, full_results.temp_bh, rtol=0, atol=1e-10)
+        np.testing.assert_allclose(results.temp_mft, full_results.temp_mft, rtol=0, atol=1e-10)
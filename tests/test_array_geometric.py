@@ -0,0 +1,83 @@
+import os
+import unittest
+
+import numpy as np
+import simplejson as json
+
+from ghx.array_geometric import GHXArrayGeometricAggBlocks
+from ghx.array_shifting import GHXArrayShiftingAggBlocks
+
+
+class TestGHXArrayGeometricAggBlocks(unittest.TestCase):
+    def setUp(self):
+
+        json_file_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'examples', '1x2_Std_GHX_Geometric.json')
+
+        with open(json_file_path) as json_file:
+            self.dict_bh = json.load(json_file)
+
+        self.csv_file_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'examples', 'testing.csv')
+        self.output_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'run', 'testing')
+
+    def test_set_load_aggregation(self):
+        """
+        Tests the cell widths
+        """
+
+        curr_tst = GHXArrayGeometricAggBlocks(
+            self.dict_bh, self.csv_file_path, self.output_path, False)
+
+        np.testing.assert_array_equal(curr_tst.cell_widths[:12], [1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 4, 4])
+        np.testing.assert_array_equal(curr_tst.cell_starts[:7], [0, 1, 2, 3, 4, 5, 7])
+
+        # cells span the simulation
+        self.assertGreaterEqual(np.sum(curr_tst.cell_widths), 8760)
+
+    def test_shift_loads(self):
+        """
+        Tests that the vectorized load shifting matches the shifting load blocks
+        """
+
+        curr_tst = GHXArrayGeometricAggBlocks(
+            self.dict_bh, self.csv_file_path, self.output_path, False)
+
+        shift_tst = GHXArrayShiftingAggBlocks(
+            self.dict_bh, self.csv_file_path, self.output_path, False)
+
+        loads = np.sin(np.arange(100) / 5.0) * 1000
+
+        for load in loads:
+            curr_tst.shift_loads(load)
+            shift_tst.shift_loads(load * 3600)
+
+        for i, this_block in enumerate(shift_tst.agg_load_objects):
+            if this_block.num_loads == 0:
+                break
+            self.assertAlmostEqual(curr_tst.cell_loads[i], this_block.q, delta=1e-9)
+
+        # energy is conserved
+        num_full = curr_tst.num_full_cells
+        energy_full = np.sum(curr_tst.cell_loads[:num_full] * curr_tst.cell_widths[:num_full])
+        energy_partial = curr_tst.cell_loads[num_full] * curr_tst.partial_count
+        self.assertAlmostEqual(energy_full + energy_partial, np.sum(loads), delta=1e-6)
+
+    def test_simulate(self):
+        """
+        Tests the simulation against exact superposition.
+        Loads are constant, so aggregation introduces no error.
+        """
+
+        curr_tst = GHXArrayGeometricAggBlocks(
+            self.dict_bh, self.csv_file_path, self.output_path, False)
+
+        curr_tst.simulate()
+
+        temp_bh, temp_mft = curr_tst.calc_reference_temps()
+
+        tolerance = 1e-6
+
+        for i in [0, 4, 5, 100, 1000, 8759]:
+            self.assertAlmostEqual(curr_tst.temp_bh[i], temp_bh[i], delta=tolerance)
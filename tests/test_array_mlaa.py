@@ -0,0 +1,194 @@
+import os
+import unittest
+
+import numpy as np
+import simplejson as json
+
+from ghx.array_mlaa import GHXArrayMLAA
+
+
+class TestGHXArrayMLAA(unittest.TestCase):
+    def setUp(self):
+
+        json_file_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'examples', '1x2_Std_GHX_MLAA.json')
+
+        with open(json_file_path) as json_file:
+            self.dict_bh = json.load(json_file)
+
+        self.csv_file_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'examples', 'testing.csv')
+        self.output_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'run', 'testing')
+
+    def test_init(self):
+        """
+        Tests initialization
+        """
+
+        curr_tst = GHXArrayMLAA(
+            self.dict_bh, self.csv_file_path, self.output_path, False)
+
+        self.assertEqual(curr_tst.min_hourly_history,
+                         self.dict_bh['Simulation Configuration']['Min Hourly History'])
+        self.assertEqual(curr_tst.min_daily_history,
+                         self.dict_bh['Simulation Configuration']['Min Daily History'])
+        self.assertEqual(curr_tst.min_weekly_history,
+                         self.dict_bh['Simulation Configuration']['Min Weekly History'])
+
+    def test_get_block_starts(self):
+        """
+        Tests how hours are moved between the aggregation levels
+        """
+
+        curr_tst = GHXArrayMLAA(
+            self.dict_bh, self.csv_file_path, self.output_path, False)
+
+        # hourly only
+        for hour in range(35):
+            curr_tst.update_block_spans()
+
+        self.assertEqual(curr_tst.span_hourly, 35)
+        self.assertEqual(curr_tst.span_daily, 0)
+        np.testing.assert_array_equal(curr_tst.get_block_starts(), np.arange(35))
+
+        # first daily block
+        curr_tst.update_block_spans()
+
+        self.assertEqual(curr_tst.span_hourly, 12)
+        self.assertEqual(curr_tst.span_daily, 24)
+        np.testing.assert_array_equal(curr_tst.get_block_starts(),
+                                      np.concatenate(([0], np.arange(24, 36))))
+
+        # run to the first monthly block
+        sim_hour = 36
+        while curr_tst.span_monthly == 0:
+            curr_tst.update_block_spans()
+            sim_hour += 1
+
+            starts = curr_tst.get_block_starts()
+
+            # blocks are contiguous and in order
+            self.assertEqual(starts[0], 0)
+            self.assertTrue(np.all(np.diff(starts) > 0))
+            spans = [curr_tst.span_monthly, curr_tst.span_weekly, curr_tst.span_daily, curr_tst.span_hourly]
+            self.assertEqual(sum(spans), sim_hour)
+
+        self.assertEqual(curr_tst.span_monthly, 730)
+        self.assertEqual(curr_tst.get_block_starts()[1], 730)
+
+    def test_simulate(self):
+        """
+        Tests the simulation against exact superposition.
+        Loads are constant, so aggregation introduces no error.
+        """
+
+        curr_tst = GHXArrayMLAA(
+            self.dict_bh, self.csv_file_path, self.output_path, False)
+
+        curr_tst.simulate()
+
+        temp_bh, temp_mft = curr_tst.calc_reference_temps()
+
+        self.assertEqual(len(curr_tst.temp_bh), len(temp_bh))
+
+        tolerance = 1e-6
+
+        for i in [0, 11, 12, 100, 1000, 8759]:
+            self.assertAlmostEqual(curr_tst.temp_bh[i], temp_bh[i], delta=tolerance)
+
+        # resistances are pre-solved with the fluid at the undisturbed ground temperature, as in the reference
+        for i in [0, 11, 12, 100, 1000, 8759]:
+            self.assertAlmostEqual(curr_tst.temp_mft[i], temp_mft[i], delta=tolerance)
+
+    def test_simulate_streamed(self):
+        """
+        Tests a simulation without stored hourly results holds no arrays longer than one year
+        """
+
+        self.dict_bh['Simulation Configuration']['Simulation Years'] = 2
+        self.dict_bh['Simulation Configuration']['Statistics'] = {}
+
+        stored = GHXArrayMLAA(
+            self.dict_bh, self.csv_file_path, self.output_path, False)
+        stored.simulate()
+
+        self.dict_bh['Simulation Configuration']['Store Hourly Results'] = False
+
+        streamed = GHXArrayMLAA(
+            self.dict_bh, self.csv_file_path, self.output_path, False)
+        streamed.simulate()
+
+        self.assertIsNone(streamed.g_func_hourly)
+        self.assertEqual(len(streamed.cumulative_loads), 8761)
+        self.assertEqual(len(streamed.resist_bh_hourly), 8760)
+        self.assertEqual(len(streamed.temp_mft), 0)
+
+        np.testing.assert_allclose(streamed.statistics.get_statistics('Monthly'),
+                                   stored.statistics.get_statistics('Monthly'), atol=1e-9)
+
+    def test_calc_resistance_array(self):
+        """
+        Tests the resistance array against the single state resistance, without changing the fluid state
+        """
+
+        curr_tst = GHXArrayMLAA(
+            self.dict_bh, self.csv_file_path, self.output_path, False)
+
+        fluid = curr_tst.borehole.pipe.fluid
+        init_temp = fluid.temperature
+        init_resist = curr_tst.borehole.calc_bh_resistance()
+
+        resist_bh = curr_tst.calc_resistance_array([0.0002, 0.0004, 0.0002], [10.04, 30.0, 10.0])
+
+        self.assertEqual(resist_bh[0], resist_bh[2])
+        self.assertEqual(fluid.temperature, init_temp)
+        self.assertEqual(curr_tst.borehole.calc_bh_resistance(), init_resist)
+
+        for flow_rate, temp, resist in [(0.0002, 10.0, resist_bh[0]), (0.0004, 30.0, resist_bh[1])]:
+            fluid.update_fluid_state(new_temp=temp, new_flow_rate=flow_rate)
+            self.assertAlmostEqual(curr_tst.borehole.calc_bh_resistance(update_pipe=True), resist, delta=1e-9)
+
+    def test_simulate_resistance_correction(self):
+        """
+        Tests resistance correction passes at the simulated mean fluid temperature
+        """
+
+        self.dict_bh['Simulation Configuration']['Resistance Correction Passes'] = 2
+
+        curr_tst = GHXArrayMLAA(
+            self.dict_bh, self.csv_file_path, self.output_path, False)
+
+        curr_tst.simulate()
+
+        temp_bh, temp_mft = curr_tst.calc_reference_temps()
+
+        self.assertEqual(len(curr_tst.resist_bh_hourly), len(temp_bh))
+
+        # borehole temperatures do not depend on the resistance
+        self.assertAlmostEqual(curr_tst.temp_bh[-1], temp_bh[-1], delta=1e-6)
+
+        # fluid properties change a little with temperature
+        self.assertNotAlmostEqual(curr_tst.temp_mft[-1], temp_mft[-1], delta=1e-6)
+        self.assertAlmostEqual(curr_tst.temp_mft[-1], temp_mft[-1], delta=0.01)
+
+        # the fluid temperature tolerance coarsens the resistance temperatures
+        num_resists = len(np.unique(curr_tst.resist_bh_hourly))
+
+        for bh in self.dict_bh['GHXs']:
+            bh['Fluid']['Temperature Tolerance'] = 0.25
+
+        curr_tst = GHXArrayMLAA(
+            self.dict_bh, self.csv_file_path, self.output_path, False)
+
+        curr_tst.simulate()
+
+        self.assertLess(len(np.unique(curr_tst.resist_bh_hourly)), num_resists)
+        self.assertAlmostEqual(curr_tst.temp_mft[-1], temp_mft[-1], delta=0.01)
+
+        # rounded temperatures are reported as skipped updates, within the tolerance
+        ret = curr_tst.borehole.pipe.fluid.report_property_updates()
+        self.assertGreater(ret['Skipped'], 0)
+        self.assertGreater(ret['Max Drift'], 0)
+        self.assertLessEqual(ret['Max Drift'], 0.25 + 1e-9)
+        self.assertGreater(ret['Max Property Error'], 0)
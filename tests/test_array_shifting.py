@@ -147,3 +147,39 @@
 # elif i == 5:
 # self.assertEqual(curr_tst.agg_load_objects[1].q_est, 2.125)
 # self.assertEqual(curr_tst.agg_load_objects[2].q_est, 0.875)
+
+
+import os
+import unittest
+
+import simplejson as json
+
+from ghx.array_shifting import GHXArrayShiftingAggBlocks
+
+
+class TestGHXArrayShiftingAggBlocksSimulate(unittest.TestCase):
+    def test_simulate(self):
+        """
+        Tests the simulation against exact superposition.
+        Loads are constant, so aggregation introduces no error.
+        """
+
+        json_file_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'examples', '1x2_Std_GHX_Shifting.json')
+        csv_file_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'examples', 'testing.csv')
+        output_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'run', 'testing')
+
+        with open(json_file_path) as json_file:
+            dict_bh = json.load(json_file)
+
+        curr_tst = GHXArrayShiftingAggBlocks(dict_bh, csv_file_path, output_path, False)
+        curr_tst.simulate()
+
+        temp_bh, temp_mft = curr_tst.calc_reference_temps()
+
+        tolerance = 1e-6
+
+        for i in [0, 4, 5, 100, 1000, 8759]:
+            self.assertAlmostEqual(curr_tst.temp_bh[i], temp_bh[i], delta=tolerance)
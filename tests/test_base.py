@@ -588,6 +588,12 @@ class TestBaseGHXClass(unittest.TestCase):
         # extrapolate up
         self.assertAlmostEqual(curr_tst.g_func(5.0), 8.29, delta=tolerance)
 
+        # array interpolation matches the scalar version
+        ln_t_ts = [-17.0, -10.0, 0.0, 5.0]
+        g_vals = curr_tst.g_func_array(ln_t_ts)
+        for i in range(len(ln_t_ts)):
+            self.assertAlmostEqual(g_vals[i], curr_tst.g_func(ln_t_ts[i]), delta=1e-10)
+
     def test_calc_ts(self):
         """
         Tests calc_ts which sets timescale
@@ -4921,3 +4921,194 @@ class TestBoreholeClass(unittest.TestCase):
 
         self.assertAlmostEqual(
             curr_tst.calc_bh_total_internal_resistance(), 0.36818, delta=tolerance)
+
+    def test_set_conductivities(self):
+        dict_bh = {
+            'Name': 'BH 1',
+            'Location': [0, 0],
+            'Depth': 76.2,
+            'Radius': 0.05715,
+            'Shank Spacing': 0.0521,
+            'Pipe':
+                {
+                    'Outside Diameter': 0.0267,
+                    'Wall Thickness': 0.00243,
+                    'Conductivity': 0.389,
+                    'Density': 800,
+                    'Specific Heat': 1000
+            },
+            'Fluid':
+                {
+                    'Type': 'Water',
+                    'Concentration': 100,
+                    'Flow Rate': 0.5
+            },
+            'Soil':
+                {
+                    'Conductivity': 2.493,
+                    'Density': 1500,
+                    'Specific Heat': 1663.8,
+                    'Temperature': 13.0
+            },
+            'Grout':
+                {
+                    'Conductivity': 0.744,
+                    'Density': 1000,
+                    'Specific Heat': 1000
+            }
+        }
+
+        base_tst = BoreholeClass(dict_bh, False)
+
+        dict_bh['Soil']['Conductivity'] = 1.5
+        dict_bh['Grout']['Conductivity'] = 1.2
+
+        curr_tst = BoreholeClass(dict_bh, False)
+        self.assertNotAlmostEqual(curr_tst.resist_bh, base_tst.resist_bh)
+
+        # same properties, same resistance
+        curr_tst.set_conductivities(2.493, 0.744)
+
+        self.assertAlmostEqual(curr_tst.sigma, base_tst.sigma)
+        self.assertAlmostEqual(curr_tst.soil.thermal_diffusivity, base_tst.soil.thermal_diffusivity)
+        self.assertAlmostEqual(curr_tst.calc_bh_resistance(), base_tst.resist_bh)
+
+    def test_calc_bh_resistance_array(self):
+        dict_bh = {
+            'Name': 'BH 1',
+            'Location': [0, 0],
+            'Depth': 76.2,
+            'Radius': 0.05715,
+            'Shank Spacing': 0.0521,
+            'Pipe':
+                {
+                    'Outside Diameter': 0.0267,
+                    'Wall Thickness': 0.00243,
+                    'Conductivity': 0.389,
+                    'Density': 800,
+                    'Specific Heat': 1000
+            },
+            'Fluid':
+                {
+                    'Type': 'Water',
+                    'Concentration': 100,
+                    'Flow Rate': 0.000303
+            },
+            'Soil':
+                {
+                    'Conductivity': 2.493,
+                    'Density': 1500,
+                    'Specific Heat': 1663.8,
+                    'Temperature': 13.0
+            },
+            'Grout':
+                {
+                    'Conductivity': 0.744,
+                    'Density': 1000,
+                    'Specific Heat': 1000
+            }
+        }
+
+        curr_tst = BoreholeClass(dict_bh, False)
+
+        flow_rates = [0.000303, 0.000303 / 4, 0.000303 / 10]
+        temps = [13.0, 30.0, 5.0]
+
+        resist_bh = curr_tst.calc_bh_resistance_array(flow_rates, temps)
+
+        for i in range(len(flow_rates)):
+            curr_tst.pipe.fluid.update_fluid_state(new_temp=temps[i], new_flow_rate=flow_rates[i])
+            self.assertAlmostEqual(resist_bh[i], curr_tst.calc_bh_resistance(update_pipe=True))
+
+        # sampled conductivities, one row for each sample
+        soil_conductivity = [2.493, 1.5]
+        grout_conductivity = [0.744, 1.2]
+
+        resist_bh = curr_tst.calc_bh_resistance_array(flow_rates, temps, soil_conductivity, grout_conductivity)
+
+        self.assertEqual(resist_bh.shape, (2, len(flow_rates)))
+
+        for j in range(len(soil_conductivity)):
+            curr_tst.set_conductivities(soil_conductivity[j], grout_conductivity[j])
+            for i in range(len(flow_rates)):
+                curr_tst.pipe.fluid.update_fluid_state(new_temp=temps[i], new_flow_rate=flow_rates[i])
+                self.assertAlmostEqual(resist_bh[j, i], curr_tst.calc_bh_resistance(update_pipe=True))
+
+    def test_multipole(self):
+        dict_bh = {
+            'Name': 'BH 1',
+            'Location': [0, 0],
+            'Depth': 76.2,
+            'Radius': 0.05715,
+            'Shank Spacing': 0.0521,
+            'Multipole Order': 1,
+            'Pipe':
+                {
+                    'Outside Diameter': 0.0267,
+                    'Wall Thickness': 0.00243,
+                    'Conductivity': 0.389,
+                    'Density': 800,
+                    'Specific Heat': 1000
+            },
+            'Fluid':
+                {
+                    'Type': 'Water',
+                    'Concentration': 100,
+                    'Flow Rate': 0.000303
+            },
+            'Soil':
+                {
+                    'Conductivity': 2.493,
+                    'Density': 1500,
+                    'Specific Heat': 1663.8,
+                    'Temperature': 13.0
+            },
+            'Grout':
+                {
+                    'Conductivity': 0.744,
+                    'Density': 1000,
+                    'Specific Heat': 1000
+            }
+        }
+
+        # first order is the same as the closed forms
+        curr_tst = BoreholeClass(dict_bh, False)
+        dict_bh.pop('Multipole Order')
+        closed_form = BoreholeClass(dict_bh, False)
+
+        self.assertIsNone(closed_form.multipole)
+        self.assertAlmostEqual(curr_tst.resist_bh, closed_form.resist_bh, delta=1e-10)
+        self.assertAlmostEqual(curr_tst.resist_bh_total_internal, closed_form.resist_bh_total_internal, delta=1e-10)
+
+        # double U-tube, with the flow split between the U-tubes
+        dict_bh['Number of U-tubes'] = 2
+        dict_bh['Shank Spacing'] = 0.07
+        curr_tst = BoreholeClass(dict_bh, False)
+
+        self.assertEqual(curr_tst.multipole.order, 3)
+        self.assertEqual(len(curr_tst.multipole.positions), 4)
+        self.assertEqual(curr_tst.pipe.num_u_tubes, 2)
+        self.assertLess(curr_tst.resist_bh_ave, closed_form.resist_bh_ave)
+
+        flow_rates = [0.000303, 0.000303 / 4]
+        temps = [13.0, 30.0]
+
+        resist_bh = curr_tst.calc_bh_resistance_array(flow_rates, temps)
+
+        for i in range(len(flow_rates)):
+            curr_tst.pipe.fluid.update_fluid_state(new_temp=temps[i], new_flow_rate=flow_rates[i])
+            self.assertAlmostEqual(resist_bh[i], curr_tst.calc_bh_resistance(update_pipe=True))
+
+        # sampled conductivities, one row for each sample
+        soil_conductivity = [2.493, 1.5]
+        grout_conductivity = [0.744, 1.2]
+
+        resist_bh = curr_tst.calc_bh_resistance_array(flow_rates, temps, soil_conductivity, grout_conductivity)
+
+        self.assertEqual(resist_bh.shape, (2, len(flow_rates)))
+
+        for j in range(len(soil_conductivity)):
+            curr_tst.set_conductivities(soil_conductivity[j], grout_conductivity[j])
+            for i in range(len(flow_rates)):
+                curr_tst.pipe.fluid.update_fluid_state(new_temp=temps[i], new_flow_rate=flow_rates[i])
+                self.assertAlmostEqual(resist_bh[j, i], curr_tst.calc_bh_resistance(update_pipe=True))
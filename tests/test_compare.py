@@ -0,0 +1,84 @@
+import os
+import shutil
+import unittest
+
+import numpy as np
+
+from ghx.compare import CompareClass, calc_errors, read_run_temps, read_sim_time
+from ghx.results_store import write_results_store
+
+
+class TestCompare(unittest.TestCase):
+    def setUp(self):
+
+        self.output_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'run', 'testing', 'compare')
+
+        if os.path.exists(self.output_path):
+            shutil.rmtree(self.output_path)
+
+        hours = np.arange(100)
+        self.temp_bh = 10 + np.sin(hours / 10.0)
+        self.temp_mft = self.temp_bh + 2
+
+        self.base_path = os.path.join(self.output_path, 'base')
+        self.write_run(self.base_path, self.temp_bh, self.temp_mft, 2.0)
+
+        self.write_run(os.path.join(self.output_path, 'runs', 'a'), self.temp_bh + 0.1, self.temp_mft + 0.2, 1.0)
+        self.write_run(os.path.join(self.output_path, 'runs', 'b'), self.temp_bh, self.temp_mft + 0.05, 0.5)
+        self.write_run(os.path.join(self.output_path, 'runs', 'c'), self.temp_bh[:50], self.temp_mft[:50], 0.1)
+
+        store_dir = os.path.join(self.output_path, 'runs', 'd')
+        write_results_store(os.path.join(store_dir, 'GHX.bin'), self.temp_bh, self.temp_mft - 0.1)
+
+    @staticmethod
+    def write_run(run_dir, temp_bh, temp_mft, sim_time):
+
+        os.makedirs(run_dir)
+
+        with open(os.path.join(run_dir, 'GHX.csv'), 'w') as out_file:
+            out_file.write("Hour, BH Temp [C], MFT [C]\n")
+            for i in range(len(temp_bh)):
+                out_file.write("%d, %0.4f, %0.4f\n" % (i + 1, temp_bh[i], temp_mft[i]))
+
+        with open(os.path.join(run_dir, 'ghx.log'), 'w') as out_file:
+            out_file.write("Simulation complete\nSimulation time: %0.3f sec\n" % sim_time)
+
+    def test_read(self):
+        temps = read_run_temps(self.base_path)
+        self.assertEqual(temps.shape, (2, 100))
+        np.testing.assert_allclose(temps[1], self.temp_mft, atol=1e-4)
+
+        self.assertAlmostEqual(read_sim_time(self.base_path), 2.0)
+        self.assertTrue(np.isnan(read_sim_time(os.path.join(self.output_path, 'runs', 'd'))))
+
+    def test_calc_errors(self):
+        base = np.zeros((2, 4))
+        test = np.array([[1.0, -1.0, 1.0, -1.0], [0.0, 0.0, 0.0, 2.0]])
+
+        rms, max_abs = calc_errors(base, test)
+        np.testing.assert_allclose(rms, [1.0, 1.0])
+        np.testing.assert_allclose(max_abs, [1.0, 2.0])
+
+        rms, max_abs = calc_errors(base, test[:, :2])
+        self.assertTrue(np.all(np.isnan(rms)))
+
+    def test_compare(self):
+        comparison = CompareClass(self.base_path, self.output_path)
+        rows = comparison.compare()
+
+        self.assertEqual([os.path.basename(row['Dir']) for row in rows], ['b', 'd', 'a', 'c'])
+        self.assertAlmostEqual(rows[0]['RMS MFT'], 0.05, delta=1e-4)
+        self.assertAlmostEqual(rows[0]['RMS BH'], 0.0, delta=1e-4)
+        self.assertAlmostEqual(rows[0]['Percent Base Sim Time'], 0.25)
+        self.assertAlmostEqual(rows[2]['Max Abs MFT'], 0.2, delta=1e-4)
+        self.assertTrue(np.isnan(rows[3]['RMS MFT']))
+
+        pool_rows = CompareClass(self.base_path, self.output_path, num_processes=2).compare()
+        self.assertEqual([row['Dir'] for row in pool_rows], [row['Dir'] for row in rows])
+        self.assertEqual(pool_rows[1]['RMS MFT'], rows[1]['RMS MFT'])
+
+        table_path = os.path.join(self.output_path, 'summary.csv')
+        comparison.write_table(table_path)
+        with open(table_path) as in_file:
+            self.assertEqual(len(in_file.readlines()), 5)
@@ -12,6 +12,8 @@ class TestConstantClass(unittest.TestCase):
         curr_tst = ConstantClass()
 
         self.assertEqual(curr_tst.months_in_year, 12)
+        self.assertEqual(curr_tst.hours_in_day, 24)
+        self.assertEqual(curr_tst.hours_in_week, 168)
         self.assertEqual(curr_tst.hours_in_month, 730)
         self.assertEqual(curr_tst.hours_in_year, 8760)
         self.assertEqual(curr_tst.celsius_to_kelvin, 273.15)
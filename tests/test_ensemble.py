@@ -0,0 +1,103 @@
+import os
+import unittest
+
+import numpy as np
+import simplejson as json
+
+from ghx.array_mlaa import GHXArrayMLAA
+from ghx.ensemble import GHXArrayEnsemble
+
+
+class TestGHXArrayEnsemble(unittest.TestCase):
+    def setUp(self):
+
+        json_file_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'examples', '1x2_Std_GHX_MLAA.json')
+
+        with open(json_file_path) as json_file:
+            self.dict_bh = json.load(json_file)
+
+        self.csv_file_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'examples', 'testing.csv')
+        self.output_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'run', 'testing')
+
+        loads = np.genfromtxt(self.csv_file_path, delimiter=',', skip_header=1)[:, 1]
+        self.scenario_loads = np.array([loads, 2 * loads, np.zeros(len(loads))])
+
+    def test_init(self):
+        """
+        Tests initialization
+        """
+
+        curr_tst = GHXArrayEnsemble(
+            self.dict_bh, self.csv_file_path, self.output_path, self.scenario_loads, False)
+
+        self.assertEqual(curr_tst.num_scenarios, 3)
+        self.assertEqual(curr_tst.min_hourly_history,
+                         self.dict_bh['Simulation Configuration']['Min Hourly History'])
+
+    def test_simulate(self):
+        """
+        Tests the ensemble matches a standalone simulation, and is linear in load
+        """
+
+        curr_tst = GHXArrayEnsemble(
+            self.dict_bh, self.csv_file_path, self.output_path, self.scenario_loads, False)
+        curr_tst.simulate()
+
+        base_tst = GHXArrayMLAA(
+            self.dict_bh, self.csv_file_path, self.output_path, False)
+        base_tst.simulate()
+
+        temp_ground = curr_tst.borehole.soil.undisturbed_temp
+
+        self.assertEqual(curr_tst.temp_bh.shape, (3, 8760))
+
+        # superposition is the same for each scenario
+        np.testing.assert_allclose(curr_tst.temp_bh[0], np.array(base_tst.temp_bh), atol=1e-8)
+        np.testing.assert_allclose(curr_tst.temp_mft[0], np.array(base_tst.temp_mft), atol=1e-8)
+
+        # doubled loads double the temperature rise
+        np.testing.assert_allclose(curr_tst.temp_bh[1] - temp_ground,
+                                   2 * (curr_tst.temp_bh[0] - temp_ground), atol=1e-9)
+
+        # no load, no temperature rise
+        np.testing.assert_allclose(curr_tst.temp_mft[2], temp_ground, atol=1e-9)
+
+    def test_simulate_resistance_correction(self):
+        """
+        Tests each scenario is corrected at its own mean fluid temperatures
+        """
+
+        self.dict_bh['Simulation Configuration']['Resistance Correction Passes'] = 2
+
+        # halve the second scenario, since doubled loads freeze the water
+        scenario_loads = self.scenario_loads * np.array([[1.0], [0.25], [1.0]])
+
+        curr_tst = GHXArrayEnsemble(
+            self.dict_bh, self.csv_file_path, self.output_path, scenario_loads, False)
+        curr_tst.simulate()
+
+        base_tst = GHXArrayMLAA(
+            self.dict_bh, self.csv_file_path, self.output_path, False)
+        base_tst.simulate()
+
+        self.assertEqual(curr_tst.resist_bh_hourly.shape, (3, 8760))
+
+        np.testing.assert_allclose(curr_tst.temp_mft[0], np.array(base_tst.temp_mft), atol=1e-8)
+
+        # scenarios at different temperatures have different resistances
+        self.assertFalse(np.allclose(curr_tst.resist_bh_hourly[1], curr_tst.resist_bh_hourly[0]))
+
+    def test_simulate_sinks(self):
+        """
+        Tests sinks are rejected, since they take one scenario
+        """
+
+        self.dict_bh['Simulation Configuration']['Statistics'] = {'Max MFT': 30.0}
+
+        curr_tst = GHXArrayEnsemble(
+            self.dict_bh, self.csv_file_path, self.output_path, self.scenario_loads, False)
+
+        self.assertRaises(SystemExit, curr_tst.simulate)
@@ -0,0 +1,79 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import CoolProp.CoolProp as cp
+import numpy as np
+
+from ghx import fluid_tables
+from ghx.fluid_tables import get_coolprop_name, get_property_table, interp_properties, in_table
+
+
+class TestFluidTables(unittest.TestCase):
+    def setUp(self):
+
+        self.table_dir = tempfile.mkdtemp()
+        self.init_table_dir = os.environ.get('GHX_CACHE_DIR')
+        os.environ['GHX_CACHE_DIR'] = self.table_dir
+        fluid_tables.property_tables.clear()
+
+    def tearDown(self):
+
+        if self.init_table_dir is None:
+            del os.environ['GHX_CACHE_DIR']
+        else:
+            os.environ['GHX_CACHE_DIR'] = self.init_table_dir
+        fluid_tables.property_tables.clear()
+        shutil.rmtree(self.table_dir)
+
+    def test_get_coolprop_name(self):
+        """
+        Tests fluid names passed to CoolProp
+        """
+
+        self.assertEqual(get_coolprop_name('Water', 100), 'Water')
+        self.assertEqual(get_coolprop_name('PropyleneGlycol', 30), 'INCOMP::MPG[0.3]')
+        self.assertEqual(get_coolprop_name('EthyleneGlycol', 25), 'INCOMP::MEG[0.25]')
+        self.assertEqual(get_coolprop_name('EthyleneGlycol', 0), 'Water')
+
+    def test_get_property_table(self):
+        """
+        Tests tables are cached on disk and memory-mapped, and interpolate CoolProp
+        """
+
+        table = get_property_table('INCOMP::MPG[0.3]', 101325)
+
+        self.assertEqual(len(os.listdir(self.table_dir)), 1)
+        self.assertIsInstance(table, np.memmap)
+
+        # freezes at about -12.8 C
+        self.assertAlmostEqual(table[0, 0], -12.7, delta=0.1)
+
+        # held in memory
+        self.assertIs(get_property_table('INCOMP::MPG[0.3]', 101325), table)
+
+        # read back from disk
+        fluid_tables.property_tables.clear()
+        self.assertTrue(np.array_equal(get_property_table('INCOMP::MPG[0.3]', 101325), table))
+
+        # a wider table is not read from the narrower one
+        init_max_temp = fluid_tables.table_max_temp
+        fluid_tables.table_max_temp = 60.0
+        try:
+            narrow_table = get_property_table('INCOMP::MPG[0.3]', 101325)
+        finally:
+            fluid_tables.table_max_temp = init_max_temp
+        self.assertEqual(len(os.listdir(self.table_dir)), 2)
+        self.assertAlmostEqual(narrow_table[-1, 0], 60.0)
+        self.assertAlmostEqual(get_property_table('INCOMP::MPG[0.3]', 101325)[-1, 0], 95.0)
+
+        temps = np.array([-5.0, 10.03, 44.444])
+        vals = interp_properties(table, temps)
+
+        for i, key in enumerate(fluid_tables.property_keys):
+            tst_vals = cp.PropsSI(key, 'T', temps + 273.15, 'P', 101325, 'INCOMP::MPG[0.3]')
+            for val, tst_val in zip(vals[:, i], tst_vals):
+                self.assertAlmostEqual(val / tst_val, 1, delta=1e-5)
+
+        self.assertEqual(list(in_table(table, [-20, 20, 99])), [False, True, False])
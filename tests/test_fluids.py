@@ -1,5 +1,7 @@
 import unittest
 
+import numpy as np
+
 from ghx.fluids import FluidsClass
 
 
@@ -143,3 +145,112 @@ class TestFluidsClass(unittest.TestCase):
 
         curr_tst.temperature = 80
         self.assertAlmostEqual(curr_tst.pr(), 2.22, delta=tolerance)
+
+    def test_update_properties(self):
+        """
+        Tests properties are only re-evaluated beyond the temperature tolerance
+        """
+
+        dict_fluid = {'Type': 'Water',
+                      'Concentration': 100,
+                      'Flow Rate': 0.000303,
+                      'Temperature Tolerance': 1.0}
+
+        curr_tst = FluidsClass(dict_fluid, 20, False)
+        self.assertEqual(curr_tst.num_evaluations, 1)
+
+        dens_20 = curr_tst.dens()
+        visc_20 = curr_tst.visc()
+
+        # within the tolerance, properties are held
+        curr_tst.update_fluid_state(new_temp=20.5)
+        self.assertEqual(curr_tst.dens(), dens_20)
+        curr_tst.update_fluid_state(new_temp=21.0)
+        self.assertEqual(curr_tst.visc(), visc_20)
+        self.assertEqual(curr_tst.num_evaluations, 1)
+        self.assertEqual(curr_tst.num_skipped, 2)
+
+        # beyond the tolerance, properties are re-evaluated
+        curr_tst.update_fluid_state(new_temp=22.0)
+        self.assertNotEqual(curr_tst.visc(), visc_20)
+        self.assertEqual(curr_tst.num_evaluations, 2)
+
+        # viscosity changes by about 2.5% per degree near 20 C. skipped updates drifted 1 degree.
+        ret = curr_tst.report_property_updates()
+        self.assertEqual(ret['Skipped'], 2)
+        self.assertAlmostEqual(ret['Max Property Error'], 0.025, delta=0.005)
+
+        # without a tolerance, every change is evaluated
+        del dict_fluid['Temperature Tolerance']
+        curr_tst = FluidsClass(dict_fluid, 20, False)
+        curr_tst.update_fluid_state(new_temp=20.5)
+        curr_tst.dens()
+        curr_tst.cp()
+        self.assertEqual(curr_tst.num_evaluations, 2)
+        self.assertEqual(curr_tst.report_property_updates()['Max Property Error'], 0)
+
+        # rounded temperatures are skipped updates, with their property error measured directly
+        curr_tst.record_rounded_temps([20.0, 20.4, 21.6], [20.0, 20.0, 22.0])
+        ret = curr_tst.report_property_updates()
+        self.assertEqual(ret['Skipped'], 2)
+        self.assertAlmostEqual(ret['Max Drift'], 0.4)
+        self.assertAlmostEqual(ret['Max Property Error'], 0.01, delta=0.003)
+
+    def test_property_arrays(self):
+        """
+        Tests array property evaluation against the single state routines
+        """
+
+        dict_fluid = {'Type': 'Water',
+                      'Concentration': 100,
+                      'Flow Rate': 0.000303}
+
+        curr_tst = FluidsClass(dict_fluid, 20, False)
+
+        temps = np.array([[20, 40], [60, 20]])
+
+        dens = curr_tst.dens_array(temps)
+        cp = curr_tst.cp_array(temps)
+        visc = curr_tst.visc_array(temps)
+        cond = curr_tst.cond_array(temps)
+        pr = curr_tst.pr_array(temps)
+        heat_capacity = curr_tst.heat_capacity_array(temps, np.full(temps.shape, 2 * 0.000303))
+
+        self.assertEqual(dens.shape, temps.shape)
+
+        for i, j in [(0, 0), (0, 1), (1, 0), (1, 1)]:
+            curr_tst.update_fluid_state(new_temp=temps[i, j])
+            self.assertAlmostEqual(dens[i, j], curr_tst.dens())
+            self.assertAlmostEqual(cp[i, j], curr_tst.cp())
+            self.assertAlmostEqual(visc[i, j], curr_tst.visc())
+            self.assertAlmostEqual(cond[i, j], curr_tst.cond())
+            self.assertAlmostEqual(pr[i, j], curr_tst.pr())
+            curr_tst.calc_mass_flow_rate()
+            self.assertAlmostEqual(heat_capacity[i, j], 2 * curr_tst.heat_capacity())
+
+    def test_glycol(self):
+        """
+        Tests propylene glycol properties
+
+        Reference values come from ASHRAE 2017
+
+        ASHRAE. 2017. ASHRAE Handbook - Fundamentals. Ch. 31. Atlanta, GA.
+        """
+
+        dict_fluid = {'Type': 'PropyleneGlycol',
+                      'Concentration': 30,
+                      'Flow Rate': 0.000303}
+
+        curr_tst = FluidsClass(dict_fluid, 0, False)
+
+        self.assertEqual(curr_tst.coolprop_name, 'INCOMP::MPG[0.3]')
+        self.assertAlmostEqual(curr_tst.dens(), 1031, delta=5)
+        self.assertAlmostEqual(curr_tst.cp(), 3830, delta=50)
+
+        # below freezing for water
+        curr_tst.update_fluid_state(new_temp=-5)
+        self.assertGreater(curr_tst.visc(), 5E-3)
+
+        # outside the table, CoolProp is called directly
+        self.assertAlmostEqual(curr_tst.dens_array([99.0])[0],
+                               FluidsClass(dict_fluid, 99.0, False).dens())
@@ -0,0 +1,61 @@
+import unittest
+
+import numpy as np
+
+from ghx.g_function import calc_erf_integral, calc_fls_response, calc_g_func, g_func_cache
+
+
+class TestGFunction(unittest.TestCase):
+    def test_calc_erf_integral(self):
+        """
+        Tests the error function integral against its limits
+        """
+
+        self.assertAlmostEqual(calc_erf_integral(0.0), 0.0)
+
+        # approaches x - 1/sqrt(pi) for large x
+        self.assertAlmostEqual(calc_erf_integral(10.0), 10.0 - 1 / np.sqrt(np.pi))
+
+    def test_calc_fls_response(self):
+        """
+        Tests the self-response at short times approaches the infinite line source
+        """
+
+        depth = 76.2
+        radius = 0.05715
+        ln_t_ts = -6.0
+
+        ret = calc_fls_response([radius], depth, 0.0, [ln_t_ts])
+
+        # 1/2 * E1(rb^2 / (4 * alpha * t)), with 4 * alpha * t = 4 * H^2 * exp(ln_t_ts) / 9
+        z = radius ** 2 / (4 * depth ** 2 * np.exp(ln_t_ts) / 9)
+        tst_val = 0.5 * (-0.5772156649 - np.log(z) + z)
+
+        self.assertAlmostEqual(ret[0, 0], tst_val, delta=0.05)
+
+    def test_calc_g_func(self):
+        """
+        Tests g-functions for a single borehole and a pair of boreholes
+        """
+
+        g_func_cache.clear()
+
+        ln_t_ts, g_single = calc_g_func([[0, 0]], 76.2, 0.05715)
+        ln_t_ts, g_pair = calc_g_func([[0, 0], [6, 0]], 76.2, 0.05715)
+
+        # increasing with time
+        self.assertTrue(np.all(np.diff(g_single) > 0))
+        self.assertTrue(np.all(np.diff(g_pair) > 0))
+
+        # interaction between boreholes is only seen at long times
+        self.assertAlmostEqual(g_single[0], g_pair[0], delta=1e-6)
+        self.assertGreater(g_pair[-1], g_single[-1] + 1)
+
+        # approaching the steady state value for a single borehole, ln(H / (2 rb))
+        self.assertAlmostEqual(g_single[-1], np.log(76.2 / (2 * 0.05715)), delta=0.5)
+
+        # cached by geometry
+        self.assertEqual(len(g_func_cache), 2)
+        ln_t_ts, g_cached = calc_g_func([[0, 0], [6, 0]], 76.2, 0.05715)
+        self.assertEqual(len(g_func_cache), 2)
+        self.assertTrue(np.allclose(g_cached, g_pair))
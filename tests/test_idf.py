@@ -0,0 +1,101 @@
+import os
+import shutil
+import unittest
+
+import numpy as np
+import simplejson as json
+
+from ghx.array import run_simulation
+from ghx.idf import convert_dir, convert_idf, read_idf_objects, vertical_to_json
+
+
+class TestIDF(unittest.TestCase):
+    def setUp(self):
+
+        self.idf_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'examples', '1x2_Std_GHX.idf')
+        self.json_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'examples', '1x2_Std_GHX_Fixed.json')
+        self.csv_file_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'examples', 'testing.csv')
+        self.output_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'run', 'testing', 'idf')
+
+        if os.path.exists(self.output_path):
+            shutil.rmtree(self.output_path)
+        os.makedirs(os.path.join(self.output_path, 'idf'))
+
+        with open(self.idf_path) as in_file:
+            self.ghx_object = in_file.read()
+
+    def test_read_idf_objects(self):
+        path = os.path.join(self.output_path, 'idf', 'portfolio.idf')
+
+        # a second object with many pairs, on fewer lines, after an unrelated object
+        pairs = ["%0.2f, %0.3f" % (-15 + 0.1 * i, 0.05 * i) for i in range(150)]
+        with open(path, 'w') as out_file:
+            out_file.write(self.ghx_object)
+            out_file.write("\n  Building,\n    Office,  !- Name\n    0.0;\n\n")
+            out_file.write("groundheatexchanger:vertical, GHE 2, In 2, Out 2, 0.001, 4, 100, 0.06, 2, 2.5E+06, 10, "
+                           "0.8, 0.4, 0.0267, 0.03, 0.0024, 20, 0.0005, 150,\n")
+            out_file.write(",\n".join(pairs) + ";\n")
+
+        objects = list(read_idf_objects(path))
+        self.assertEqual(len(objects), 2)
+        self.assertEqual(len(objects[0]), 18 + 2 * 76)
+        self.assertEqual(objects[1][0], 'GHE 2')
+        self.assertEqual(len(objects[1]), 18 + 2 * 150)
+
+        self.assertEqual(list(read_idf_objects(path, 'Building')), [['Office', '0.0']])
+
+        json_data = vertical_to_json(objects[1])
+        self.assertEqual(len(json_data['GHXs']), 4)
+        self.assertEqual(len(json_data['G-func Pairs']), 150)
+        self.assertEqual(json_data['G-func Pairs'][-1], [-0.1, 7.45])
+        self.assertEqual(json_data['Simulation Configuration']['Simulation Years'], 20)
+        self.assertAlmostEqual(json_data['GHXs'][0]['Shank Spacing'], 0.0567)
+
+        paths = convert_idf(path, os.path.join(self.output_path, 'portfolio.json'))
+        self.assertEqual([os.path.basename(p) for p in paths],
+                         ['portfolio_Vertical_GHE_1x2_Std.json', 'portfolio_GHE_2.json'])
+
+    def test_convert_idf(self):
+        path = convert_idf(self.idf_path, os.path.join(self.output_path, 'GHX.json'))[0]
+
+        with open(path) as json_file:
+            json_data = json.load(json_file)
+
+        with open(self.json_path) as json_file:
+            example_data = json.load(json_file)
+
+        self.assertEqual(json_data['G-func Pairs'], example_data['G-func Pairs'])
+        self.assertEqual(len(json_data['GHXs']), 2)
+        self.assertAlmostEqual(json_data['GHXs'][0]['Shank Spacing'], 0.0521)
+        self.assertAlmostEqual(json_data['GHXs'][0]['Soil']['Specific Heat'], 1663.8)
+
+        loads = np.genfromtxt(self.csv_file_path, delimiter=',', skip_header=1)
+
+        np.testing.assert_allclose(run_simulation(json_data, loads).temp_mft,
+                                   run_simulation(example_data, loads).temp_mft)
+
+    def test_convert_dir(self):
+        idf_dir = os.path.join(self.output_path, 'idf')
+
+        for i in range(3):
+            shutil.copy(self.idf_path, os.path.join(idf_dir, 'GHX_%d.idf' % i))
+
+        with open(os.path.join(idf_dir, 'Empty.idf'), 'w') as out_file:
+            out_file.write("Building, Office, 0.0;\n")
+
+        json_dir = os.path.join(self.output_path, 'json')
+
+        results = convert_dir(idf_dir, json_dir, {'Aggregation Type': 'MLAA'}, num_processes=2)
+
+        self.assertEqual(len(results), 4)
+        self.assertIsNotNone(results[0][2])
+        self.assertEqual(sorted(os.listdir(json_dir)), ['GHX_0.json', 'GHX_1.json', 'GHX_2.json'])
+
+        with open(os.path.join(json_dir, 'GHX_2.json')) as json_file:
+            json_data = json.load(json_file)
+
+        self.assertEqual(json_data['Simulation Configuration'], {'Aggregation Type': 'MLAA', 'Simulation Years': 1})
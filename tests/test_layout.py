@@ -0,0 +1,86 @@
+import os
+import unittest
+
+import simplejson as json
+
+from ghx.layout import LayoutOptimizerClass
+
+
+class TestLayoutOptimizerClass(unittest.TestCase):
+    def setUp(self):
+
+        json_file_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'examples', '1x2_Std_GHX_Fixed.json')
+
+        with open(json_file_path) as json_file:
+            self.dict_bh = json.load(json_file)
+
+        self.csv_file_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'examples', 'testing.csv')
+        self.output_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'run', 'testing')
+
+    def test_enumerate_layouts(self):
+        """
+        Tests layouts fit on the land area, without mirror images
+        """
+
+        curr_tst = LayoutOptimizerClass(self.dict_bh, self.csv_file_path, self.output_path, 12, 6, max_mft=30,
+                                        print_output=False, spacings=(6,))
+
+        names = [layout['Name'] for layout in curr_tst.enumerate_layouts()]
+
+        self.assertEqual(names, ['Rectangle_1x1_6m', 'Rectangle_1x2_6m', 'Rectangle_2x2_6m', 'L_2x2_6m',
+                                 'Rectangle_3x1_6m', 'Rectangle_3x2_6m', 'L_3x2_6m'])
+
+        for layout in curr_tst.layouts:
+            for location in layout['Locations']:
+                self.assertLessEqual(location[0], 12)
+                self.assertLessEqual(location[1], 6)
+
+        # L-shape legs share the corner
+        self.assertEqual(len(curr_tst.layouts[-1]['Locations']), 4)
+
+        curr_tst.max_boreholes = 4
+        self.assertEqual(len(curr_tst.enumerate_layouts()), 6)
+
+    def test_optimize(self):
+        """
+        Tests the best layout is the shortest sized layout, and meets the limit
+        """
+
+        curr_tst = LayoutOptimizerClass(self.dict_bh, self.csv_file_path, self.output_path, 12, 12, max_mft=30,
+                                        print_output=False, spacings=(6,), max_boreholes=9)
+
+        ret = curr_tst.optimize()
+
+        self.assertLessEqual(ret['Max MFT'], 30)
+        self.assertLessEqual(ret['Depth'], curr_tst.max_depth)
+
+        for result in curr_tst.results:
+            self.assertGreaterEqual(result['Total Length'], ret['Total Length'])
+
+        # dominated layouts are not sized
+        self.assertLess(len(curr_tst.results), len(curr_tst.screened))
+
+        json_data = curr_tst.apply()
+
+        self.assertEqual(len(json_data['GHXs']), ret['Number of Boreholes'])
+        for json_data_bh in json_data['GHXs']:
+            self.assertAlmostEqual(json_data_bh['Depth'], ret['Depth'])
+
+    def test_optimize_pool(self):
+        """
+        Tests a process pool finds the same best layout
+        """
+
+        curr_tst = LayoutOptimizerClass(self.dict_bh, self.csv_file_path, self.output_path, 12, 12, max_mft=30,
+                                        print_output=False, spacings=(6,), max_boreholes=9)
+        ret = curr_tst.optimize()
+
+        pool_tst = LayoutOptimizerClass(self.dict_bh, self.csv_file_path, self.output_path, 12, 12, max_mft=30,
+                                        print_output=False, spacings=(6,), max_boreholes=9, num_processes=2)
+        pool_ret = pool_tst.optimize()
+
+        self.assertEqual(pool_ret['Name'], ret['Name'])
+        self.assertAlmostEqual(pool_ret['Depth'], ret['Depth'])
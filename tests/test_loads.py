@@ -0,0 +1,82 @@
+import os
+import unittest
+
+import numpy as np
+import simplejson as json
+
+from ghx.array import run_simulation
+from ghx.base import read_loads
+from ghx.loads import calc_synthetic_loads, make_loads, profile_params, write_loads
+
+
+class TestLoads(unittest.TestCase):
+    def setUp(self):
+
+        self.output_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'run', 'testing')
+
+    @staticmethod
+    def calc_load(t, amplitude, B, C, D, E, F, G):
+        """
+        Synthetic load of one hour, evaluated term by term
+        """
+
+        q1 = amplitude * np.sin(np.pi * (t - B) / 12) * np.sin(F * np.pi * (t - B) / 8760)
+
+        q2 = (168 - C) / 168
+        for i in range(1, 4):
+            q2 += (np.cos(i * np.pi * C / 84) - 1) * (np.sin(i * np.pi * (t - B) / 84)) / (i * np.pi)
+
+        FL = np.floor(F * (t - B) / 8760)
+
+        if np.cos(F * np.pi * (t - G) / 4380) + E >= 0:
+            SN = 1
+        else:
+            SN = -1
+
+        return (q1 * q2) + pow(-1.0, FL) * np.abs(q1 * q2) + D * pow(-1.0, FL) * SN
+
+    def test_calc_synthetic_loads(self):
+        hours = np.arange(0, 20000, 7)
+
+        for params in profile_params.values():
+            loads = calc_synthetic_loads(hours, 2000, **params)
+            self.assertEqual(loads.shape, hours.shape)
+            for hour, load in zip(hours, loads):
+                self.assertAlmostEqual(load, self.calc_load(hour, 2000, **params), delta=1e-9)
+
+        # a family of amplitudes and phases
+        loads = calc_synthetic_loads(hours, [[1000], [2000]], **dict(profile_params['Asymmetric'], B=[0, 1000, 2000]))
+        self.assertEqual(loads.shape, (2, 3, len(hours)))
+        np.testing.assert_allclose(loads[1, 1], calc_synthetic_loads(hours, 2000, **profile_params['Asymmetric']))
+
+    def test_make_loads(self):
+        loads = make_loads('Symmetric', 4000, years=2, steps_per_hour=4, flow_rate=0.0005)
+
+        self.assertEqual(loads.shape, (4 * 2 * 8760, 3))
+        self.assertEqual(loads[3, 0], 1.0)
+        self.assertEqual(loads[4, 1], make_loads('Symmetric', 4000)[1, 1])
+        self.assertTrue(np.all(loads[:, 2] == 0.0005))
+
+    def test_write_loads(self):
+        loads = make_loads(amplitude=10000)
+
+        binary_path = os.path.join(self.output_path, 'loads.npy')
+        csv_path = os.path.join(self.output_path, 'loads.csv')
+
+        write_loads(binary_path, loads)
+        write_loads(csv_path, loads)
+
+        np.testing.assert_array_equal(read_loads(binary_path), loads)
+        np.testing.assert_allclose(read_loads(csv_path), loads, atol=0.005)
+
+        json_file_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'examples', '1x2_Std_GHX_MLAA.json')
+
+        with open(json_file_path) as json_file:
+            json_data = json.load(json_file)
+
+        json_data['Simulation Configuration']['Simulation Years'] = 1
+
+        np.testing.assert_array_equal(run_simulation(json_data, binary_path).temp_mft,
+                                      run_simulation(json_data, loads).temp_mft)
@@ -0,0 +1,75 @@
+import os
+import unittest
+
+import numpy as np
+import simplejson as json
+
+from ghx.base import BaseGHXClass
+from ghx.monte_carlo import MonteCarloClass
+
+
+class TestMonteCarloClass(unittest.TestCase):
+    def setUp(self):
+
+        json_file_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'examples', '1x2_Std_GHX_Fixed.json')
+
+        with open(json_file_path) as json_file:
+            self.dict_bh = json.load(json_file)
+
+        self.csv_file_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'examples', 'testing.csv')
+        self.output_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'run', 'testing')
+
+    def test_sample_properties(self):
+        """
+        Tests the sampled properties have the requested means and spreads
+        """
+
+        curr_tst = MonteCarloClass(self.dict_bh, self.csv_file_path, self.output_path, 20000, False,
+                                   relative_std={'Grout Conductivity': 0.2}, seed=1)
+
+        samples = curr_tst.sample_properties()
+
+        self.assertEqual(samples.shape, (20000, 3))
+        self.assertTrue(np.all(samples > 0))
+
+        soil = curr_tst.ghx.borehole.soil
+        means = [soil.conductivity, soil.heat_capacity, curr_tst.ghx.borehole.grout.conductivity]
+        np.testing.assert_allclose(np.mean(samples, axis=0), means, rtol=0.01)
+        np.testing.assert_allclose(np.std(samples, axis=0) / means, [0.1, 0.1, 0.2], rtol=0.05)
+
+    def test_simulate(self):
+        """
+        Tests the percentile bands
+        """
+
+        # no spread reproduces exact superposition
+        curr_tst = MonteCarloClass(self.dict_bh, self.csv_file_path, self.output_path, 2, False,
+                                   relative_std={'Soil Conductivity': 0,
+                                                 'Soil Heat Capacity': 0,
+                                                 'Grout Conductivity': 0})
+        curr_tst.simulate()
+
+        base_tst = BaseGHXClass(self.dict_bh, self.csv_file_path, self.output_path, False)
+        temp_bh, temp_mft = base_tst.calc_reference_temps()
+
+        np.testing.assert_allclose(curr_tst.temp_bh[1], temp_bh, atol=1e-4)
+        np.testing.assert_allclose(curr_tst.temp_mft[1], temp_mft, atol=1e-4)
+
+        # bands widen with the spread in properties, and are ordered
+        curr_tst = MonteCarloClass(self.dict_bh, self.csv_file_path, self.output_path, 20, False,
+                                   seed=1, batch_size=8, num_processes=2)
+        curr_tst.simulate()
+
+        self.assertEqual(curr_tst.temp_bh.shape, (20, 8760))
+        self.assertEqual(curr_tst.bands_bh.shape, (3, 8760))
+
+        # sample temperatures are written to file, and the bands are over all samples
+        temp_mft = np.load(os.path.join(self.output_path, 'Samples_MFT.npy'))
+        np.testing.assert_array_equal(temp_mft, curr_tst.temp_mft)
+        np.testing.assert_allclose(curr_tst.bands_mft, np.percentile(temp_mft, [5, 50, 95], axis=0))
+        self.assertTrue(np.all(curr_tst.bands_bh[0] <= curr_tst.bands_bh[1]))
+        self.assertTrue(np.all(curr_tst.bands_mft[1] <= curr_tst.bands_mft[2]))
+        self.assertGreater(curr_tst.bands_bh[2, -1] - curr_tst.bands_bh[0, -1], 0.1)
@@ -0,0 +1,105 @@
+import unittest
+
+import numpy as np
+
+from ghx.multipole import calc_bh_average_resistance, calc_bh_grout_resistance, calc_bh_total_internal_resistance
+from ghx.multipole import build_multipole, calc_pipe_positions, calc_thetas, get_multipole, multipole_cache_size
+
+
+class TestMultipole(unittest.TestCase):
+    def test_calc_thetas(self):
+        """
+        Tests the non-dimensional borehole geometry
+        """
+
+        theta_1, theta_2, theta_3 = calc_thetas(0.032, 0.048, 0.016)
+
+        self.assertAlmostEqual(theta_1, 0.33333, delta=0.00001)
+        self.assertAlmostEqual(theta_2, 3.0)
+        self.assertAlmostEqual(theta_3, 0.5)
+
+    def test_resistance_grid(self):
+        """
+        Tests a grid of designs in one call, with a pipe resistance of 0.05.
+        The same designs are checked one at a time in test_borehole.
+        """
+
+        radius = 0.048
+        shank_spacing = np.array([0.032, 0.064])
+        soil_conductivity = np.array([[4.0], [1.0]])
+        grout_conductivity = 0.6
+
+        resist_grout = calc_bh_grout_resistance(shank_spacing, radius, 0.016, grout_conductivity,
+                                                soil_conductivity, 0.05)
+        resist_total = calc_bh_total_internal_resistance(shank_spacing, radius, 0.016, grout_conductivity,
+                                                         soil_conductivity, 0.05)
+        resist_ave = calc_bh_average_resistance(shank_spacing, radius, 0.016, grout_conductivity,
+                                                soil_conductivity, 0.05)
+
+        self.assertEqual(resist_grout.shape, (2, 2))
+
+        tolerance = 0.00001
+
+        self.assertTrue(np.allclose(resist_grout, [[0.17701, 0.06695], [0.17910, 0.09138]], atol=tolerance))
+        self.assertTrue(np.allclose(resist_total, [[0.32365, 0.44849], [0.34783, 0.70364]], atol=tolerance))
+        self.assertTrue(np.allclose(resist_ave - resist_grout, 0.025))
+
+    def test_calc_pipe_positions(self):
+        """
+        Tests the pipe positions of single and double U-tubes
+        """
+
+        positions, groups = calc_pipe_positions(0.04, 1)
+
+        self.assertTrue(np.allclose(positions, [[0.02, 0.0], [-0.02, 0.0]]))
+        self.assertEqual(groups, [[0], [1]])
+
+        positions, groups = calc_pipe_positions(0.04, 2)
+
+        self.assertTrue(np.allclose(positions, [[0.02, 0.0], [0.0, 0.02], [-0.02, 0.0], [0.0, -0.02]]))
+        self.assertEqual(groups, [[0, 1], [2, 3]])
+
+    def test_multipole_first_order(self):
+        """
+        Tests that the first-order multipole method is the same as the closed forms
+        """
+
+        resist_pipe = np.array([0.02, 0.05, 0.1])
+
+        for shank_spacing in [0.032, 0.05, 0.064]:
+            for soil_conductivity in [1.0, 4.0]:
+                multipole = get_multipole(shank_spacing, 0.048, 0.016, 0.6, soil_conductivity, 1)
+                resist_ave, resist_total = multipole.calc_resistances(resist_pipe)
+
+                self.assertTrue(np.allclose(resist_ave, calc_bh_average_resistance(
+                    shank_spacing, 0.048, 0.016, 0.6, soil_conductivity, resist_pipe), rtol=1e-10))
+                self.assertTrue(np.allclose(resist_total, calc_bh_total_internal_resistance(
+                    shank_spacing, 0.048, 0.016, 0.6, soil_conductivity, resist_pipe), rtol=1e-10))
+
+    def test_multipole_order(self):
+        """
+        Tests that higher orders converge, and that solvers are cached
+        """
+
+        resists = [get_multipole(0.032, 0.048, 0.016, 0.6, 4.0, order).calc_resistances(0.05)
+                   for order in [1, 3, 6, 10]]
+
+        self.assertIs(get_multipole(0.032, 0.048, 0.016, 0.6, 4.0, 3), get_multipole(0.032, 0.048, 0.016, 0.6, 4.0, 3))
+
+        # sampled conductivities do not grow the cache without bound
+        for i in range(multipole_cache_size + 10):
+            get_multipole(0.032, 0.048, 0.016, 0.6, 1.0 + 0.01 * i, 1)
+        self.assertEqual(build_multipole.cache_info().currsize, multipole_cache_size)
+
+        # tight shank spacing. the first order overestimates the total internal resistance by about 6%.
+        self.assertAlmostEqual(resists[0][1] / resists[-1][1], 1.057, delta=0.001)
+        self.assertAlmostEqual(resists[1][0], resists[-1][0], delta=1e-5)
+        self.assertAlmostEqual(resists[2][1], resists[-1][1], delta=1e-4)
+
+        # double U-tube
+        multipole = get_multipole(0.064, 0.07, 0.016, 1.5, 2.5, 8, 2)
+        resist_ave, resist_total = multipole.calc_resistances([0.05, 0.05])
+
+        self.assertEqual(multipole.calc_resist_matrix(0.05).shape, (4, 4))
+        self.assertAlmostEqual(resist_ave[0], 0.07232, delta=0.00001)
+        self.assertAlmostEqual(resist_total[1], 0.17657, delta=0.00001)
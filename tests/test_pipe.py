@@ -184,3 +184,41 @@ class TestPipeClass(unittest.TestCase):
 
         self.assertAlmostEqual(curr_tst.calc_pipe_resistance(
         ), 0.082204 + 0.004453, delta=tolerance)
+
+    def test_calc_pipe_resistance_array(self):
+        """
+        Tests array pipe resistance against the single state routines in each flow regime
+        """
+
+        dict_pipe = {
+            'Outside Diameter': 0.0267,
+            'Wall Thickness': 0.00243,
+            'Conductivity': 0.389,
+            'Density': 800,
+            'Specific Heat': 1000
+        }
+
+        dict_fluid = {'Type': 'Water',
+                      'Concentration': 100,
+                      'Flow Rate': 0.000303
+                      }
+
+        curr_tst = PipeClass(dict_pipe, dict_fluid, 13.0, False)
+
+        re = np.array([1000, 1500, 2500, 4999, 5000, 10000])
+        f = curr_tst.friction_factor_array(re)
+        for i in range(len(re)):
+            self.assertAlmostEqual(f[i], curr_tst.friction_factor(re[i]))
+
+        # turbulent, transitional, and laminar flow rates at two temperatures
+        flow_rates = dict_fluid['Flow Rate'] / np.array([1, 4, 10])
+        temps = np.array([[13.0], [30.0]])
+
+        resist = curr_tst.calc_pipe_resistance_array(flow_rates, temps)
+
+        self.assertEqual(resist.shape, (2, 3))
+
+        for i in range(2):
+            for j in range(3):
+                curr_tst.fluid.update_fluid_state(new_temp=temps[i, 0], new_flow_rate=flow_rates[j])
+                self.assertAlmostEqual(resist[i, j], curr_tst.calc_pipe_resistance())
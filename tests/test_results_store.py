@@ -0,0 +1,91 @@
+import os
+import unittest
+
+import numpy as np
+import simplejson as json
+
+from ghx.array_mlaa import GHXArrayMLAA
+from ghx.results_store import ResultsStoreClass, ResultsStoreSinkClass, write_results_store
+
+
+class TestResultsStore(unittest.TestCase):
+    def setUp(self):
+
+        json_file_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'examples', '1x2_Std_GHX_MLAA.json')
+
+        with open(json_file_path) as json_file:
+            self.dict_bh = json.load(json_file)
+
+        self.csv_file_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'examples', 'testing.csv')
+        self.output_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'run', 'testing')
+
+        self.store_path = os.path.join(self.output_path, 'test_store.bin')
+
+        num_hours = 3 * 8760 + 50
+        self.temp_bh = 10 + np.sin(np.arange(num_hours) / 500.0)
+        self.temp_mft = self.temp_bh + np.cos(np.arange(num_hours) / 7.0)
+
+    def test_read(self):
+        """
+        Tests reading hour ranges across chunk boundaries
+        """
+
+        write_results_store(self.store_path, self.temp_bh, self.temp_mft, {'Chunk Hours': 1000})
+
+        with ResultsStoreClass(self.store_path) as store:
+            self.assertEqual(store.num_hours, len(self.temp_mft))
+            self.assertEqual(len(store.index), 27)
+
+            temp_bh, temp_mft = store.read()
+            np.testing.assert_array_equal(temp_bh, self.temp_bh)
+            np.testing.assert_array_equal(temp_mft, self.temp_mft)
+
+            for start, end in [(0, 1), (999, 1001), (1000, 2000), (5, 26000), (26250, 30000)]:
+                temp_bh, temp_mft = store.read(start, end)
+                np.testing.assert_array_equal(temp_bh, self.temp_bh[start:end])
+                np.testing.assert_array_equal(temp_mft, self.temp_mft[start:end])
+
+            np.testing.assert_array_equal(store.read_year(1)[1], self.temp_mft[8760:17520])
+            self.assertEqual(len(store.read(30000, 40000)[0]), 0)
+
+    def test_update(self):
+        """
+        Tests hourly feeding in single precision, with the file read after a flush and after more hours
+        """
+
+        sink = ResultsStoreSinkClass(self.store_path, {'Chunk Hours': 730, 'Compression Level': 1}, np.float32)
+
+        for temp_bh, temp_mft in zip(self.temp_bh[:1000], self.temp_mft[:1000]):
+            sink.update(temp_bh, temp_mft)
+
+        sink.flush()
+
+        with ResultsStoreClass(self.store_path) as store:
+            self.assertEqual(store.num_hours, 1000)
+            self.assertEqual(store.dtype, np.float32)
+            np.testing.assert_allclose(store.read()[1], self.temp_mft[:1000], rtol=1e-6)
+
+        sink.update(self.temp_bh[1000:], self.temp_mft[1000:])
+        sink.close()
+
+        with ResultsStoreClass(self.store_path) as store:
+            self.assertEqual(store.num_hours, len(self.temp_mft))
+            np.testing.assert_allclose(store.read(990, 1010)[1], self.temp_mft[990:1010], rtol=1e-6)
+
+    def test_simulate(self):
+        """
+        Tests the results store written by a simulation
+        """
+
+        self.dict_bh['Simulation Configuration']['Simulation Years'] = 1
+        self.dict_bh['Simulation Configuration']['Results Store'] = {}
+
+        results = GHXArrayMLAA(self.dict_bh, self.csv_file_path, self.output_path, False).simulate()
+
+        with ResultsStoreClass(os.path.join(self.output_path, 'GHX.bin')) as store:
+            temp_bh, temp_mft = store.read(100, 200)
+            np.testing.assert_array_equal(temp_bh, results.temp_bh[100:200])
+            np.testing.assert_array_equal(temp_mft, results.temp_mft[100:200])
@@ -0,0 +1,92 @@
+import os
+import unittest
+
+import simplejson as json
+
+from ghx.sizing import SizingClass
+
+
+class TestSizingClass(unittest.TestCase):
+    def setUp(self):
+
+        json_file_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'examples', '1x2_Std_GHX_Fixed.json')
+
+        with open(json_file_path) as json_file:
+            self.dict_bh = json.load(json_file)
+
+        self.csv_file_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'examples', 'testing.csv')
+        self.output_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'run', 'testing')
+
+    def test_set_depth(self):
+        """
+        Tests depths, lengths, and time scale are rescaled together
+        """
+
+        curr_tst = SizingClass(self.dict_bh, self.csv_file_path, self.output_path, max_mft=40, print_output=False)
+
+        init_ts = curr_tst.ghx.ts
+
+        curr_tst.set_depth(2 * 76.2)
+
+        self.assertAlmostEqual(curr_tst.ghx.ghx_list[0].depth, 2 * 76.2)
+        self.assertAlmostEqual(curr_tst.ghx.total_bh_length, 4 * 76.2)
+        self.assertAlmostEqual(curr_tst.ghx.ts / init_ts, 4)
+
+    def test_size(self):
+        """
+        Tests the sized depth meets the limit
+        """
+
+        curr_tst = SizingClass(self.dict_bh, self.csv_file_path, self.output_path, max_mft=40, print_output=False)
+
+        # limit is met at the initial depth, so the depth decreases
+        self.assertLess(curr_tst.calc_excess(76.2), 0)
+
+        ret = curr_tst.size()
+
+        self.assertLess(ret['Depth'], 76.2)
+        self.assertAlmostEqual(ret['Total Length'], 2 * ret['Depth'])
+        self.assertLessEqual(ret['Max MFT'], 40)
+        self.assertAlmostEqual(ret['Max MFT'], 40, delta=0.01)
+        self.assertLess(ret['Simulations'], 15)
+
+        # limit is exceeded just above the tolerance
+        self.assertGreater(curr_tst.calc_excess(ret['Depth'] - curr_tst.depth_tolerance), 0)
+
+        json_data = curr_tst.apply(self.dict_bh)
+
+        for json_data_bh in json_data['GHXs']:
+            self.assertAlmostEqual(json_data_bh['Depth'], ret['Depth'])
+
+    def test_size_min_mft(self):
+        """
+        Tests a minimum limit which cannot be exceeded by heat rejection
+        """
+
+        curr_tst = SizingClass(self.dict_bh, self.csv_file_path, self.output_path, min_mft=20, print_output=False,
+                               max_iterations=5)
+
+        self.assertIsNone(curr_tst.size())
+
+    def test_size_design_mode(self):
+        """
+        Tests design mode sizing with the monthly and peak temperatures
+        """
+
+        self.dict_bh['Simulation Configuration']['Peak Duration'] = 6
+
+        curr_tst = SizingClass(self.dict_bh, self.csv_file_path, self.output_path, max_mft=40, print_output=False,
+                               design_mode=True)
+
+        ret = curr_tst.size()
+
+        self.assertLessEqual(ret['Max MFT'], 40)
+        self.assertAlmostEqual(ret['Max MFT'], 40, delta=0.01)
+
+        # constant loads give the same depth as exact superposition
+        ref = SizingClass(self.dict_bh, self.csv_file_path, self.output_path, max_mft=40, print_output=False)
+
+        self.assertAlmostEqual(ret['Depth'], ref.size()['Depth'], delta=1)
@@ -0,0 +1,84 @@
+import os
+import unittest
+
+import numpy as np
+import simplejson as json
+
+from ghx.array import run_simulation
+from ghx.statistics import StatisticsSinkClass
+
+
+class TestStatisticsSinkClass(unittest.TestCase):
+    def setUp(self):
+
+        json_file_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'examples', '1x2_Std_GHX_MLAA.json')
+
+        with open(json_file_path) as json_file:
+            self.dict_bh = json.load(json_file)
+
+        self.csv_file_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'examples', 'testing.csv')
+
+    def test_update(self):
+        """
+        Tests the period statistics against the full series, fed one hour at a time and in uneven chunks
+        """
+
+        num_hours = 2 * 8760 + 100
+        temp_bh = 10 + np.sin(np.arange(num_hours) / 500.0)
+        temp_mft = temp_bh + np.cos(np.arange(num_hours) / 7.0)
+
+        config = {'Retention': {'Hourly': 48, 'Daily': None}, 'Min MFT': 9.5, 'Max MFT': 11.5}
+
+        hourly = StatisticsSinkClass(config, False, buffer_hours=100)
+        for bh, mft in zip(temp_bh, temp_mft):
+            hourly.update(bh, mft)
+
+        chunked = StatisticsSinkClass(config, False)
+        for chunk in np.array_split(np.arange(num_hours), 17):
+            chunked.update(temp_bh[chunk], temp_mft[chunk])
+
+        for sink in [hourly, chunked]:
+            monthly = sink.get_statistics('Monthly')
+            self.assertEqual(monthly.shape, (24, 7))
+            np.testing.assert_array_equal(monthly[:, 0], np.arange(1, 25))
+
+            month = temp_mft[730:1460]
+            np.testing.assert_allclose(monthly[1, 1:], [np.mean(temp_bh[730:1460]), np.min(month), np.mean(month),
+                                                        np.max(month), np.sum(month < 9.5), np.sum(month > 11.5)])
+
+            # the last 100 hours are a month and day in progress
+            self.assertEqual(len(sink.get_statistics('Daily')), 2 * 365 + 4)
+            self.assertEqual(len(sink.get_statistics('Annual')), 2)
+
+            hours = sink.get_statistics('Hourly')
+            self.assertEqual(len(hours), 48)
+            np.testing.assert_allclose(hours[:, 3], temp_mft[-48:])
+
+            summary = sink.summary()
+            self.assertEqual(summary['Hours'], num_hours)
+            self.assertAlmostEqual(summary['MFT Max [C]'], np.max(temp_mft))
+            self.assertEqual(summary['MFT Max Hour'], np.argmax(temp_mft) + 1)
+            self.assertAlmostEqual(summary['MFT Mean [C]'], np.mean(temp_mft))
+            self.assertEqual(summary['Hours Above Max MFT'], np.sum(temp_mft > 11.5))
+
+    def test_simulate(self):
+        """
+        Tests that statistics are the same whether or not hourly results are stored
+        """
+
+        self.dict_bh['Simulation Configuration']['Simulation Years'] = 1
+        self.dict_bh['Simulation Configuration']['Statistics'] = {'Max MFT': 30.0}
+
+        stored = run_simulation(self.dict_bh, self.csv_file_path)
+
+        self.dict_bh['Simulation Configuration']['Store Hourly Results'] = False
+        streamed = run_simulation(self.dict_bh, self.csv_file_path)
+
+        self.assertEqual(streamed.num_steps, 0)
+        self.assertEqual(streamed.summary()['Max MFT'], np.max(stored.temp_mft))
+
+        np.testing.assert_allclose(streamed.statistics.get_statistics('Monthly'),
+                                   stored.statistics.get_statistics('Monthly'))
+        self.assertEqual(stored.statistics.summary()['Hours Above Max MFT'], np.sum(stored.temp_mft > 30.0))
@@ -0,0 +1,34 @@
+import unittest
+
+import numpy as np
+
+from ghx.superposition import calc_delta_loads, fft_convolve
+
+
+class TestSuperposition(unittest.TestCase):
+    def test_calc_delta_loads(self):
+        """
+        Tests the hourly load steps
+        """
+
+        np.testing.assert_array_equal(calc_delta_loads([1, 3, 3, 0]), [1, 2, 0, -3])
+
+        # batches along the leading axis
+        np.testing.assert_array_equal(calc_delta_loads([[1, 3], [2, 2]]), [[1, 2], [2, 0]])
+
+    def test_fft_convolve(self):
+        """
+        Tests FFT superposition against direct convolution
+        """
+
+        rng = np.random.RandomState(0)
+        delta_q = rng.uniform(-1, 1, 1000)
+        g = np.log(np.arange(1, 1001))
+
+        np.testing.assert_allclose(fft_convolve(delta_q, g), np.convolve(delta_q, g)[:1000], atol=1e-9)
+
+        # batch of load profiles with a shared response
+        batch = np.vstack((delta_q, 2 * delta_q))
+        out = fft_convolve(batch, g)
+        self.assertEqual(out.shape, (2, 1000))
+        np.testing.assert_allclose(out[1], 2 * out[0], atol=1e-9)
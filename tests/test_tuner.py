@@ -0,0 +1,168 @@
+import os
+import unittest
+
+import numpy as np
+import simplejson as json
+
+from ghx.tuner import AggregationTunerClass
+
+
+class TestAggregationTunerClass(unittest.TestCase):
+    def setUp(self):
+
+        json_file_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'examples', '1x2_Std_GHX_Fixed.json')
+
+        with open(json_file_path) as json_file:
+            self.dict_bh = json.load(json_file)
+
+        self.csv_file_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'examples', 'testing.csv')
+        self.output_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'run', 'testing')
+
+    def test_init(self):
+        """
+        Tests initialization
+        """
+
+        curr_tst = AggregationTunerClass(self.dict_bh, self.csv_file_path, self.output_path, 0.1, False,
+                                         min_hourly_histories=(6, 12),
+                                         first_intervals=(5, 10),
+                                         num_intervals=(1, 2),
+                                         verify_hours=20000)
+
+        self.assertEqual(len(curr_tst.candidates), 8)
+        self.assertEqual(curr_tst.candidates[0], (6, [5]))
+        self.assertEqual(curr_tst.candidates[-1], (12, [10, 20]))
+
+        # verify window is limited to the simulation length
+        self.assertEqual(curr_tst.verify_hours, 8760)
+        self.assertAlmostEqual(curr_tst.max_error, 0.09)
+
+        # candidates whose longest interval cannot form within the verify window are dropped
+        curr_tst = AggregationTunerClass(self.dict_bh, self.csv_file_path, self.output_path, 0.1, False,
+                                         min_hourly_histories=(6, 12),
+                                         first_intervals=(5, 10),
+                                         num_intervals=(1, 2),
+                                         verify_hours=30)
+
+        self.assertEqual(curr_tst.candidates, [(6, [5]), (6, [5, 10]), (6, [10]), (6, [10, 20]),
+                                               (12, [5]), (12, [5, 10]), (12, [10])])
+
+    def test_calc_cost(self):
+        """
+        Tests the superposition cost estimate
+        """
+
+        curr_tst = AggregationTunerClass(self.dict_bh, self.csv_file_path, self.output_path, 0.1, False)
+
+        self.assertAlmostEqual(curr_tst.calc_cost(5, [12, 48, 192, 384]),
+                               5 + 6 + 2 + 2 + 1 + 8760 / 768.0)
+
+        # longer intervals are cheaper
+        self.assertLess(curr_tst.calc_cost(5, [12, 24]), curr_tst.calc_cost(5, [12]))
+
+    def test_calc_error(self):
+        """
+        Tests the error estimate. Loads are constant, so aggregation does not introduce error.
+        """
+
+        curr_tst = AggregationTunerClass(self.dict_bh, self.csv_file_path, self.output_path, 0.1, False)
+        curr_tst.ref_temp_bh = curr_tst.ghx.calc_reference_temps(500)[0]
+
+        self.assertAlmostEqual(curr_tst.calc_error(5, [12, 48], 500), 0, delta=1e-6)
+        self.assertEqual(curr_tst.num_evaluations, 1)
+
+        # intervals which never fill in the window share the same result
+        curr_tst.calc_error(5, [12, 48, 1000], 500)
+        self.assertEqual(curr_tst.num_evaluations, 1)
+
+        # temperatures are rising
+        temp_bh = curr_tst.ghx.calc_bh_temps(500)
+        self.assertGreater(temp_bh[-1], temp_bh[0])
+        np.testing.assert_allclose(temp_bh, curr_tst.ref_temp_bh, atol=1e-6)
+
+        # the calculation stops at the first hour which exceeds the maximum error
+        temp_bh = curr_tst.ghx.calc_bh_temps(500, curr_tst.ref_temp_bh - 1, 0.5)
+        self.assertEqual(len(temp_bh), 1)
+        self.assertGreater(curr_tst.calc_error(5, [12, 48], 500, -1), 0)
+        self.assertEqual(curr_tst.num_evaluations, 2)
+
+    def test_is_coarser(self):
+        """
+        Tests candidates coarser in every setting are found
+        """
+
+        self.assertTrue(AggregationTunerClass.is_coarser((6, [10, 20]), (12, [5, 10, 20])))
+        self.assertTrue(AggregationTunerClass.is_coarser((6, [5, 10]), (6, [5, 10])))
+        self.assertFalse(AggregationTunerClass.is_coarser((12, [10, 20]), (6, [5, 10])))
+        self.assertFalse(AggregationTunerClass.is_coarser((6, [10]), (6, [5, 10, 20])))
+
+    def test_tune(self):
+        """
+        Tests the tuner selects the cheapest candidate which meets the target error
+        """
+
+        curr_tst = AggregationTunerClass(self.dict_bh, self.csv_file_path, self.output_path, 0.1, False,
+                                         min_hourly_histories=(6, 12),
+                                         first_intervals=(5, 10),
+                                         num_intervals=(1, 2),
+                                         verify_hours=800,
+                                         verify_full=False)
+
+        ret = curr_tst.tune()
+
+        self.assertEqual(ret['Min Hourly History'], 6)
+        self.assertEqual(ret['Intervals'], [10, 20])
+        self.assertLess(ret['Error'], curr_tst.max_error)
+
+        json_data = curr_tst.apply(self.dict_bh)
+
+        self.assertEqual(json_data['Simulation Configuration']['Min Hourly History'], 6)
+        self.assertEqual(json_data['Simulation Configuration']['Intervals'], [10, 20])
+
+        # no candidate can meet a negative target
+        curr_tst = AggregationTunerClass(self.dict_bh, self.csv_file_path, self.output_path, -1, False,
+                                         min_hourly_histories=(6,),
+                                         first_intervals=(5,),
+                                         num_intervals=(1,),
+                                         verify_hours=200)
+
+        self.assertIsNone(curr_tst.apply(self.dict_bh))
+
+        # the closest candidate is recorded, with the limit it missed
+        self.assertEqual(curr_tst.best[1:], (-0.9, 200, (6, [5])))
+
+    def test_tune_full_simulation(self):
+        """
+        Tests a candidate which passes the verify window, but misses the target over the full simulation
+        """
+
+        loads_path = os.path.join(os.path.dirname(
+            os.path.realpath(__file__)), '..', 'examples', 'Asymmetric_10000.csv')
+
+        # the error grows beyond the window with unbalanced loads
+        curr_tst = AggregationTunerClass(self.dict_bh, loads_path, self.output_path, 1.5, False,
+                                         min_hourly_histories=(6,),
+                                         first_intervals=(5,),
+                                         num_intervals=(1,),
+                                         verify_hours=744,
+                                         verify_full=False)
+
+        ret = curr_tst.tune()
+
+        self.assertEqual(ret['Intervals'], [5])
+        self.assertLess(ret['Error'], curr_tst.max_error)
+
+        curr_tst = AggregationTunerClass(self.dict_bh, loads_path, self.output_path, 1.5, False,
+                                         min_hourly_histories=(6,),
+                                         first_intervals=(5,),
+                                         num_intervals=(1,),
+                                         verify_hours=744)
+
+        self.assertIsNone(curr_tst.tune())
+
+        error, limit, num_hours, candidate = curr_tst.best
+        self.assertGreater(error, 1.5)
+        self.assertEqual((limit, num_hours, candidate), (1.5, 8760, (6, [5])))